@@ -742,4 +742,165 @@ EXCEL_FORMATE_FTY_2 = {
 }
 
 
+#----------------------------------------------xlsx_fty模板指纹注册表----------------------------------------------
+# 每种模板声明若干特征单元格及其预期关键词（比较前去除空格/换行并统一中英文符号）
+# 新增供应商表单变体时，只需定义字段位置配置并在此注册，无需修改检测代码
+EXCEL_FTY_TEMPLATE_REGISTRY = {
+    "EXCEL_FORMATE_FTY_1": {
+        "template": EXCEL_FORMATE_FTY_1,
+        "signature_cells": {
+            "A7": "产品类别",
+            "B10": "厂房(办公区/车间)",
+            "A12": "生产工艺",
+            "A38": "合作的贸易公司及合作情况",
+            "A41": "是否可以提供样品",
+        }
+    },
+    "EXCEL_FORMATE_FTY_2": {
+        "template": EXCEL_FORMATE_FTY_2,
+        "signature_cells": {
+            "A9": "产品类别",
+            "B14": "厂房(办公区/车间)",
+            "A16": "生产工艺",
+            "S16": "合作的贸易公司及合作情况",
+            "S23": "是否可以提供样品",
+        }
+    },
+}
+
+# 模板匹配得分（命中特征单元格占比）低于该阈值时记录低置信度告警
+EXCEL_TEMPLATE_MIN_SCORE = 0.6
+
+
+#----------------------------------------------pdf产品图片过滤策略----------------------------------------------
+# 多工厂PDF提取产品图片时，先根据page.get_images()中的宽高元数据过滤，只提取通过过滤的图片数据
+PDF_IMAGE_FILTER_POLICY = {
+    "background_min_size": (4005, 2251),  # 宽、高同时不小于该尺寸视为背景图片
+    "min_size": (100, 100),               # 宽或高小于该尺寸视为图标/装饰性图片
+    "max_aspect_ratio": None,             # 长边/短边的上限（如分割线、横幅），None表示不限制
+}
+
+# 产品图片索引文件名（保存在各工厂图片文件夹中，记录每张图片的格式/尺寸元数据，以及重复图片对应的已保存原图）
+PDF_IMAGE_INDEX_NAME = '图片索引.json'
+
+# 早期版本写入的图片去重索引文件名（只记录重复图片，已并入PDF_IMAGE_INDEX_NAME），此前处理过的目录中仍可能存在
+PDF_IMAGE_DEDUP_INDEX_NAME = '图片去重索引.json'
+
+# 合并JSON时跳过的文件名：与工厂信息json同处一个目录树的非工厂记录文件（如图片索引），不并入合并结果
+MERGE_JSON_EXCLUDE_NAMES = [PDF_IMAGE_INDEX_NAME, PDF_IMAGE_DEDUP_INDEX_NAME]
+
+
+#----------------------------------------------标准模板PDF按页预算提取----------------------------------------------
+# 标准模板PDF的工厂信息通常集中在前一两页：逐页提取文本，达到页数上限时停止（超出上限的页面文本不会提取，会记录警告）
+# 每次处理都会记录"读取 已读/总页数"，可据此检查上限是否合适；设为None则读取全部页面
+PDF_STANDARD_TEXT_MAX_PAGES = 2             # 最多读取的页数
+
+
+#----------------------------------------------PDF/PPTX文本行分类规则----------------------------------------------
+# 由src/utils/line_classifier.py在导入时统一编译，标准模板PDF和PPTX的文本行分类共用
+# 手机号（11位数字，允许有空格或短横线）
+PHONE_PATTERN = r"(?<!\d)(?:\d[\s\-]*){11}(?!\d)"
+
+# 联系人职位关键词（支持多种职位）
+POSITION_KEYWORDS = ['经理', '负责人', '主管', '总监', '主任', '部长', '董事', '总', '总经理', '助理', '秘书', '代表', '销售', '业务']
+
+# 2-4个中文字的姓名（仅PPTX联系人识别使用）
+CHINESE_NAME_PATTERN = r'^[\u4e00-\u9fa5]{2,4}$'
+
+# 厂商名称关键词（'⼚'为PDF提取中常见的康熙部首"厂"）
+VENDOR_KEYWORDS = ['公司', '厂', '集团', '有限', '企业', '⼚']
+
+# 主销市场关键词（支持各种空格变体）
+MARKET_KEYWORDS = ['主 销 市 场', '市 场 占 ⽐', '主销市场', '市场占比', '市场占⽐']
+
+
+#----------------------------------------------标准模板PDF版式模板----------------------------------------------
+# 由src/utils/pdf_layout_template.py从标注样本学习得到的版式模板JSON路径；
+# 设置后按字段区域提取厂商/联系人/主销市场/日期，不再使用按行号和关键词的分类规则；None表示不启用
+# 按模板未提取到厂商名称时（版式不符），自动回退到按行分类
+PDF_STANDARD_LAYOUT_TEMPLATE = None
+
 
+#----------------------------------------------二维码候选预筛选----------------------------------------------
+# 完整解码（pyzbar及黑白增强重试）前，先在缩小的灰度图上做低成本检查，只有可能是二维码的图片才进入解码
+QR_PREFILTER_POLICY = {
+    "enabled": True,
+    "work_size": 512,            # 预筛选时图片长边缩放到的尺寸（只缩小不放大）
+    "min_size": 40,              # 宽或高小于该尺寸的图片不可能解码出二维码
+    "max_aspect_ratio": 6.0,     # 长边/短边的上限，超过视为横幅/分割线
+    "min_entropy": 0.3,          # 灰度直方图信息熵下限（bit），低于该值视为纯色/近纯色图片
+    "min_finder_patterns": 2,    # 至少检测到的"回"字形定位图案数量（完整二维码有3个，允许1个被遮挡或模糊）
+}
+
+
+#----------------------------------------------二维码多尺度解码----------------------------------------------
+# 解码前将图片长边限制在[min_size, max_size]之间作为基准尺寸，再按scales依次尝试（命中即停止）：
+# 手机拍摄的4000px以上大图先缩小，避免pyzbar耗时过长；过小的二维码缩略图先放大，提高识别率
+QR_DECODE_POLICY = {
+    "min_size": 400,             # 基准尺寸下限（长边，像素）
+    "max_size": 1200,            # 基准尺寸上限（长边，像素）
+    "scales": [1.0, 0.5],        # 相对基准尺寸的缩放序列（如需对模糊小图再尝试放大可追加2.0），缩放后的长边限制在[min_size/2, max_size*2]内
+    "binarize_retry": True,      # 每个尺度未识别时是否再尝试黑白增强图片
+    "time_budget_s": 2.0,        # 单张图片的解码时间上限（在两次尝试之间检查，超过后不再尝试后续尺度）
+}
+
+
+#----------------------------------------------二维码解码结果缓存----------------------------------------------
+# 以图片字节的SHA1为键持久化保存解码结论（微信二维码/其他二维码/非二维码及其内容），
+# 同一供应商的二维码在PPTX/DOCX/PDF等多份资料中重复出现时，第二次起直接复用结论，不再解码
+QR_DECODE_CACHE = {
+    "enabled": True,
+    "path": "data/cache/qr_decode_cache.sqlite3",   # SQLite缓存文件路径（相对运行目录）
+    "max_entries": 50000,                          # 记录数上限，超出时按最近使用时间淘汰最旧的记录
+}
+
+
+#----------------------------------------------二维码解码引擎----------------------------------------------
+# 可选引擎（见src/utils/qr_engines.py）：
+#   "pyzbar"  - zbar解码（需要zbar动态库）
+#   "opencv"  - OpenCV QRCodeDetector（支持一张图中多个二维码，无需zbar）
+#   "cascade" - 按QR_ENGINE_CASCADE顺序依次尝试，前一个引擎解码出二维码即停止
+QR_ENGINE = "pyzbar"
+QR_ENGINE_CASCADE = ["opencv", "pyzbar"]
+
+
+#----------------------------------------------二维码裁剪----------------------------------------------
+# 识别到微信二维码后，按解码得到的顶点坐标只保存二维码区域（含边距），而不是整张截图；
+# 一张图片中有多个微信二维码时分别裁剪
+QR_CROP = {
+    "enabled": True,
+    "margin_ratio": 0.1,   # 四周边距占二维码边长的比例（保留静区，便于再次扫码）
+    # 以下情况视为图片本身就是二维码，不裁剪，直接保存原图字节（不重新编码）：
+    "keep_whole_ratio": 0.8,      # 裁剪区域面积占整张图片的比例不低于该值
+    "blank_border_max_std": 10,   # 或裁剪区域以外的部分都是纯色留白（像素标准差不超过该值，如二维码图片自带的白边）
+}
+
+
+#----------------------------------------------二维码识别进程池----------------------------------------------
+# 启用后，文档中的图片提交到进程池并行识别二维码（图片解码/灰度化/二值化/解码引擎均为CPU密集型）
+# 已提交但结果尚未取回的图片字节总量超过上限时，提交方先取回已提交的结果再继续提交，避免大量图片及结果同时驻留内存
+QR_DETECT_SERVICE = {
+    "enabled": False,
+    "workers": 0,                 # 进程数，0表示使用CPU核数
+    "max_inflight_mb": 256,       # 已提交但结果尚未取回的图片字节总量上限（MB）
+}
+
+
+#----------------------------------------------二维码图片拼接----------------------------------------------
+# 多张二维码水平拼接时统一缩放到同一高度：取各图片最大高度，但不超过max_height，避免大尺寸照片拼接后占用过多内存
+QR_STITCH = {
+    "max_height": 800,
+}
+
+
+#----------------------------------------------二维码内容分类----------------------------------------------
+# 解码得到的二维码内容按以下顺序分类（命中即停止，不区分大小写，模式在内容任意位置匹配）：
+#   "wechat_official" - 微信公众号
+#   "wechat_personal" - 个人微信（其余包含weixin/wechat等特征的内容也归入此类）
+#   "url"             - 普通网址（如公司官网）
+# 均未命中的归为"other"；前两类视为微信二维码
+QR_PAYLOAD_PATTERNS = {
+    "wechat_official": [r"mp\.weixin\.qq\.com", r"weixin\.qq\.com/r/", r"open\.weixin\.qq\.com"],
+    "wechat_personal": [r"u\.wechat\.com", r"weixin", r"wechat", r"wx\.qq\.com"],
+    "url": [r"https?://", r"www\."],
+}
@@ -1,6 +1,9 @@
 import os
 import json
 import logging
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from setting.config import MERGE_JSON_EXCLUDE_NAMES
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -22,10 +25,12 @@ def merge_json_files(input_path, output_file):
         logging.error(f"输入路径不是目录: {input_path}")
         return
     
-    # 查找所有JSON文件
+    # 查找所有JSON文件（跳过图片索引等非工厂记录文件）
     json_files = []
     for root, _, files in os.walk(input_path):
         for file in files:
+            if file in MERGE_JSON_EXCLUDE_NAMES:
+                continue
             if file.lower().endswith('.json'):
                 full_path = os.path.join(root, file)
                 json_files.append(full_path)
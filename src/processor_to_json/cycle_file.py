@@ -118,7 +118,7 @@ def module_ppt(input_directory:str, output_directory:str) -> None:
 #---------------------- Excel文档处理模块 --------------------------------
 
 # --- 标准Excel表格批量处理函数 ---
-def module_standard_excel(input_directory:str, output_directory:str,header_row:int) -> None:
+def module_standard_excel(input_directory:str, output_directory:str,header_row:int, workers:int = 0) -> None:
     """
     批量处理标准Excel格式工厂信息表(供应商交流会格式)
 
@@ -130,6 +130,7 @@ def module_standard_excel(input_directory:str, output_directory:str,header_row:i
         input_directory (str): 输入文件目录路径
         output_directory (str): 输出结果目录路径
         header_row (int): 表头所在的行号
+        workers (int): 每个文件按工作表并行处理的进程数，默认0为串行
     返回：
         None
     
@@ -149,7 +150,7 @@ def module_standard_excel(input_directory:str, output_directory:str,header_row:i
                     file_path = os.path.join(root, filename)
 
                 # 执行标准Excel转JSON处理
-                result_bool = excel_standard_allftys_map_to_json(file_path, output_directory, header_row)
+                result_bool = excel_standard_allftys_map_to_json(file_path, output_directory, header_row, workers)
                     
                 # 统计处理结果
                 if result_bool:
@@ -315,7 +316,7 @@ def module_standard_qwimg_pdf(input_directory: str, output_directory: str) -> No
 
 
 # --- 多家工厂信息PDF文档批量处理函数 ---
-def module_allftys_imgs_pdf(input_directory: str, output_directory: str) -> None:
+def module_allftys_imgs_pdf(input_directory: str, output_directory: str, workers: int = 0) -> None:
     """
     批量处理目录中的PDF格式工厂信息文档
     
@@ -326,6 +327,7 @@ def module_allftys_imgs_pdf(input_directory: str, output_directory: str) -> None
     参数：
         input_directory (str): 输入文件目录路径
         output_directory (str): 输出结果目录路径
+        workers (int): 每个文件按页面范围并行处理的进程数，默认0为串行
         
     返回：
         None
@@ -345,7 +347,7 @@ def module_allftys_imgs_pdf(input_directory: str, output_directory: str) -> None
                     total_count += 1
                     
                     # 执行PDF处理
-                    file_success = process_pdf(file_path, output_directory)
+                    file_success = process_pdf(file_path, output_directory, workers)
                         
                     # 统计处理结果
                     if file_success:
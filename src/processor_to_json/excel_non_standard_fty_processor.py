@@ -1,6 +1,6 @@
 # 非标准Excel工厂信息处理模块
 # 功能：处理工厂情况信息表Excel文件，提取工厂概况数据和产品图片，转换为标准JSON格式
-# 特性：支持2种模板格式、sheet图片提取、数据标准化转换
+# 特性：模板指纹识别、单次打开工作簿提取数据和sheet图片、xls文件无需Excel直接解析、数据标准化转换
 
 import xlwings as xw
 import os
@@ -10,102 +10,90 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from setting.config import *
 import logging
-import time
-from PIL import ImageGrab
 from processor_rely.excel_convert_data_json import json_from_factory_data
+from processor_rely.excel_template_registry import get_signature_bounds, get_grid_value, match_template
+from processor_rely.excel_package_reader import read_sheet_images, prepare_images_for_save
+from processor_rely.excel_xls_reader import read_xls_sheet_values, read_xls_sheet_images
 from src.utils.save_result_to_json import make_vendor_folder,save_result_to_vendor_folder
 from src.utils.clean_factory_name import clean_factory_name
 
 
 #---------------------- 图片和数据提取工具函数 --------------------------------
 
-# --- 产品图片提取处理函数 ---
-def process_product_images(excel_path:str, output_dir: str) -> str:
+# --- 产品图片读取函数 ---
+def read_product_images(excel_path: str) -> list:
     """
-    从Excel文件中提取主要产品图片并保存到指定目录
+    读取"主要产品图片"工作表中的所有图片原始数据，无需Excel实例和剪贴板
     
-    提取流程：
-    1. 检查并创建输出目录
-    2. 打开Excel文件并初始化应用程序
-    3. 访问"主要产品图片"sheet工作表
-    4. 遍历工作表中的所有图形对象
-    5. 识别图片类型并复制到剪贴板
-    6. 从剪贴板获取图片数据并保存
-    7. 按序号命名并统计保存结果
+    读取流程：
+    1. xlsx文件：直接从文件包的xl/media中读取图片字节
+    2. xls文件：直接解析BIFF绘图层中的图片库
     
     参数：
         excel_path (str): Excel文件完整路径
+        
+    返回：
+        list: [(图片字节, 扩展名), ...]，"主要产品图片"sheet不存在时返回None
+        
+    """
+    # 步骤1：xlsx文件直接读取文件包
+    if excel_path.lower().endswith('.xlsx'):
+        return read_sheet_images(excel_path, "主要产品图片")
+    
+    # 步骤2：xls文件解析BIFF绘图层
+    anchored_images = read_xls_sheet_images(excel_path, "主要产品图片")
+    if anchored_images is None:
+        return None
+    return [(image_bytes, image_ext) for _, _, image_bytes, image_ext in anchored_images]
+
+
+# --- 产品图片保存函数 ---
+def save_product_images(product_images: list, output_dir: str) -> str:
+    """
+    将读取到的产品图片保存到指定目录
+    
+    参数：
+        product_images (list): [(图片字节, 扩展名), ...]
         output_dir (str): 图片保存的根目录路径
         
     返回：
-        str: 图片输出文件夹的完整路径，失败时返回None
+        str: 图片输出文件夹的完整路径，没有可保存的图片时返回None
         
     保存格式：
         - 文件夹命名：产品图片
-        - 文件命名：产品图片_{序号}.png
-        - 图片格式：PNG格式
-
+        - 文件命名：产品图片_{序号}{原始扩展名}
+        - emf/wmf矢量图片转换为PNG后保存，无法转换的跳过并记录数量
+        - 跳过其余非IMAGE_EXTENSIONS格式
+        
     """
     try:
-        # 步骤1：检查并创建输出根目录
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
+        img_output_folder = os.path.join(output_dir, "产品图片")
+        img_count = 0
         
-        # 步骤2：初始化Excel应用程序
-        app = xw.App(visible=False)
-        wb = app.books.open(excel_path)
+        product_images, skipped_count = prepare_images_for_save(product_images)
+        if skipped_count:
+            logging.warning(f"跳过 {skipped_count} 张无法转换的矢量图片")
         
-        # 步骤3：访问"主要产品图片"工作表
-        if "主要产品图片"  in [sheet.name for sheet in wb.sheets]:
-            sheet = wb.sheets["主要产品图片"]
-        else:
-            logging.warning(f"主要产品图片sheet不存在")
-            return None
+        for image_bytes, image_ext in product_images:
+            if image_ext not in IMAGE_EXTENSIONS:
+                logging.warning(f"跳过不支持的图片格式: {image_ext}")
+                continue
+            
+            os.makedirs(img_output_folder, exist_ok=True)
+            img_count += 1
+            img_path = os.path.join(img_output_folder, f"产品图片_{img_count}{image_ext}")
+            with open(img_path, 'wb') as f:
+                f.write(image_bytes)
         
-        # 步骤4：创建工厂专属图片文件夹
-        img_output_folder = os.path.join(output_dir, "产品图片")
-        os.makedirs(img_output_folder, exist_ok=True)
-
-        # 步骤5：初始化图片计数器
-        img_count = 0
+        if img_count == 0:
+            return None
         
-        # 步骤6：遍历工作表中的所有图形对象
-        for shape in sheet.shapes:
-            # 检查是否为图片类型
-            if shape.type == 'picture':
-                # 复制图片到系统剪贴板
-                shape.api.Copy()
-                time.sleep(0.2)  # 添加延迟确保剪贴板数据就绪
-
-                # 从剪贴板获取图片数据
-                img = ImageGrab.grabclipboard()
-                if img is not None:
-                    # 生成图片文件路径并保存
-                    img_count += 1
-                    img_path = os.path.join(img_output_folder, f"产品图片_{img_count}.png")
-                    img.save(img_path)
-                else:
-                    logging.error(f"未能从剪贴板获取图片")
-        
-        # 步骤7：记录处理结果
-        logging.info(f"图片文件夹已保存:{img_output_folder}")
+        logging.info(f"图片文件夹已保存:{img_output_folder}，共 {img_count} 张图片")
         return img_output_folder
-
+    
     except Exception as e:
-        logging.error(f"处理主要产品图片sheet时出错: {str(e)}") 
-    finally:
-        # Excel资源清理
-        try:
-            if 'wb' in locals() and wb is not None:
-                wb.close()
-        except Exception as e:
-            logging.warning(f'关闭wb时出错: {e}')
-
-        try:
-            if 'app' in locals() and app is not None:
-                app.quit()
-        except Exception as e:
-            logging.warning(f'关闭app时出错: {e}')
+        logging.error(f"保存主要产品图片时出错: {str(e)}")
+        return None
 
 
 
@@ -113,17 +101,17 @@ def process_product_images(excel_path:str, output_dir: str) -> str:
 # --- Excel模板类型检测函数 ---
 def detect_template(sheet: xw.Sheet) -> dict:
     """
-    通过关键单元格内容检测Excel文件使用的模板格式
+    通过模板指纹注册表检测Excel文件使用的模板格式
     
     检测逻辑：
-    分析工厂概况工作表中的特定单元格内容，判断Excel文件使用的是哪种预定义模板。
-    不同模板对应不同的字段位置和数据结构配置。
+    每种模板在EXCEL_FTY_TEMPLATE_REGISTRY中声明若干特征单元格及预期关键词，
+    一次批量读取覆盖所有特征单元格的区域后，对所有已注册模板打分并选出最佳匹配。
     
     检测流程：
-    1. 读取模板识别关键单元格（A38）的内容
-    2. 与预设的模板特征值进行匹配
-    3. 返回对应的模板配置对象
-    4. 如果无法识别则返回默认模板
+    1. 计算覆盖所有特征单元格的读取范围
+    2. 一次性批量读取该范围的单元格值
+    3. 调用模板匹配器打分（相同特征的文件直接命中缓存）
+    4. 返回最佳匹配的模板配置对象
     
     参数：
         sheet: xlwings工作表对象，指向"工厂概况"工作表
@@ -132,21 +120,21 @@ def detect_template(sheet: xw.Sheet) -> dict:
         dict: 模板配置对象，包含字段映射关系，无法识别时返回None
         
     模板识别标准：
-        - 模板1：A38单元格内容为"合作的贸易公司及合作情况"
-        - 模板2：A38单元格内容为其他值（默认模板）
+        - 得分 = 命中的特征单元格数 / 特征单元格总数
+        - 得分低于EXCEL_TEMPLATE_MIN_SCORE时记录低置信度告警
+        - 所有模板均未命中时返回None
         
     """
     try:
-        # 步骤1：读取模板识别关键单元格
-        cell_value = sheet.range('A38').value
+        # 步骤1：计算批量读取范围
+        max_row, max_col = get_signature_bounds()
         
-        # 步骤2：根据单元格内容选择对应模板
-        if cell_value == "合作的贸易公司及合作情况":
-            # 识别为第一种模板格式
-            return EXCEL_FORMATE_FTY_1
-        else:
-            # 识别为第二种模板格式（默认）
-            return EXCEL_FORMATE_FTY_2
+        # 步骤2：一次性读取特征区域
+        grid = sheet.range((1, 1), (max_row, max_col)).options(ndim=2).value
+        
+        # 步骤3：对所有已注册模板打分
+        template_name, template, score = match_template(grid)
+        return template
     except Exception as e:
         logging.error(f"检测模板类型时出错: {str(e)}")
         return None
@@ -222,6 +210,31 @@ def extract_data_by_template(sheet: xw.Sheet, template: dict) -> dict:
 
 
 
+# --- 二维网格模板数据提取函数 ---
+def extract_data_from_grid(grid: list, template: dict) -> dict:
+    """
+    根据模板配置从已读取的二维单元格值中提取工厂数据（xls文件直接解析时使用）
+    
+    参数：
+        grid (list): 以A1为起点的二维值列表
+        template (dict): 模板配置对象，包含字段到单元格的映射关系
+        
+    返回：
+        dict: 提取的工厂数据字典，处理失败时返回None
+    """
+    try:
+        result = {}
+        for field, config in template.items():
+            # 跳过非字典类型的配置项
+            if not isinstance(config, dict):
+                continue
+            result[field] = get_grid_value(grid, config["value_cell"])
+        return result
+    except Exception as e:
+        logging.error(f"提取数据时出错: {str(e)}")
+        return None
+
+
 # --- 工厂概况工作表处理函数 ---
 def process_factory_overview(wb: xw.Book) -> tuple[dict, dict]:
     """
@@ -271,30 +284,92 @@ def process_factory_overview(wb: xw.Book) -> tuple[dict, dict]:
         return None,None
 
 
-# --- Excel转换成json(dict)函数 ---
-def process_excel(excel_path:str) -> dict:
+# --- xls工作簿数据和图片提取函数 ---
+def extract_factory_xls(excel_path: str, include_images: bool = True) -> tuple[dict, list]:
     """
-    Excel工厂信息文件的完整处理主函数
+    不启动Excel，直接解析BIFF格式的xls文件，提取工厂概况数据和主要产品图片
     
-    处理功能：
-    统一处理包含工厂概况和产品图片的Excel文件，提取所有相关数据，
-    转换为标准化的JSON格式，并保存产品图片到指定目录。
+    处理流程：
+    1. 用xlrd读取"工厂概况"工作表的全部单元格值
+    2. 模板指纹匹配并按模板提取工厂数据
+    3. 验证工厂名称并转换为标准JSON格式
+    4. 从BIFF绘图层读取主要产品图片（可选）
+    
+    参数：
+        excel_path (str): 待处理的xls文件完整路径
+        include_images (bool): 是否读取"主要产品图片"工作表中的图片
+        
+    返回：
+        tuple: (标准化的工厂数据JSON对象, [(图片字节, 扩展名), ...])
+               数据提取失败时返回 (None, None)
+    """
+    try:
+        # 步骤1：读取工厂概况工作表
+        grid = read_xls_sheet_values(excel_path, "工厂概况")
+        if grid is None:
+            logging.error(f"工厂概况sheet不存在")
+            return None, None
+        
+        # 步骤2：模板匹配并提取数据
+        template_name, template, score = match_template(grid)
+        if not template:
+            return None, None
+        factory_data = extract_data_from_grid(grid, template)
+        if not factory_data:
+            logging.error("未能正确获取工厂数据")
+            return None, None
+        
+        # 步骤3：验证工厂名称并转换为JSON
+        if "factory_name" not in factory_data:
+            logging.error("缺少factory_name字段")
+            return None, None
+        data_json = json_from_factory_data(factory_data, template, excel_path, None)
+        
+        # 步骤4：读取产品图片
+        product_images = None
+        if include_images:
+            try:
+                product_images = read_product_images(excel_path)
+                if product_images is None:
+                    logging.warning(f"主要产品图片sheet不存在")
+            except Exception as e:
+                logging.error(f"读取主要产品图片sheet时出错: {str(e)}")
+        
+        return data_json, product_images
+    
+    except Exception as e:
+        logging.error(f"处理Excel文件 {excel_path} 时出错: {str(e)}")
+        return None, None
+
+
+# --- Excel工作簿数据和图片提取函数 ---
+def extract_factory_workbook(excel_path: str, include_images: bool = True) -> tuple[dict, list]:
+    """
+    打开一次Excel工作簿，同时提取工厂概况数据和主要产品图片
     
     处理流程：
     1. 打开Excel文件并初始化应用程序
     2. 处理工厂概况工作表获取基础数据
     3. 验证工厂名称等关键字段
-    4. 处理主要产品图片工作表（如果存在）
-    5. 将工厂数据转换为标准JSON格式
+    4. 将工厂数据转换为标准JSON格式
+    5. 读取主要产品图片工作表中的图片（可选）
     6. 清理资源并关闭Excel应用程序
     
     参数：
         excel_path (str): 待处理的Excel文件完整路径
+        include_images (bool): 是否读取"主要产品图片"工作表中的图片
         
     返回：
-        dict: 标准化的工厂数据JSON对象，处理失败时返回None
+        tuple: (标准化的工厂数据JSON对象, [(图片字节, 扩展名), ...])
+               数据提取失败时返回 (None, None)
+        
+    说明：
+        xls文件直接解析BIFF格式，不启动Excel（见extract_factory_xls）
         
     """
+    if excel_path.lower().endswith('.xls'):
+        return extract_factory_xls(excel_path, include_images)
+    
     try:
         # 步骤1：初始化Excel应用程序（无界面模式）
         app = xw.App(visible=False)
@@ -305,20 +380,31 @@ def process_excel(excel_path:str) -> dict:
         factory_data ,template= process_factory_overview(wb)
         if not factory_data:
             logging.error("未能正确获取工厂数据")
-            return None
+            return None, None
         
         # 步骤3：验证关键字段 - 工厂名称
         if "factory_name" not in factory_data:
             logging.error("缺少factory_name字段")
-            return None
+            return None, None
 
         # 步骤4：将工厂数据转换为标准JSON格式
         data_json=json_from_factory_data(factory_data,template,excel_path,img_output_folder_path)
         
-        return data_json
+        # 步骤5：读取产品图片（直接解析Excel文件包/BIFF绘图层，不经过xlwings工作簿）
+        product_images = None
+        if include_images:
+            try:
+                product_images = read_product_images(excel_path)
+                if product_images is None:
+                    logging.warning(f"主要产品图片sheet不存在")
+            except Exception as e:
+                logging.error(f"读取主要产品图片sheet时出错: {str(e)}")
+        
+        return data_json, product_images
         
     except Exception as e:
         logging.error(f"处理Excel文件 {excel_path} 时出错: {str(e)}")
+        return None, None
     
     finally:
         # Excel资源清理
@@ -335,6 +421,22 @@ def process_excel(excel_path:str) -> dict:
             logging.warning(f'关闭app时出错: {e}')
 
 
+# --- Excel转换成json(dict)函数 ---
+def process_excel(excel_path:str) -> dict:
+    """
+    Excel工厂信息文件的数据提取函数（不读取产品图片）
+    
+    参数：
+        excel_path (str): 待处理的Excel文件完整路径
+        
+    返回：
+        dict: 标准化的工厂数据JSON对象，处理失败时返回None
+        
+    """
+    data_json, _ = extract_factory_workbook(excel_path, include_images=False)
+    return data_json
+
+
 #---------------------- Excel文件处理主模块 --------------------------------
 
 # --- 非标准Excel文件保存JSON主函数 ---
@@ -347,9 +449,9 @@ def non_standard_excel_save_json(file_path:str, output_dir:str) -> bool:
     转换为标准JSON格式并保存到指定目录。
     
     处理流程：
-    1. 调用Excel处理函数提取工厂数据
+    1. 打开一次工作簿，提取工厂数据和产品图片
     2. 清洗工厂名称并创建输出文件夹
-    3. 提取并保存产品图片
+    3. 保存产品图片
     4. 保存JSON结果文件
     
     参数：
@@ -360,16 +462,16 @@ def non_standard_excel_save_json(file_path:str, output_dir:str) -> bool:
         bool: 处理成功返回True，失败返回False
     """
         
-    # 步骤1：处理Excel文件提取数据
-    json_result = process_excel(file_path)
+    # 步骤1：处理Excel文件提取数据和产品图片
+    json_result, product_images = extract_factory_workbook(file_path)
 
     if json_result:
         # 步骤2：清洗工厂名称并创建文件夹
         factory_name = clean_factory_name(json_result.get('厂商名称'))
         vendor_folder = make_vendor_folder(factory_name,output_dir)
         
-        # 步骤3：提取并保存产品图片
-        img_product_dir = process_product_images(file_path, vendor_folder)
+        # 步骤3：保存产品图片
+        img_product_dir = save_product_images(product_images, vendor_folder)
         if img_product_dir:
             json_result['图片文件夹路径'] = img_product_dir
         else:
@@ -1,17 +1,23 @@
 # 将包含多个工厂信息的Excel文件转换为标准化的JSON格式数据
-# 支持多工作表处理，自动解析工厂信息字段，提取产品图片，生成规范化输出
+# 支持多工作表处理（可选按工作表多进程并行），自动解析工厂信息字段，提取产品图片，生成规范化输出
+# xls文件直接解析BIFF格式（xlrd读取单元格 + 绘图层读取图片），无需Excel实例
 
 import xlwings as xw
+import openpyxl
 import json
 import logging
 import os
 import sys
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from setting.config import *
 from processor_rely.parse_factory_info import parse_factory_info
-from processor_rely.excel_extract_product_img import extract_product_images
+from processor_rely.excel_extract_product_img import extract_product_images, group_row_images, save_row_images
+from processor_rely.excel_package_reader import read_sheet_anchored_images
+from processor_rely.excel_xls_reader import read_xls_sheet_names, read_xls_sheet_values, read_xls_sheet_images
 
 from src.utils.clean_factory_name import clean_factory_name
 from src.utils.save_result_to_json import make_vendor_folder,save_result_to_vendor_folder
@@ -79,10 +85,172 @@ def clean_product_category(product_category: str) -> str:
     return ','.join(unique_items)
 
 
+#---------------------- 表头映射与行数据转换函数 --------------------------------
+
+# --- 表头清理函数 ---
+def clean_headers(header_values: list) -> list:
+    """
+    清理表头单元格值，空值转为''，其余转为去除首尾空白的字符串
+    
+    参数：
+        header_values (list): 表头行的原始单元格值
+    
+    返回：
+        list: 清理后的表头字符串列表
+    """
+    headers = []
+    for header_value in header_values:
+        # 处理空表头和不同数据类型
+        if header_value is None:
+            headers.append("")
+        elif isinstance(header_value, str):
+            headers.append(header_value.strip())
+        else:
+            headers.append(str(header_value).strip())
+    return headers
+
+
+# 表头别名反向索引：{别名: 目标字段名}，由配置一次性构建（别名重复时以配置中先出现的字段为准）
+HEADER_ALIAS_INDEX = {}
+for _field, _aliases in TEXT_LABELS_excel_all_factory.items():
+    for _alias in _aliases:
+        HEADER_ALIAS_INDEX.setdefault(_alias, _field)
+
+# 表头映射缓存：{表头元组: (列映射, 产品图片起始列索引)}，相同布局的工作表直接复用
+_COLUMN_MAPPING_CACHE = {}
+
+
+# --- 表头字段映射函数 ---
+def build_column_mapping(headers: list) -> tuple[dict, int]:
+    """
+    根据表头别名反向索引建立列索引到目标字段的映射，并定位产品图片起始列
+    
+    处理逻辑：
+        1. 以表头元组为键查询缓存，重复出现的布局直接返回
+        2. 逐列在HEADER_ALIAS_INDEX中查找目标字段
+        3. 未映射的表头（"工厂信息"和产品图片列除外）按布局汇总记录一次
+    
+    参数：
+        headers (list): 清理后的表头字符串列表
+    
+    返回：
+        tuple: ({列索引: 目标字段名}, 产品图片起始列索引(0基准，不存在时为None))
+    """
+    layout_key = tuple(headers)
+    if layout_key in _COLUMN_MAPPING_CACHE:
+        return _COLUMN_MAPPING_CACHE[layout_key]
+    
+    # 映射结构: {列索引: 目标字段名}
+    column_mapping = {}
+    unmapped_headers = []
+    for col_idx, header in enumerate(headers):
+        # 跳过空表头
+        if not header:
+            continue
+        
+        field = HEADER_ALIAS_INDEX.get(header)
+        if field:
+            column_mapping[col_idx] = field
+        elif header != "工厂信息" and not header.startswith("产品图片"):
+            unmapped_headers.append(header)
+    
+    # 获取产品图片起始列索引
+    product_img_start_col_idx = headers.index("产品图片1") if "产品图片1" in headers else None
+    
+    if unmapped_headers:
+        logging.warning(f"未映射的列: {unmapped_headers}")
+    
+    _COLUMN_MAPPING_CACHE[layout_key] = (column_mapping, product_img_start_col_idx)
+    return column_mapping, product_img_start_col_idx
+
+
+# --- 单元格值转字符串函数 ---
+def cell_value_to_str(cell_value) -> str:
+    """
+    将单元格值转换为去除首尾空白的字符串
+    
+    xlwings和xlrd读取的数字均为float，openpyxl读取的整数为int；整数值的float按int输出
+    （如电话13800000000.0输出为13800000000），保证不同读取方式得到相同的工厂数据
+    """
+    if isinstance(cell_value, float) and cell_value.is_integer():
+        cell_value = int(cell_value)
+    return str(cell_value).strip()
+
+
+# --- 单行工厂数据转换函数 ---
+def build_factory_data(headers: list, column_mapping: dict, row_values: list) -> dict:
+    """
+    将一行单元格值转换为基于JSON_FORMAT的工厂数据
+    
+    处理流程：
+    1. 执行常规字段映射转换（多值字段用换行合并，未映射的列已在build_column_mapping中按布局记录）
+    2. 特殊处理"工厂信息"复合字段并解析
+    3. 清洗含换行的主营产品字段
+    
+    参数：
+        headers (list): 清理后的表头字符串列表
+        column_mapping (dict): {列索引: 目标字段名}
+        row_values (list): 当前行的单元格值
+    
+    返回：
+        dict: 工厂数据字典（厂商名称未清洗）
+    """
+    # 初始化工厂数据结构(基于JSON模板)
+    factory_data = JSON_FORMAT.copy()
+    factory_info_raw = None  # 存储原始工厂信息字段
+    
+    # 遍历当前行的所有列数据
+    for col_idx, header_name in enumerate(headers):
+        if not header_name:  # 跳过空表头列
+            continue
+        
+        # 获取单元格数值，处理空值情况
+        cell_value = row_values[col_idx] if col_idx < len(row_values) else None
+        if cell_value is None:
+            continue
+        
+        # 转换为字符串并清理空白（整数值统一输出，不带".0"）
+        str_value = cell_value_to_str(cell_value)
+        
+        # 根据表头名称进行字段分类处理（特殊字段）
+        if header_name == "工厂信息":
+            # 特殊处理复合工厂信息字段
+            factory_info_raw = str_value
+        elif col_idx in column_mapping:
+            # 处理已建立映射的标准字段
+            field_name = column_mapping[col_idx]
+            
+            # 处理多值字段合并
+            current_value = factory_data[field_name]
+            if current_value:
+                factory_data[field_name] += f"\n{str_value}"
+            else:
+                factory_data[field_name] = str_value
+    
+    # 解析复合工厂信息字段（特殊字段）
+    if factory_info_raw:
+        parsed_info = parse_factory_info(factory_info_raw)
+        factory_data.update(parsed_info)
+    
+    # 处理主营产品字段清洗
+    if factory_data.get("主营产品") and "\n" in factory_data["主营产品"]:
+        cleaned_products = clean_product_category(factory_data["主营产品"])
+        factory_data["主营产品"] = cleaned_products
+        logging.debug(f"主营产品清洗: {factory_data['主营产品'][:50]}{'...' if len(factory_data['主营产品']) > 50 else ''}")
+    
+    return factory_data
+
+
+# --- 行是否为空判断函数 ---
+def is_empty_row(row_values: list) -> bool:
+    """判断一行单元格是否全部为空"""
+    return all(cell is None or str(cell).strip() == "" for cell in row_values)
+
+
 #---------------------- 核心转换处理函数 --------------------------------
 
 # --- Excel转JSON主处理函数 ---
-def excel_standard_allftys_map_to_json(input_path: str, output_dir: str, header_row: int) -> bool:
+def excel_standard_allftys_map_to_json(input_path: str, output_dir: str, header_row: int, workers: int = 0) -> bool:
     """
     将Excel文件中的工厂信息转换为标准化JSON格式并按厂商分类存储
     
@@ -101,10 +269,18 @@ def excel_standard_allftys_map_to_json(input_path: str, output_dir: str, header_
         input_path (str): 输入Excel文件路径
         output_dir (str): 输出文件夹路径
         header_row (int): 表头所在行号(从1开始)
+        workers (int): 工作进程数，>1时按工作表分发到多个进程并用openpyxl/xlrd读取，默认0为串行
     
     返回：
         bool: 处理成功返回True，失败返回False
+    
+    读取方式：
+        - xls文件：始终直接解析BIFF格式，不启动Excel
+        - xlsx文件：workers>1时用openpyxl按工作表并行读取，否则通过xlwings串行读取
     """
+    # xls文件及多进程模式：不经过Excel实例直接读取
+    if input_path.lower().endswith('.xls') or (workers and workers > 1):
+        return excel_standard_allftys_native(input_path, output_dir, header_row, workers)
     
     # 初始化Excel应用实例
     app = None
@@ -114,9 +290,14 @@ def excel_standard_allftys_map_to_json(input_path: str, output_dir: str, header_
         app = xw.App(visible=False)
         wb = app.books.open(input_path)
         
+        # 成功处理计数器
+        success_count = 0
+        
         # 步骤2: 遍历工作簿中的所有工作表
         for sheet in wb.sheets:
             sheet_name = sheet.name
+            sheet_start = time.perf_counter()
+            sheet_success_count = 0
             
             # 检查工作表数据有效性
             if not sheet.used_range or sheet.used_range.last_cell.row <= header_row:
@@ -126,42 +307,10 @@ def excel_standard_allftys_map_to_json(input_path: str, output_dir: str, header_
             # 步骤3: 解析表头信息
             last_col = sheet.used_range.last_cell.column
             header_range = sheet.range((header_row, 1), (header_row, last_col))
-            headers = []
-            
-            # 获取并清理表头数据
-            for cell in header_range:
-                header_value = cell.value
-                # 处理空表头和不同数据类型
-                if header_value is None:
-                    headers.append("")
-                elif isinstance(header_value, str):
-                    headers.append(header_value.strip())
-                else:
-                    headers.append(str(header_value).strip())
+            headers = clean_headers(header_range.value if last_col > 1 else [header_range.value])
             
             # 步骤4: 建立字段映射关系
-            # 映射结构: {列索引: 目标字段名}
-            column_mapping = {}
-            for col_idx, header in enumerate(headers):
-                # 跳过空表头
-                if not header:
-                    continue
-                
-                # 在配置映射中查找匹配项
-                for field, aliases in TEXT_LABELS_excel_all_factory.items():
-                    if header in aliases:
-                        column_mapping[col_idx] = field
-                        break
-            
-            # 获取产品图片起始列索引
-            product_img_start_col_idx = None
-            for idx, header in enumerate(headers):
-                if header == "产品图片1":
-                    product_img_start_col_idx = idx
-                    break
-
-            # 成功处理计数器
-            success_count = 0
+            column_mapping, product_img_start_col_idx = build_column_mapping(headers)
             
             # 步骤5: 处理数据行内容
             data_start_row = header_row + 1
@@ -171,54 +320,13 @@ def excel_standard_allftys_map_to_json(input_path: str, output_dir: str, header_
                 # 读取当前行所有单元格数据
                 row_values = [sheet.cells(row_idx, col + 1).value for col in range(len(headers))]
                 # 检查是否为空行，如是则终止处理
-                if all(cell is None or str(cell).strip() == "" for cell in row_values):
+                if is_empty_row(row_values):
                     break
                 
-                # 初始化工厂数据结构(基于JSON模板)
-                factory_data = JSON_FORMAT.copy()
-                factory_info_raw = None  # 存储原始工厂信息字段
-                
-                # 步骤6: 遍历当前行的所有列数据
-                for col_idx in range(len(headers)):
-                    # 获取当前列的表头名称
-                    header_name = headers[col_idx]
-                    if not header_name:  # 跳过空表头列
-                        continue
-                    
-                    # 获取单元格数值
-                    cell_value = sheet.cells(row_idx, col_idx + 1).value
-                    
-                    # 处理空值情况
-                    if cell_value is None:
-                        continue
-                    
-                    # 转换为字符串并清理空白
-                    str_value = str(cell_value).strip()
-                    
-                    # 根据表头名称进行字段分类处理（特殊字段）
-                    if header_name == "工厂信息":
-                        # 特殊处理复合工厂信息字段
-                        factory_info_raw = str_value
-                    elif col_idx in column_mapping:
-                        # 处理已建立映射的标准字段
-                        field_name = column_mapping[col_idx]
-                        
-                        # 处理多值字段合并
-                        current_value = factory_data[field_name]
-                        if current_value:
-                            factory_data[field_name] += f"\n{str_value}"
-                        else:
-                            factory_data[field_name] = str_value
-                    else:
-                        # 记录未映射的字段信息
-                        logging.warning(f"未映射的列: {header_name} = {str_value}")
-                
-                # 步骤7: 解析复合工厂信息字段（特殊字段）
-                if factory_info_raw:
-                    parsed_info = parse_factory_info(factory_info_raw)
-                    factory_data.update(parsed_info)
+                # 步骤6: 字段映射和复合字段解析
+                factory_data = build_factory_data(headers, column_mapping, row_values)
 
-                # 步骤8: 处理工厂名称并生成文件路径
+                # 步骤7: 处理工厂名称并生成文件路径
                 factory_name = factory_data["厂商名称"]
             
                 if not factory_name:
@@ -226,12 +334,6 @@ def excel_standard_allftys_map_to_json(input_path: str, output_dir: str, header_
                     continue
                 factory_name=clean_factory_name(factory_name)
                 
-                # 步骤9: 处理主营产品字段清洗
-                if factory_data.get("主营产品") and "\n" in factory_data["主营产品"]:
-                    cleaned_products = clean_product_category(factory_data["主营产品"])
-                    factory_data["主营产品"] = cleaned_products
-                    logging.debug(f"主营产品清洗: {factory_data['主营产品'][:50]}{'...' if len(factory_data['主营产品']) > 50 else ''}")
-                
                 # 创建厂商专属文件夹
                 vendor_folder = make_vendor_folder(factory_name, output_dir)
                 
@@ -246,7 +348,10 @@ def excel_standard_allftys_map_to_json(input_path: str, output_dir: str, header_
                 # 保存处理结果到厂商文件夹
                 save_result_to_vendor_folder(vendor_folder, factory_data)
                 
-                success_count += 1
+                sheet_success_count += 1
+            
+            success_count += sheet_success_count
+            logging.info(f"工作表 '{sheet_name}' 处理完成: {sheet_success_count} 个工厂, 耗时 {time.perf_counter() - sheet_start:.2f}s")
         
         logging.info(f"所有工作表处理完成   输出目录: {output_dir}  成功处理 {success_count} 个工厂数据")
         return True
@@ -266,6 +371,164 @@ def excel_standard_allftys_map_to_json(input_path: str, output_dir: str, header_
             logging.warning(f"资源清理时出错: {str(e)}")
 
 
+#---------------------- 工作表级多进程处理函数 --------------------------------
+
+# --- 单个工作表读取函数（工作进程） ---
+def read_sheet_records(input_path: str, sheet_name: str, header_row: int) -> dict:
+    """
+    独立读取单个工作表（可在工作进程中执行），返回该表的工厂记录和产品图片
+    
+    处理流程：
+    1. 独立加载工作表（不共享Excel实例）：xlsx用openpyxl只读模式读取单元格值、从文件包中只解析该表的drawing部件读取图片，
+       xls用xlrd和BIFF绘图层解析
+    2. 解析表头并建立字段映射关系
+    3. 按行收集产品图片列中锚定的图片
+    4. 逐行转换为工厂数据，遇到空行终止
+    
+    参数：
+        input_path (str): 输入Excel文件路径（xlsx或xls）
+        sheet_name (str): 工作表名称
+        header_row (int): 表头所在行号(从1开始)
+    
+    返回：
+        dict: {"sheet_name": 工作表名, "records": [{"row_idx", "factory_data", "images"}, ...], "elapsed": 耗时秒数}
+    """
+    sheet_start = time.perf_counter()
+    records = []
+    
+    # 步骤1: 加载工作表
+    if input_path.lower().endswith('.xls'):
+        grid = read_xls_sheet_values(input_path, sheet_name) or []
+        
+        def load_row_images(start_col_idx):
+            return group_row_images(read_xls_sheet_images(input_path, sheet_name) or [], start_col_idx)
+        
+        wb = None
+        rows = iter(grid[header_row - 1:]) if len(grid) > header_row else None
+    else:
+        # 只读模式按需解析该表的单元格，不加载其他工作表和全部图片
+        wb = openpyxl.load_workbook(input_path, read_only=True, data_only=True)
+        ws = wb[sheet_name]
+        
+        def load_row_images(start_col_idx):
+            anchored_images = read_sheet_anchored_images(input_path, sheet_name) or []
+            return group_row_images([item for item in anchored_images if item[0] is not None], start_col_idx)
+        
+        # 只读模式下的行长度可能不一致，逐行补齐到表头长度
+        rows = ws.iter_rows(min_row=header_row, values_only=True)
+    
+    try:
+        if rows is not None:
+            # 步骤2: 解析表头并建立映射
+            header_values = next(rows, None)
+            if header_values is None:
+                return {"sheet_name": sheet_name, "records": records, "elapsed": time.perf_counter() - sheet_start}
+            headers = clean_headers(list(header_values))
+            column_mapping, product_img_start_col_idx = build_column_mapping(headers)
+            
+            # 步骤3: 按行收集产品图片
+            row_images = {}
+            if product_img_start_col_idx is not None:
+                row_images = load_row_images(product_img_start_col_idx)
+            
+            # 步骤4: 逐行转换
+            for row_idx, row_values in enumerate(rows, header_row + 1):
+                row_values = (list(row_values) + [None] * len(headers))[:len(headers)]
+                if is_empty_row(row_values):
+                    break
+                
+                factory_data = build_factory_data(headers, column_mapping, row_values)
+                if not factory_data["厂商名称"]:
+                    logging.warning(f"工作表 '{sheet_name}' 第 {row_idx} 行缺少工厂名称，跳过")
+                    continue
+                
+                records.append({
+                    "row_idx": row_idx,
+                    "factory_data": factory_data,
+                    "images": row_images.get(row_idx, []) if product_img_start_col_idx is not None else None,
+                })
+    finally:
+        if wb is not None:
+            wb.close()
+    
+    return {"sheet_name": sheet_name, "records": records, "elapsed": time.perf_counter() - sheet_start}
+
+
+# --- 无Excel实例的Excel转JSON处理函数 ---
+def excel_standard_allftys_native(input_path: str, output_dir: str, header_row: int, workers: int = 0) -> bool:
+    """
+    不启动Excel，直接读取xlsx/xls文件；workers>1时按工作表分发到进程池处理，结果按工作表顺序合并写出
+    
+    处理流程：
+    1. 读取工作表名称列表
+    2. 每个工作表提交一个读取任务，工作进程独立打开文件（workers<=1时在当前进程依次读取）
+    3. 按工作表原始顺序收集结果，报告每个工作表的耗时
+    4. 在主进程中按工作表、行的顺序创建厂商文件夹、保存图片和JSON
+       （厂商文件夹的重名后缀与串行处理保持一致且可复现）
+    
+    参数：
+        input_path (str): 输入Excel文件路径（xlsx或xls）
+        output_dir (str): 输出文件夹路径
+        header_row (int): 表头所在行号(从1开始)
+        workers (int): 工作进程数，<=1时不启动进程池
+    
+    返回：
+        bool: 所有工作表处理成功返回True，否则返回False
+    """
+    try:
+        # 步骤1: 读取工作表名称
+        if input_path.lower().endswith('.xls'):
+            sheet_names = read_xls_sheet_names(input_path)
+        else:
+            wb = openpyxl.load_workbook(input_path, read_only=True)
+            sheet_names = wb.sheetnames
+            wb.close()
+    except Exception as e:
+        logging.error(f"读取工作表列表失败: {input_path}, 错误: {str(e)}", exc_info=True)
+        return False
+    
+    total_start = time.perf_counter()
+    all_ok = True
+    success_count = 0
+    
+    # 步骤2: 提交读取任务（workers<=1时不启动进程池，在合并时依次读取）
+    executor = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    try:
+        if executor is not None:
+            futures = [executor.submit(read_sheet_records, input_path, sheet_name, header_row) for sheet_name in sheet_names]
+        else:
+            futures = [None] * len(sheet_names)
+        
+        # 步骤3-4: 按工作表顺序合并结果
+        for sheet_name, future in zip(sheet_names, futures):
+            try:
+                sheet_result = future.result() if future is not None else read_sheet_records(input_path, sheet_name, header_row)
+            except Exception as e:
+                all_ok = False
+                logging.error(f"工作表 '{sheet_name}' 处理失败: {str(e)}", exc_info=True)
+                continue
+            
+            for record in sheet_result["records"]:
+                factory_data = record["factory_data"]
+                factory_name = clean_factory_name(factory_data["厂商名称"])
+                vendor_folder = make_vendor_folder(factory_name, output_dir)
+                
+                if record["images"] is not None:
+                    factory_data["图片文件夹路径"] = save_row_images(record["images"], vendor_folder, factory_name)
+                
+                factory_data["文件路径"] = input_path
+                save_result_to_vendor_folder(vendor_folder, factory_data)
+                success_count += 1
+            
+            logging.info(f"工作表 '{sheet_name}' 处理完成: {len(sheet_result['records'])} 个工厂, 读取耗时 {sheet_result['elapsed']:.2f}s")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    logging.info(f"所有工作表处理完成   输出目录: {output_dir}  成功处理 {success_count} 个工厂数据, 总耗时 {time.perf_counter() - total_start:.2f}s")
+    return all_ok
+
+
 #---------------------- 程序执行入口 --------------------------------
 
 # 主程序入口 - 用于测试和批量处理
@@ -1,18 +1,23 @@
 # PDF工厂信息综合处理模块
 # 功能：从PDF文件中提取多工厂信息和产品图片，转换为标准化JSON格式
-# 特性：支持多页处理、文字图片分离识别、图片智能过滤、工厂信息自动映射、批量处理
+# 特性：支持多页处理、文字图片分离识别、图片智能过滤、工厂信息自动映射、批量处理、按页多进程并行
 
 import fitz  # PyMuPDF
 from pathlib import Path
 import re
+import json
+import hashlib
 import logging
 import os
 import sys
+import math
+from concurrent.futures import ProcessPoolExecutor
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from setting.config import *
 from src.utils.clean_factory_name import clean_factory_name
 from src.utils.save_result_to_json import make_vendor_folder,save_result_to_vendor_folder
+from src.utils.pdf_image_export import export_pdf_image, image_metadata
 
 # 日志配置
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -107,8 +112,157 @@ def extract_fields(text: str) -> dict:
 
 
 
+# --- 图片尺寸过滤函数 ---
+def filter_image_by_size(width: int, height: int, policy: dict = None) -> str:
+    """
+    根据图片宽高元数据判断是否需要跳过，无需提取图片数据
+    
+    参数：
+        width (int): 图片宽度（像素）
+        height (int): 图片高度（像素）
+        policy (dict, optional): 过滤策略，默认使用PDF_IMAGE_FILTER_POLICY
+        
+    返回：
+        str: 需要跳过时返回跳过原因，保留时返回None
+    """
+    policy = policy or PDF_IMAGE_FILTER_POLICY
+    
+    # 跳过分辨率过大的背景图片
+    background_w, background_h = policy.get("background_min_size") or (float('inf'), float('inf'))
+    if width >= background_w and height >= background_h:
+        return f"跳过分辨率为 {width}x{height} 的背景图片"
+    
+    # 跳过过小的图片（可能是图标或装饰性图片）
+    min_w, min_h = policy.get("min_size") or (0, 0)
+    if width < min_w or height < min_h:
+        return f"跳过分辨率过小的图片 {width}x{height}"
+    
+    # 跳过长宽比过于悬殊的图片（如分割线、横幅）
+    max_aspect_ratio = policy.get("max_aspect_ratio")
+    if max_aspect_ratio and min(width, height) > 0 and max(width, height) / min(width, height) > max_aspect_ratio:
+        return f"跳过长宽比过大的图片 {width}x{height}"
+    
+    return None
+
+
+# --- 图片去重状态初始化函数 ---
+def new_image_dedup_state() -> dict:
+    """
+    创建单个PDF文档的图片去重状态
+    
+    返回：
+        dict: {
+            "xref_hashes": {xref: (内容哈希, 扩展名)}，文档内同一xref只提取一次,
+            "folders": {图片文件夹: {"files": {内容哈希: 已保存文件名}, "metadata": {已保存文件名: 格式尺寸元数据},
+                                   "duplicates": {重复图片名: 已保存文件名}}}
+        }
+    """
+    return {"xref_hashes": {}, "folders": {}}
+
+
+# --- 图片文件夹状态获取函数 ---
+def get_folder_state(dedup_state: dict, output_dir: str) -> dict:
+    """获取（不存在时创建）图片文件夹的去重与元数据状态"""
+    return dedup_state["folders"].setdefault(output_dir, {"files": {}, "metadata": {}, "duplicates": {}})
+
+
+# --- 图片索引保存函数 ---
+def save_image_index(output_dir: str, dedup_state: dict) -> str:
+    """
+    将图片文件夹的图片元数据和去重结果写入索引文件
+    
+    参数：
+        output_dir (str): 工厂图片文件夹路径
+        dedup_state (dict): new_image_dedup_state创建的去重状态
+        
+    返回：
+        str: 索引文件路径，文件夹中没有图片时返回None
+        
+    索引结构：
+        - images: {文件名: {"hash", "ext", "width", "height", "colorspace", "has_alpha", "source"}}
+        - duplicates: {重复图片名: 已保存文件名}
+    """
+    folder_state = dedup_state["folders"].get(output_dir)
+    if not folder_state or not (folder_state["files"] or folder_state["duplicates"]):
+        return None
+    
+    index_path = os.path.join(output_dir, PDF_IMAGE_INDEX_NAME)
+    index_data = {
+        "images": {
+            file_name: {"hash": content_hash, **folder_state["metadata"].get(file_name, {})}
+            for content_hash, file_name in folder_state["files"].items()
+        },
+        "duplicates": folder_state["duplicates"],
+    }
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index_data, f, ensure_ascii=False, indent=4)
+    logging.info(f"图片索引已保存: {index_path}，图片 {len(folder_state['files'])} 张，重复图片 {len(folder_state['duplicates'])} 张")
+    return index_path
+
+
+# --- 文件内容比较函数 ---
+def file_has_content(file_path: str, content: bytes) -> bool:
+    """
+    判断文件是否已存在且内容与content完全相同（先比较大小，大小一致时再比较字节）
+    """
+    try:
+        if os.path.getsize(file_path) != len(content):
+            return False
+        with open(file_path, "rb") as f:
+            return f.read() == content
+    except OSError:
+        return False
+
+
+# --- 单张图片保存函数 ---
+def save_pdf_image(exported: dict, xref: int, img_index: int, output_dir: str,
+                   factory_name: str, page_num: int, dedup_state: dict = None) -> bool:
+    """
+    按标准命名保存一张已导出的图片，传入去重状态时按内容哈希去重并记录格式尺寸元数据
+    
+    参数：
+        exported (dict): export_pdf_image的导出结果（图片字节、扩展名、宽高等）
+        xref (int): 图片在文档中的引用ID
+        img_index (int): 图片在页面图像列表中的下标（0基准）
+        output_dir (str): 图片保存的目标目录路径
+        factory_name (str): 工厂名称，用于图片文件命名
+        page_num (int): 页面编号，用于图片文件命名
+        dedup_state (dict, optional): new_image_dedup_state创建的去重状态
+        
+    返回：
+        bool: 图片已保存（新写入，或同名文件内容相同无需写入）返回True，作为重复图片跳过返回False
+    """
+    image_bytes, image_ext = exported["image"], exported["ext"]
+    
+    # 生成标准化的图片文件名
+    img_filename = f"{factory_name}_第{page_num}页_图片{img_index + 1}.{image_ext}"
+    img_path = os.path.join(output_dir, img_filename)
+    
+    # 按内容哈希去重（不同xref的相同图片）
+    folder_state = None
+    if dedup_state is not None:
+        folder_state = get_folder_state(dedup_state, output_dir)
+        content_hash = hashlib.sha1(image_bytes).hexdigest()
+        dedup_state["xref_hashes"][xref] = (content_hash, image_ext)
+        if content_hash in folder_state["files"]:
+            folder_state["duplicates"][img_filename] = folder_state["files"][content_hash]
+            return False
+    
+    # 保存图片到本地文件（重复处理同一文档时，内容相同的已有文件不再写入）
+    if file_has_content(img_path, image_bytes):
+        logging.debug(f"图片已存在且内容相同，跳过写入: {img_path}")
+    else:
+        with open(img_path, "wb") as img_file:
+            img_file.write(image_bytes)
+    
+    if folder_state is not None:
+        folder_state["files"][content_hash] = img_filename
+        folder_state["metadata"][img_filename] = image_metadata(exported)
+    return True
+
+
 # --- PDF页面产品图片提取函数 ---
-def extract_images_from_pdf(page, doc, output_dir:str, factory_name:str, page_num: int) -> str:
+def extract_images_from_pdf(page, doc, output_dir:str, factory_name:str, page_num: int, dedup_state: dict = None) -> str:
     """
     从PDF的指定页面中提取所有有效图片并保存到本地文件夹
     
@@ -117,9 +271,9 @@ def extract_images_from_pdf(page, doc, output_dir:str, factory_name:str, page_nu
     过滤掉背景图片、装饰图标等无关图像，按标准格式命名保存。
     
     提取流程：
-    1. 获取页面中的所有图像对象列表
-    2. 遍历每个图像并提取图像数据
-    3. 检查图像尺寸并应用过滤规则
+    1. 获取页面中的所有图像对象列表（含宽高元数据）
+    2. 根据元数据中的尺寸应用过滤规则
+    3. 只对通过过滤的图像导出图像数据（原始流优先，蒙版/CMYK才经Pixmap转换）
     4. 生成标准化的图片文件名
     5. 保存符合条件的图片到指定目录
     6. 统计并返回保存结果
@@ -130,13 +284,19 @@ def extract_images_from_pdf(page, doc, output_dir:str, factory_name:str, page_nu
         output_dir (str): 图片保存的目标目录路径
         factory_name (str): 工厂名称，用于图片文件命名
         page_num (int): 页面编号，用于图片文件命名
+        dedup_state (dict, optional): new_image_dedup_state创建的去重状态，传入时启用去重
         
     返回：
         str: 成功保存图片时返回保存目录路径，无有效图片时返回None
         
-    图片过滤规则：
+    去重规则（传入dedup_state时）：
+        - 同一文档内已处理过的xref直接复用内容哈希，不再提取图片数据
+        - 同一图片文件夹内内容哈希相同的图片只保存一次，重复项记录到图片索引
+        
+    图片过滤规则（PDF_IMAGE_FILTER_POLICY）：
         - 跳过分辨率>=4005x2251的背景图片
         - 跳过分辨率<100x100的小图标
+        - 可选：跳过长宽比超过上限的图片
         - 保留中等尺寸的产品展示图片
         
     文件命名格式：
@@ -155,48 +315,42 @@ def extract_images_from_pdf(page, doc, output_dir:str, factory_name:str, page_nu
             
         # 初始化保存计数器
         saved_count = 0
+        folder_state = None
+        if dedup_state is not None:
+            folder_state = get_folder_state(dedup_state, output_dir)
         
         # 遍历处理每个图像对象
         for img_index, img in enumerate(img_list):
-            # 获取图像的引用ID
-            xref = img[0]
+            # 获取图像的引用ID和尺寸元数据：(xref, smask, width, height, ...)
+            xref, width, height = img[0], img[2], img[3]
             
             try:
-                # 提取图像的原始数据
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                image_ext = base_image["ext"]
-                
-                # 获取图像尺寸信息用于过滤
-                width = base_image.get("width", 0)
-                height = base_image.get("height", 0)
-                
-                # 应用图片过滤规则
-                # 跳过分辨率过大的背景图片
-                if width >= 4005 and height >= 2251:
-                    logging.info(f"跳过分辨率为 {width}x{height} 的背景图片")
-                    continue
-                
-                # 跳过过小的图片（可能是图标或装饰性图片）
-                if width < 100 or height < 100:
-                    logging.info(f"跳过分辨率过小的图片 {width}x{height}")
+                # 根据元数据应用图片过滤规则，被过滤的图片不提取数据
+                skip_reason = filter_image_by_size(width, height)
+                if skip_reason:
+                    logging.info(skip_reason)
                     continue
                 
-                # 生成标准化的图片文件名
-                img_filename = f"{factory_name}_第{page_num}页_图片{img_index + 1}.{image_ext}"
-                img_path = os.path.join(output_dir, img_filename)
+                # 文档内已处理过的xref：若该文件夹已保存相同内容则只记录重复项
+                if folder_state is not None and xref in dedup_state["xref_hashes"]:
+                    content_hash, image_ext = dedup_state["xref_hashes"][xref]
+                    if content_hash in folder_state["files"]:
+                        img_filename = f"{factory_name}_第{page_num}页_图片{img_index + 1}.{image_ext}"
+                        folder_state["duplicates"][img_filename] = folder_state["files"][content_hash]
+                        continue
                 
-                # 保存图片到本地文件
-                with open(img_path, "wb") as img_file:
-                    img_file.write(image_bytes)
-                
-                saved_count += 1
+                # 导出图像数据并保存
+                exported = export_pdf_image(doc, xref, img[1])
+                if save_pdf_image(exported, xref, img_index, output_dir, factory_name, page_num, dedup_state):
+                    saved_count += 1
                 
             except Exception as e:
                 logging.error(f"提取第{img_index + 1}个图像时出错: {str(e)}")
                 continue
         
         # 返回处理结果
+        if folder_state is not None and folder_state["duplicates"]:
+            logging.info(f"第{page_num}页跳过重复图片，文件夹累计重复 {len(folder_state['duplicates'])} 张")
         if saved_count > 0:
             logging.info(f"第{page_num}页成功保存了{saved_count}张图片")
             return output_dir
@@ -209,6 +363,43 @@ def extract_images_from_pdf(page, doc, output_dir:str, factory_name:str, page_nu
         return None
 
 
+# --- 工厂分组图片保存函数 ---
+def save_group_images(doc, image_pages: list[int], img_folder: str, factory_name: str, dedup_state: dict = None) -> dict:
+    """
+    提取并保存一个工厂分组所有图片页的图片，写出该文件夹的图片索引
+    
+    参数：
+        doc: PyMuPDF文档对象
+        image_pages (list[int]): 该工厂的图片页索引（0基准）
+        img_folder (str): 工厂图片文件夹路径
+        factory_name (str): 工厂名称，用于图片文件命名
+        dedup_state (dict, optional): 文档级去重状态，未传入时为该分组新建
+        
+    返回：
+        dict: {"img_folder": 图片文件夹, "saved_pages": [保存了图片的页码(1基准), ...], "index_path": 图片索引路径或None}
+    """
+    if dedup_state is None:
+        dedup_state = new_image_dedup_state()
+    
+    saved_pages = []
+    for image_page_index in image_pages:
+        try:
+            # 从图片页提取并保存图片（逐页读取，写出后即释放图片数据）
+            saved_folder_path = extract_images_from_pdf(doc[image_page_index], doc, img_folder, factory_name, image_page_index + 1, dedup_state)
+            
+            if saved_folder_path:
+                saved_pages.append(image_page_index + 1)
+                logging.info(f"从第 {image_page_index + 1} 页提取并保存了图片到: {saved_folder_path}")
+            else:
+                logging.info(f"第 {image_page_index + 1} 页没有提取到有效图片")
+                    
+        except Exception as e:
+            logging.error(f"处理第 {image_page_index + 1} 页图片时出错: {str(e)}")
+    
+    # 保存该工厂图片文件夹的图片索引
+    index_path = save_image_index(img_folder, dedup_state)
+    return {"img_folder": img_folder, "saved_pages": saved_pages, "index_path": index_path}
+
 
 # --- 信息映射到标准JSON格式函数 ---
 def map_to_standard_json(info_dict: dict, pdf_path: str, img_folder_path: str = None) -> dict:
@@ -311,10 +502,137 @@ def map_to_standard_json(info_dict: dict, pdf_path: str, img_folder_path: str =
     
     return result
 
+#---------------------- 页面分类与分组函数 --------------------------------
+
+# 文字页判定阈值：页面文本长度超过该值视为文字页，否则视为图片页
+TEXT_PAGE_MIN_LENGTH = 10
+
+
+# --- 页面类型分类函数 ---
+def classify_pages(doc) -> list[dict]:
+    """
+    一次遍历PDF所有页面，生成页面分类表（每页只提取一次文本）
+    
+    参数：
+        doc: PyMuPDF文档对象
+        
+    返回：
+        list[dict]: 按页序排列的分类表，每项包含：
+            - page_index: 页面索引（0基准）
+            - text: 去除首尾空白的页面文本
+            - text_length: 文本长度
+            - is_text_page: 是否为文字页（文本长度>TEXT_PAGE_MIN_LENGTH）
+    """
+    page_table = []
+    for page_index, page in enumerate(doc):
+        text = page.get_text().strip()
+        page_table.append({
+            "page_index": page_index,
+            "text": text,
+            "text_length": len(text),
+            "is_text_page": len(text) > TEXT_PAGE_MIN_LENGTH,
+        })
+    return page_table
+
+
+# --- 工厂页面分组函数 ---
+def group_factory_pages(page_table: list[dict]) -> tuple[list[dict], list[int]]:
+    """
+    根据页面分类表，将每个文字页与其后连续的图片页分为一组（一组对应一个工厂）
+    
+    参数：
+        page_table (list[dict]): classify_pages返回的页面分类表
+        
+    返回：
+        tuple: (工厂分组列表 [{"text_page": 文字页索引, "image_pages": [图片页索引, ...]}, ...],
+                第一个文字页之前没有对应工厂的图片页索引列表)
+    """
+    groups = []
+    orphan_image_pages = []
+    for page_info in page_table:
+        if page_info["is_text_page"]:
+            groups.append({"text_page": page_info["page_index"], "image_pages": []})
+        elif groups:
+            groups[-1]["image_pages"].append(page_info["page_index"])
+        else:
+            orphan_image_pages.append(page_info["page_index"])
+    return groups, orphan_image_pages
+
+
+#---------------------- 按页多进程读取函数 --------------------------------
+
+# --- 页面范围读取函数（工作进程） ---
+def read_page_range(pdf_path: str, start: int, end: int) -> list[dict]:
+    """
+    在工作进程中独立打开PDF，读取[start, end)范围内页面的分类和字段
+    （图片由save_group_images_worker按工厂分组在工作进程中写出，此处不读取图片数据）
+    
+    参数：
+        pdf_path (str): PDF文件路径
+        start (int): 起始页索引（0基准，包含）
+        end (int): 结束页索引（不包含）
+        
+    返回：
+        list[dict]: 与classify_pages结构相同的页面记录，文字页另外附带 fields: extract_fields解析结果
+    """
+    page_records = []
+    with fitz.open(pdf_path) as doc:
+        for page_index in range(start, end):
+            page = doc[page_index]
+            text = page.get_text().strip()
+            page_info = {
+                "page_index": page_index,
+                "text": text,
+                "text_length": len(text),
+                "is_text_page": len(text) > TEXT_PAGE_MIN_LENGTH,
+            }
+            if page_info["is_text_page"]:
+                page_info["fields"] = extract_fields(text)
+            page_records.append(page_info)
+    return page_records
+
+
+# --- 多进程页面分类函数 ---
+def classify_pages_parallel(executor: ProcessPoolExecutor, pdf_path: str, total_pages: int, workers: int) -> list[dict]:
+    """
+    将页面范围切分到多个工作进程读取，按页序合并为页面分类表
+    
+    参数：
+        executor (ProcessPoolExecutor): 进程池
+        pdf_path (str): PDF文件路径
+        total_pages (int): PDF总页数
+        workers (int): 工作进程数
+        
+    返回：
+        list[dict]: 按页序排列的页面记录（结构见read_page_range）
+    """
+    # 每个进程分到约4段，平衡各段页面的处理耗时
+    chunk_size = max(1, math.ceil(total_pages / (workers * 4)))
+    page_ranges = [(start, min(start + chunk_size, total_pages)) for start in range(0, total_pages, chunk_size)]
+    
+    page_table = []
+    futures = [executor.submit(read_page_range, pdf_path, start, end) for start, end in page_ranges]
+    for future in futures:
+        page_table.extend(future.result())
+    return page_table
+
+
+# --- 工厂分组图片保存函数（工作进程） ---
+def save_group_images_worker(pdf_path: str, image_pages: list[int], img_folder: str, factory_name: str) -> dict:
+    """
+    在工作进程中独立打开PDF，提取并写出一个工厂分组的图片（每个任务只处理一组，图片数据不回传主进程）
+    
+    返回：
+        dict: save_group_images的结果（只含路径和页码）
+    """
+    with fitz.open(pdf_path) as doc:
+        return save_group_images(doc, image_pages, img_folder, factory_name)
+
+
 #---------------------- PDF文件综合处理主模块 --------------------------------
 
 # --- PDF文件综合处理主函数 ---
-def process_pdf(pdf_path: str, output_dir: str ) -> bool:
+def process_pdf(pdf_path: str, output_dir: str, workers: int = 0) -> bool:
     """
     PDF工厂信息文件的完整处理主函数
     
@@ -325,22 +643,30 @@ def process_pdf(pdf_path: str, output_dir: str ) -> bool:
     
     处理流程：
     1. 打开PDF文件
-    2. 逐页分析页面类型（文字页或图片页）
+    2. 一次遍历生成页面分类表（文字页或图片页），并按工厂分组
     3. 文字页：提取工厂信息并创建图片文件夹
     4. 图片页：提取产品图片到对应工厂文件夹
-    5. 智能判断工厂信息完整性并生成JSON记录
+    5. 每组处理完成后生成该工厂的JSON记录
     6. 清理资源并返回所有工厂的处理结果
     
     参数：
         pdf_path (str): 待处理的PDF文件完整路径
         output_dir (str): 图片和数据的输出根目录路径
+        workers (int): 工作进程数，>1时文本读取和图片写出都分发到多个进程，默认0为串行
         
     返回：
         bool: 处理成功返回True，失败返回False
         
+    多进程模式：
+        - 第一阶段：按页面范围分发，工作进程只返回页面分类和字段
+        - 主进程按页序重建工厂分组，依次创建工厂文件夹（保证文件夹命名与串行模式一致）并写出JSON记录
+        - 第二阶段：每个工厂分组作为一个任务，由工作进程提取并写出图片和图片索引，只回传路径和页码
+        - 输出与串行模式逐字节一致
+        
     页面识别机制：
-        - 文字页：文本内容长度>10个字符
+        - 文字页：文本内容长度>10个字符（TEXT_PAGE_MIN_LENGTH）
         - 图片页：文本内容长度<=10个字符
+        - 每页文本只提取一次，结果保存在页面分类表中
         - 自动适应不同的PDF布局格式
         
         
@@ -348,21 +674,19 @@ def process_pdf(pdf_path: str, output_dir: str ) -> bool:
         - 图片页关联到最近的文字页工厂信息
         - 支持一个工厂对应多个图片页的情况
         - 自动过滤无效或装饰性图片
+        - 按xref和内容哈希去重，图片格式尺寸和重复图片记录到PDF_IMAGE_INDEX_NAME索引文件
         
 
     
     """
+    doc = None
+    executor = None
     try:
         # 打开PDF文件
         doc = fitz.open(pdf_path)
         
         # 初始化处理状态变量
-        page_index = 0             # 当前页面索引
         total_pages = len(doc)     # PDF总页数
-        
-        current_factory_info = None    # 当前工厂的信息字典
-        current_factory_name = None    # 当前工厂的清洗后名称
-        current_img_folder = None      # 当前工厂的图片文件夹路径
 
         old_factory_name = None    # 用于标记是否是新工厂
 
@@ -371,81 +695,80 @@ def process_pdf(pdf_path: str, output_dir: str ) -> bool:
 
         logging.info(f"开始处理PDF文件: {pdf_path}，共 {total_pages} 页")
 
-        # 逐页处理PDF内容
-        while page_index < total_pages:
-            page = doc[page_index]
-            text = page.get_text().strip()
+        # 一次遍历生成页面分类表并按工厂分组（多进程模式下由工作进程读取）
+        if workers and workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            page_table = classify_pages_parallel(executor, pdf_path, total_pages, workers)
+        else:
+            page_table = classify_pages(doc)
+        factory_groups, orphan_image_pages = group_factory_pages(page_table)
+        
+        # 文档级图片去重状态（xref缓存 + 各工厂文件夹内容哈希，多进程模式下由各分组任务各自维护）
+        dedup_state = new_image_dedup_state()
+        image_futures = []
+        
+        for page_index in orphan_image_pages:
+            logging.warning(f"第 {page_index + 1} 页是图片页，但没有对应的工厂信息")
 
-            # 判断页面类型（文字页 vs 图片页）
-            if len(text) > 10:
-                # 文字页：提取工厂信息
-                info = extract_fields(text)
-                
-                # 识别和处理工厂名称
-                for key in ['工厂名称', '厂商名称', '公司名称']:
-                    if info.get(key):
-                        factory_name = info[key]
-                        cleaned_name = clean_factory_name(factory_name)
-                        if cleaned_name != old_factory_name:
-                            info[key] = cleaned_name
-                            break
+        # 逐个工厂处理：文字页 + 其后的图片页
+        for group in factory_groups:
+            page_index = group["text_page"]
+            text = page_table[page_index]["text"]
+
+            # 文字页：提取工厂信息（多进程模式下已由工作进程解析）
+            info = page_table[page_index]["fields"] if "fields" in page_table[page_index] else extract_fields(text)
+            
+            # 识别和处理工厂名称
+            for key in ['工厂名称', '厂商名称', '公司名称']:
+                if info.get(key):
+                    factory_name = info[key]
+                    cleaned_name = clean_factory_name(factory_name)
+                    if cleaned_name != old_factory_name:
+                        info[key] = cleaned_name
                         break
-                else:
-                    # 如果没有找到明确的工厂名称，使用页面编号生成
-                    factory_name = f"工厂_{page_index + 1}"
-                    cleaned_name = factory_name
-                
-                # 创建工厂名称文件夹
-                vendor_folder = make_vendor_folder(cleaned_name,output_dir)
+                    break
+            else:
+                # 如果没有找到明确的工厂名称，使用页面编号生成
+                factory_name = f"工厂_{page_index + 1}"
+                cleaned_name = factory_name
+            
+            # 创建工厂名称文件夹
+            vendor_folder = make_vendor_folder(cleaned_name,output_dir)
 
-                # 创建工厂专属的图片保存文件夹
-                img_save_folder = os.path.join(vendor_folder, f"{cleaned_name}_产品图片")
-                os.makedirs(img_save_folder, exist_ok=True)
-                
-                # 更新当前工厂的处理状态
-                current_factory_info = info
-                current_factory_name = cleaned_name
-                current_img_folder = img_save_folder  # 设置图片文件夹路径
-                
-                logging.info(f"处理文字页，工厂: {current_factory_name}")
-                
+            # 创建工厂专属的图片保存文件夹
+            img_save_folder = os.path.join(vendor_folder, f"{cleaned_name}_产品图片")
+            os.makedirs(img_save_folder, exist_ok=True)
+            
+            # 更新当前工厂的处理状态
+            current_factory_info = info
+            current_factory_name = cleaned_name
+            current_img_folder = img_save_folder  # 设置图片文件夹路径
+            
+            logging.info(f"处理文字页，工厂: {current_factory_name}")
+            
+            # 图片页：提取产品图片并保存图片索引（多进程模式下整组交给工作进程）
+            if executor is not None:
+                image_futures.append(executor.submit(save_group_images_worker, pdf_path, group["image_pages"], current_img_folder, current_factory_name))
             else:
-                # 图片页：提取产品图片
-                if current_factory_name and current_img_folder:
-                    try:
-                        # 从图片页提取并保存图片
-                        saved_folder_path = extract_images_from_pdf(page, doc, current_img_folder, current_factory_name, page_index + 1)
-                        
-                        if saved_folder_path:
-                            logging.info(f"从第 {page_index + 1} 页提取并保存了图片到: {saved_folder_path}")
-                        else:
-                            logging.info(f"第 {page_index + 1} 页没有提取到有效图片")
-                                
-                    except Exception as e:
-                        logging.error(f"处理第 {page_index + 1} 页图片时出错: {str(e)}")
-                else:
-                    logging.warning(f"第 {page_index + 1} 页是图片页，但没有对应的工厂信息")
+                save_group_images(doc, group["image_pages"], current_img_folder, current_factory_name, dedup_state)
             
-            # 判断是否需要输出当前工厂的JSON记录
-            # 条件：下一页是文字页（新工厂开始）或已到最后一页
-            next_is_text_page = False
-            if page_index + 1 < total_pages:
-                next_text = doc[page_index + 1].get_text().strip()
-                next_is_text_page = len(next_text) > 10
-                
-            if next_is_text_page or page_index + 1 == total_pages:
-                if current_factory_info:
-                    # 生成标准JSON格式并保存到记录列表
-                    json_record = map_to_standard_json(current_factory_info, pdf_path, current_img_folder)
-                    if json_record:
-                        save_result_to_vendor_folder(vendor_folder, json_record)
-                        logging.info(f"保存厂信息成功: {json_record.get('厂商名称')}")
-                        success_count += 1
-                    else:
-                        failed_count+=1
-                        logging.error(f"保存厂信息失败: {json_record.get('厂商名称')}")
+            # 该工厂的页面处理完毕（下一页是新工厂的文字页或已到最后一页），输出JSON记录
+            json_record = map_to_standard_json(current_factory_info, pdf_path, current_img_folder)
+            if json_record:
+                save_result_to_vendor_folder(vendor_folder, json_record)
+                logging.info(f"保存厂信息成功: {json_record.get('厂商名称')}")
+                success_count += 1
+            else:
+                failed_count+=1
+                logging.error(f"保存厂信息失败: {current_factory_name}")
 
-            page_index += 1
+        # 等待各分组的图片任务完成（只回传路径和页码）
+        for future in image_futures:
+            try:
+                group_result = future.result()
+                logging.info(f"图片文件夹处理完成: {group_result['img_folder']}，保存图片的页面: {group_result['saved_pages']}")
+            except Exception as e:
+                logging.error(f"分组图片处理出错: {str(e)}")
 
         logging.info(f"多页数PDF文档处理完成: 总数：{total_pages}个, 成功：{success_count}个, 失败：{failed_count}个")
         return True
@@ -455,7 +778,10 @@ def process_pdf(pdf_path: str, output_dir: str ) -> bool:
         return False
     finally:
         # 清理资源
-        doc.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if doc is not None:
+            doc.close()
 
 #---------------------- 程序测试入口 --------------------------------
 
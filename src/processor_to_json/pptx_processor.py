@@ -16,121 +16,13 @@ from src.processor_to_json.processor_rely.model_remark_pptx_info import extract_
 from src.processor_to_json.processor_rely.outmodel_results_validator import validate_and_get_result
 from src.utils.clean_factory_name import clean_factory_name
 from src.utils.save_result_to_json import make_vendor_folder,save_result_to_vendor_folder
-from src.utils.SaveImg_wechat_qr import extract_images_from_pptx
+from src.utils.SaveImg_wechat_qr import extract_images_from_pptx, apply_qr_info_to_json
+from src.utils.line_classifier import is_date_text, find_contact_line, is_vendor_name
 
 # 日志配置
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
-#---------------------- 文本识别和分类工具函数 --------------------------------
-
-# --- 日期文本格式识别函数 ---
-def is_date_text(text:str) -> bool:
-    """
-    检查文本内容是否符合日期格式模式
-    
-    识别功能：
-    通过config中DATE_PATTERNS配置的日期正则表达式模式，判断输入文本是否为日期信息。
-    用于在文档解析过程中识别和分类日期相关的内容。
-    
-    识别流程：
-    1. 基础文本有效性检查（长度和非空）
-    2. 清理文本格式（去除首尾空白）
-    3. 遍历配置的日期模式进行匹配
-    4. 返回匹配结果
-    
-    参数：
-        text (str): 待检查的文本内容
-        
-    返回：
-        bool: True表示文本符合日期格式，False表示不符合
-
-    """
-
-    # 步骤1：基础有效性检查
-    if not text or len(text) > 50: # 简单的长度过滤，避免检查过长的文本
-        return False
-        
-    # 步骤2：清理文本格式
-    cleaned_text = text.strip()
-    
-    # 步骤3：遍历配置的日期模式进行匹配
-    for pattern in DATE_PATTERNS:
-        if re.search(pattern, cleaned_text):
-            return True
-    return False
-
-
-
-# --- 联系人和电话号码识别函数 ---
-def find_contact_line(text:str) -> str:
-    """
-    识别文本中的联系方式信息（电话号码、职位、姓名）
-    
-    识别功能：
-    使用正则表达式模式识别文本中的电话号码，支持多种格式的电话号码
-    （包括带空格、短横线分隔的11位数字）。用于自动提取联系方式行。
-    
-    识别流程：
-    1. 编译电话号码识别的正则表达式
-    2. 在输入文本中搜索匹配模式
-    3. 返回匹配结果或空值
-    
-    参数：
-        text (str): 待搜索的文本内容
-        
-    返回：
-        str: 如果找到电话号码则返回原始文本，否则返回None
-
-    """
-    # 匹配手机号的正则模式（11 位数字，允许有空格或短横线）
-    phone_pattern = re.compile(r"(?<!\d)(?:\d[\s\-]*){11}(?!\d)")
-    
-    # 放宽的职位关键词匹配模式（支持空格和多种职位）
-    position_keywords = ['经理', '负责人', '主管', '总监', '主任', '部长', '董事', '总','总经理','助理','秘书','代表','销售','业务']
-    position_pattern = re.compile(r'.*(' + '|'.join(position_keywords) + r').*')
-
-    # 匹配2-4个中文字的模式
-    chinese_name_pattern = re.compile(r'^[\u4e00-\u9fa5]{2,4}$')
-
-    # 检查是否匹配手机号、职位关键词或2-4个中文字
-    if phone_pattern.search(text) or position_pattern.search(text) or chinese_name_pattern.search(text):
-        return text
-    else:
-        return None
-
-# --- 厂商名称格式识别函数 ---
-def is_vendor_name(line:str) -> bool:
-    """
-    判断文本行是否为厂商名称格式
-    
-    识别功能：
-    通过检查文本特征（无冒号且包含企业关键词），判断当前行
-    是否为厂商名称信息。用于自动识别和分类厂商名称字段。
-    
-    识别流程：
-    1. 检查文本中是否包含冒号
-    2. 检查是否包含企业类型关键词
-    3. 综合判断返回结果
-    
-    参数：
-        line (str): 待判断的文本行
-        
-    返回：
-        bool: True表示可能是厂商名称，False表示不是
-        
-
-    """
-    # 步骤1：检查是否包含冒号（有冒号的通常是标签：值格式）
-    if ':' in line or ':' in line:
-        return False
-        
-    # 步骤2：检查是否包含企业类型关键词
-    if any(kw in line for kw in ['公司', '厂', '集团', '有限', '企业']):
-        return True
-    return False
-
-
 #---------------------- PPTX文本提取和处理模块 --------------------------------
 
 # --- 单页幻灯片文本提取函数 ---
@@ -292,7 +184,7 @@ def extract_text_to_json(text_lines: list) -> dict:
         # 2. 联系方式匹配（接下来3行）
         while i < min(8, n):
             line = text_lines[i].strip()
-            if find_contact_line(line):
+            if find_contact_line(line, match_name=True):
                 if result['联系方式'] == '':
                     result['联系方式'] = line
                 else:
@@ -505,11 +397,13 @@ def process_pptx_file(file_path: str,output_directory:str) -> bool:
                     vendor_folder = make_vendor_folder(factory_name, output_directory)
                     
                     # 提取图片（指定对应的幻灯片编号，i+1对应第几页）
-                    img_path = extract_images_from_pptx(file_path, vendor_folder, i+1)
+                    qr_info = {}
+                    img_path = extract_images_from_pptx(file_path, vendor_folder, i+1, qr_info)
                     if img_path:
                         result['微信'] = img_path
                     else:
                         logging.error(f"提取二维码失败")
+                    apply_qr_info_to_json(result, qr_info)  # 二维码内容及分类
                         
                     result['文件路径'] = file_path
                     
@@ -1,7 +1,9 @@
 # 提取Excel中的"产品图片"列的图片，并保存到指定文件夹
 
 import os
+import logging
 import xlwings as xw
+from processor_rely.excel_package_reader import prepare_images_for_save
 
 def extract_product_images(sheet:xw.Sheet, row_idx:int, start_col_idx:int, output_dir:str, factory_name:str) -> str:
     """
@@ -54,3 +56,54 @@ def extract_product_images(sheet:xw.Sheet, row_idx:int, start_col_idx:int, outpu
                     print(f"图片保存失败: {e}")
 
     return img_folder if img_count > 0 else ""
+
+
+def group_row_images(anchored_images: list, start_col_idx: int) -> dict:
+    """
+    将带锚点的图片按行分组，只保留“产品图片1”及其后4列（共5列）内的图片。
+
+    参数：
+        anchored_images(list): [(锚点行(0基准), 锚点列(0基准), 图片字节, 扩展名), ...]，按工作表中出现顺序排列
+        start_col_idx(int): 产品图片列的起始列索引（0基准）
+
+    返回：
+        dict: {行号(1基准): [(图片字节, 扩展名), ...]}，同一行内按列、再按出现顺序排列
+    """
+    row_images = {}
+    for order, (row0, col0, data, ext) in enumerate(anchored_images):
+        if not (start_col_idx <= col0 < start_col_idx + 5):
+            continue
+        row_images.setdefault(row0 + 1, []).append((col0, order, data, ext))
+
+    return {
+        row_idx: [(data, ext) for _, _, data, ext in sorted(items, key=lambda x: (x[0], x[1]))]
+        for row_idx, items in row_images.items()
+    }
+
+
+def save_row_images(images: list, output_dir: str, factory_name: str) -> str:
+    """
+    将已读取的产品图片保存到 output_dir/img_product/{factory_name}/ 下，命名与extract_product_images一致。
+    emf/wmf矢量图片转换为PNG后保存，无法转换的跳过并记录数量（与excel_non_standard_fty_processor.save_product_images一致）。
+
+    参数：
+        images(list): [(图片字节, 扩展名), ...]
+        output_dir(str): 输出文件夹路径
+        factory_name(str): 工厂名称
+
+    返回：
+        str: 图片文件夹路径（无图片时返回空字符串）
+    """
+    img_folder = os.path.join(output_dir, "img_product", factory_name)
+    os.makedirs(img_folder, exist_ok=True)
+
+    images, skipped_count = prepare_images_for_save(images)
+    if skipped_count:
+        logging.warning(f"{factory_name}: 跳过 {skipped_count} 张无法转换的矢量图片")
+
+    for img_count, (data, ext) in enumerate(images, 1):
+        img_path = os.path.join(img_folder, f"{factory_name}_img{img_count}{ext}")
+        with open(img_path, 'wb') as f:
+            f.write(data)
+
+    return img_folder if images else ""
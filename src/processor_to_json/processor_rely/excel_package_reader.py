@@ -0,0 +1,182 @@
+# 直接从xlsx文件包（zip）中读取指定sheet内嵌图片，无需启动Excel，也无需经过剪贴板
+
+from io import BytesIO
+import posixpath
+import zipfile
+import logging
+import xml.etree.ElementTree as ET
+from PIL import Image
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# OOXML命名空间
+NS = {
+    'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+    'xdr': 'http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing',
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+}
+R_ID = f"{{{NS['r']}}}id"
+R_EMBED = f"{{{NS['r']}}}embed"
+
+# 矢量图片扩展名：保存前统一渲染为PNG，无法渲染时跳过
+VECTOR_IMAGE_EXTENSIONS = ('.emf', '.wmf', '.pict')
+
+
+# --- 函数：解析关系ID对应的部件路径 ---
+def resolve_relationship(zf: zipfile.ZipFile, part_path: str, rel_id: str) -> str:
+    """
+    根据部件的_rels文件，将关系ID解析为包内部件路径
+
+    参数：
+        zf (zipfile.ZipFile): 已打开的xlsx文件包
+        part_path (str): 源部件路径（如"xl/worksheets/sheet2.xml"）
+        rel_id (str): 关系ID（如"rId1"）
+
+    返回：
+        str: 目标部件在包内的路径，未找到时返回None
+    """
+    part_dir, part_name = posixpath.split(part_path)
+    rels_path = posixpath.join(part_dir, '_rels', f"{part_name}.rels")
+    if rels_path not in zf.namelist():
+        return None
+
+    rels_xml = ET.fromstring(zf.read(rels_path))
+    for rel in rels_xml.findall('rel:Relationship', NS):
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target')
+            # 绝对路径以"/"开头，相对路径相对于源部件所在目录
+            if target.startswith('/'):
+                return target.lstrip('/')
+            return posixpath.normpath(posixpath.join(part_dir, target))
+    return None
+
+
+# --- 函数：读取sheet内嵌图片及锚点 ---
+def read_sheet_anchored_images(excel_path: str, sheet_name: str) -> list:
+    """
+    从xlsx文件包中读取指定sheet上的所有图片原始数据及其左上角锚点单元格，只解析该sheet自己的drawing部件
+
+    读取流程：
+    1. 在workbook.xml中按名称定位sheet的关系ID
+    2. 解析sheet部件及其关联的drawing部件
+    3. 按drawing中的出现顺序遍历锚点（twoCellAnchor/oneCellAnchor/absoluteAnchor）及其中的图片（xdr:pic）
+    4. 通过drawing关系解析图片在xl/media中的路径并读取原始字节
+
+    参数：
+        excel_path (str): xlsx文件路径
+        sheet_name (str): sheet名称
+
+    返回：
+        list: [(锚点行(0基准), 锚点列(0基准), 图片字节, 扩展名), ...]，absoluteAnchor的行列为None，
+              扩展名为小写且带"."；sheet不存在时返回None
+    """
+    with zipfile.ZipFile(excel_path) as zf:
+        # 步骤1：按名称定位sheet
+        workbook_path = 'xl/workbook.xml'
+        workbook_xml = ET.fromstring(zf.read(workbook_path))
+        sheet_rel_id = None
+        for sheet in workbook_xml.iterfind('main:sheets/main:sheet', NS):
+            if sheet.get('name') == sheet_name:
+                sheet_rel_id = sheet.get(R_ID)
+                break
+        if sheet_rel_id is None:
+            return None
+
+        sheet_path = resolve_relationship(zf, workbook_path, sheet_rel_id)
+        if not sheet_path:
+            return None
+        sheet_xml = ET.fromstring(zf.read(sheet_path))
+
+        # 步骤2-4：遍历drawing中的锚点及图片
+        images = []
+        for drawing in sheet_xml.findall('main:drawing', NS):
+            drawing_path = resolve_relationship(zf, sheet_path, drawing.get(R_ID))
+            if not drawing_path:
+                continue
+            drawing_xml = ET.fromstring(zf.read(drawing_path))
+
+            for anchor in drawing_xml:
+                anchor_from = anchor.find('xdr:from', NS)
+                row0 = col0 = None
+                if anchor_from is not None:
+                    row0 = int(anchor_from.findtext('xdr:row', '0', NS))
+                    col0 = int(anchor_from.findtext('xdr:col', '0', NS))
+
+                for pic in anchor.iter(f"{{{NS['xdr']}}}pic"):
+                    blip = pic.find('.//a:blip', NS)
+                    if blip is None or not blip.get(R_EMBED):
+                        continue
+                    media_path = resolve_relationship(zf, drawing_path, blip.get(R_EMBED))
+                    if not media_path:
+                        logging.warning(f"图片关系无法解析: {blip.get(R_EMBED)}")
+                        continue
+                    images.append((row0, col0, zf.read(media_path), posixpath.splitext(media_path)[1].lower()))
+
+        return images
+
+
+# --- 函数：读取sheet内嵌图片 ---
+def read_sheet_images(excel_path: str, sheet_name: str) -> list:
+    """
+    从xlsx文件包中读取指定sheet上的所有图片原始数据（按drawing中的出现顺序，不区分锚点位置）
+
+    参数：
+        excel_path (str): xlsx文件路径
+        sheet_name (str): sheet名称
+
+    返回：
+        list: [(图片字节, 扩展名), ...]，扩展名为小写且带"."；sheet不存在时返回None
+    """
+    anchored_images = read_sheet_anchored_images(excel_path, sheet_name)
+    if anchored_images is None:
+        return None
+    return [(data, ext) for _, _, data, ext in anchored_images]
+
+
+# --- 函数：矢量图片转换为PNG ---
+def convert_vector_image(image_bytes: bytes, image_ext: str) -> tuple:
+    """
+    将emf/wmf矢量图片渲染为PNG（Pillow在Windows上通过GDI渲染），非矢量图片原样返回
+
+    参数：
+        image_bytes (bytes): 图片原始字节
+        image_ext (str): 扩展名（小写且带"."）
+
+    返回：
+        tuple: (图片字节, 扩展名)，矢量图片无法渲染（如非Windows环境、pict格式）时返回None
+    """
+    if image_ext not in VECTOR_IMAGE_EXTENSIONS:
+        return image_bytes, image_ext
+    try:
+        with Image.open(BytesIO(image_bytes)) as img:
+            img.load()
+            output = BytesIO()
+            img.save(output, format='PNG')
+        return output.getvalue(), '.png'
+    except Exception as e:
+        logging.warning(f"矢量图片无法转换为PNG，跳过: {image_ext} ({str(e)})")
+        return None
+
+
+# --- 函数：准备待保存的图片 ---
+def prepare_images_for_save(images: list) -> tuple:
+    """
+    保存产品图片前统一处理：矢量图片转换为PNG，无法转换的跳过并计数
+
+    参数：
+        images (list): [(图片字节, 扩展名), ...]
+
+    返回：
+        tuple: ([(图片字节, 扩展名), ...], 跳过的矢量图片数)
+    """
+    prepared = []
+    skipped_count = 0
+    for image_bytes, image_ext in images or []:
+        converted = convert_vector_image(image_bytes, image_ext)
+        if converted is None:
+            skipped_count += 1
+            continue
+        prepared.append(converted)
+    return prepared, skipped_count
@@ -0,0 +1,173 @@
+# 非标准Excel（工厂情况信息表）模板指纹注册与匹配
+# 功能：每种模板声明特征单元格，一次批量读取工作表后对所有已注册模板打分，按特征哈希缓存匹配结果
+
+import sys
+import os
+import re
+import hashlib
+import logging
+# 添加项目根目录到路径
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+sys.path.insert(0, project_root)
+
+from setting.config import *
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+# 已注册模板：{模板名: {"template": 字段位置配置, "signature_cells": {单元格: 预期关键词}}}
+_TEMPLATE_REGISTRY = dict(EXCEL_FTY_TEMPLATE_REGISTRY)
+
+# 匹配结果缓存：{特征哈希: (模板名, 得分)}
+_MATCH_CACHE = {}
+
+
+#---------------------- 单元格工具函数 --------------------------------
+
+# --- 函数：单元格地址转行列号 ---
+def cell_to_index(cell: str) -> tuple[int, int]:
+    """
+    将单元格地址（如"AB14"）转换为1基准的(行号, 列号)
+
+    参数：
+        cell (str): 单元格地址
+
+    返回：
+        tuple: (行号, 列号)
+    """
+    match = re.match(r'^([A-Za-z]+)(\d+)$', cell.strip())
+    if not match:
+        raise ValueError(f"无效的单元格地址: {cell}")
+
+    col = 0
+    for char in match.group(1).upper():
+        col = col * 26 + (ord(char) - ord('A') + 1)
+    return int(match.group(2)), col
+
+
+# --- 函数：单元格文本标准化 ---
+def normalize_cell_text(value) -> str:
+    """
+    标准化单元格文本：去除空格和换行，中文符号统一为英文符号
+
+    参数：
+        value: 单元格原始值（任意类型）
+
+    返回：
+        str: 标准化后的文本，空值返回''
+    """
+    if value is None:
+        return ''
+    text = re.sub(r'\s+', '', str(value))
+    for zh_char, en_char in CHINESE_TO_ENGLISH_MAP.items():
+        text = text.replace(zh_char, en_char)
+    return text
+
+
+# --- 函数：从二维网格读取单元格值 ---
+def get_grid_value(grid: list, cell: str):
+    """
+    从批量读取的二维值列表中取出指定单元格的值，越界时返回None
+
+    参数：
+        grid (list): 以A1为起点的二维值列表
+        cell (str): 单元格地址
+
+    返回：
+        单元格值，越界返回None
+    """
+    row, col = cell_to_index(cell)
+    if row > len(grid):
+        return None
+    row_values = grid[row - 1] or []
+    if col > len(row_values):
+        return None
+    return row_values[col - 1]
+
+
+#---------------------- 模板注册与匹配函数 --------------------------------
+
+# --- 函数：注册模板 ---
+def register_template(name: str, template: dict, signature_cells: dict) -> None:
+    """
+    注册新的模板布局，注册后清空匹配缓存
+
+    参数：
+        name (str): 模板名称
+        template (dict): 字段位置配置（结构同EXCEL_FORMATE_FTY_1）
+        signature_cells (dict): 特征单元格 {单元格地址: 预期关键词}
+    """
+    _TEMPLATE_REGISTRY[name] = {"template": template, "signature_cells": signature_cells}
+    _MATCH_CACHE.clear()
+
+
+# --- 函数：获取批量读取范围 ---
+def get_signature_bounds() -> tuple[int, int]:
+    """
+    计算覆盖所有已注册模板特征单元格的最小读取范围
+
+    返回：
+        tuple: (最大行号, 最大列号)，读取范围为A1到该位置
+    """
+    max_row, max_col = 1, 1
+    for entry in _TEMPLATE_REGISTRY.values():
+        for cell in entry["signature_cells"]:
+            row, col = cell_to_index(cell)
+            max_row = max(max_row, row)
+            max_col = max(max_col, col)
+    return max_row, max_col
+
+
+# --- 函数：模板匹配 ---
+def match_template(grid: list) -> tuple:
+    """
+    根据批量读取的单元格值，对所有已注册模板打分并返回最佳匹配
+
+    匹配流程：
+    1. 收集所有模板特征单元格的标准化文本，计算特征哈希
+    2. 命中缓存则直接返回（相同布局的文件无需重复打分）
+    3. 逐个模板计算得分 = 命中的特征单元格数 / 特征单元格总数
+    4. 最佳得分低于EXCEL_TEMPLATE_MIN_SCORE时记录低置信度告警
+
+    参数：
+        grid (list): 以A1为起点的二维值列表，至少覆盖get_signature_bounds()的范围
+
+    返回：
+        tuple: (模板名称, 模板配置, 得分)；没有任何特征命中时返回 (None, None, 0.0)
+    """
+    # 步骤1：收集特征单元格文本
+    all_cells = sorted({cell for entry in _TEMPLATE_REGISTRY.values() for cell in entry["signature_cells"]})
+    cell_texts = {cell: normalize_cell_text(get_grid_value(grid, cell)) for cell in all_cells}
+    signature = '|'.join(f"{cell}={cell_texts[cell]}" for cell in all_cells)
+    signature_hash = hashlib.sha1(signature.encode('utf-8')).hexdigest()
+
+    # 步骤2：命中缓存
+    if signature_hash in _MATCH_CACHE:
+        name, score = _MATCH_CACHE[signature_hash]
+        return name, (_TEMPLATE_REGISTRY[name]["template"] if name else None), score
+
+    # 步骤3：逐个模板打分
+    scores = {}
+    for name, entry in _TEMPLATE_REGISTRY.items():
+        signature_cells = entry["signature_cells"]
+        hit = sum(
+            1 for cell, keyword in signature_cells.items()
+            if normalize_cell_text(keyword) in cell_texts[cell]
+        )
+        scores[name] = hit / len(signature_cells) if signature_cells else 0.0
+
+    best_name = max(scores, key=scores.get) if scores else None
+    best_score = scores.get(best_name, 0.0)
+
+    # 步骤4：置信度检查
+    if best_score == 0:
+        logging.error(f"未匹配到任何已注册模板，各模板得分: {scores}")
+        best_name = None
+    elif best_score < EXCEL_TEMPLATE_MIN_SCORE:
+        logging.warning(f"模板匹配置信度低: {best_name} 得分 {best_score:.2f}，各模板得分: {scores}")
+    else:
+        logging.info(f"模板匹配成功: {best_name} 得分 {best_score:.2f}")
+
+    _MATCH_CACHE[signature_hash] = (best_name, best_score)
+    return best_name, (_TEMPLATE_REGISTRY[best_name]["template"] if best_name else None), best_score
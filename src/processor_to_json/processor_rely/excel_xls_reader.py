@@ -0,0 +1,323 @@
+# 旧版.xls（BIFF8）文件原生读取：单元格值通过xlrd读取，内嵌图片直接解析BIFF绘图层（OfficeArt）
+# 无需启动Excel，可在没有Excel的Linux环境中运行
+
+import struct
+import zlib
+import logging
+import xlrd
+from xlrd import compdoc
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# BIFF记录类型
+BIFF_BOF = 0x0809
+BIFF_EOF = 0x000A
+BIFF_BOUNDSHEET = 0x0085
+BIFF_CONTINUE = 0x003C
+BIFF_MSODRAWINGGROUP = 0x00EB
+BIFF_MSODRAWING = 0x00EC
+
+# OfficeArt记录类型
+OFFICEART_BSE = 0xF007
+OFFICEART_SP_CONTAINER = 0xF004
+OFFICEART_FOPT = 0xF00B
+OFFICEART_CLIENT_ANCHOR = 0xF010
+OFFICEART_PROP_PIB = 0x0104
+
+# 位图类图片记录：{记录类型: 扩展名}，记录实例号为奇数时带两个UID
+BITMAP_BLIP_TYPES = {0xF01D: '.jpg', 0xF02A: '.jpg', 0xF01E: '.png', 0xF01F: '.bmp', 0xF029: '.tiff'}
+# 矢量图类图片记录：UID之后带34字节元文件头
+METAFILE_BLIP_TYPES = {0xF01A: '.emf', 0xF01B: '.wmf', 0xF01C: '.pict'}
+
+
+#---------------------- 单元格值读取 --------------------------------
+
+# --- 函数：读取sheet单元格值 ---
+def read_xls_sheet_values(xls_path: str, sheet_name: str) -> list:
+    """
+    读取.xls文件指定sheet的所有单元格值，返回以A1为起点的二维列表
+
+    值类型与xlwings保持一致：空单元格为None，数字为float，日期为datetime
+
+    参数：
+        xls_path (str): .xls文件路径
+        sheet_name (str): sheet名称
+
+    返回：
+        list: 二维值列表；sheet不存在时返回None
+    """
+    book = xlrd.open_workbook(xls_path, on_demand=True)
+    try:
+        if sheet_name not in book.sheet_names():
+            return None
+        sheet = book.sheet_by_name(sheet_name)
+
+        grid = []
+        for row_idx in range(sheet.nrows):
+            row_values = []
+            for cell in sheet.row(row_idx):
+                if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR):
+                    row_values.append(None)
+                elif cell.ctype == xlrd.XL_CELL_DATE:
+                    row_values.append(xlrd.xldate.xldate_as_datetime(cell.value, book.datemode))
+                elif cell.ctype == xlrd.XL_CELL_BOOLEAN:
+                    row_values.append(bool(cell.value))
+                else:
+                    row_values.append(cell.value)
+            grid.append(row_values)
+        return grid
+    finally:
+        book.release_resources()
+
+
+# --- 函数：读取sheet名称列表 ---
+def read_xls_sheet_names(xls_path: str) -> list:
+    """
+    读取.xls文件中的sheet名称列表（按工作簿中的顺序）
+    """
+    book = xlrd.open_workbook(xls_path, on_demand=True)
+    try:
+        return book.sheet_names()
+    finally:
+        book.release_resources()
+
+
+#---------------------- BIFF绘图层解析 --------------------------------
+
+# --- 函数：遍历BIFF记录 ---
+def iter_biff_records(stream: bytes, offset: int = 0):
+    """
+    从指定偏移开始遍历BIFF记录
+
+    返回：
+        生成器: (记录类型, 记录数据)
+    """
+    while offset + 4 <= len(stream):
+        rec_type, rec_len = struct.unpack_from('<HH', stream, offset)
+        yield rec_type, stream[offset + 4:offset + 4 + rec_len]
+        offset += 4 + rec_len
+
+
+# --- 函数：遍历OfficeArt记录 ---
+def iter_officeart_records(data: bytes, start: int = 0, end: int = None):
+    """
+    遍历[start, end)范围内同一层级的OfficeArt记录
+
+    返回：
+        生成器: (recVer, recInstance, recType, 数据起始偏移, 数据长度)
+    """
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        ver_inst, rec_type, rec_len = struct.unpack_from('<HHI', data, offset)
+        rec_len = min(rec_len, end - offset - 8)
+        yield ver_inst & 0x000F, ver_inst >> 4, rec_type, offset + 8, rec_len
+        offset += 8 + rec_len
+
+
+# --- 函数：解析图片记录 ---
+def parse_blip(data: bytes, rec_inst: int, rec_type: int, start: int, length: int) -> tuple:
+    """
+    解析OfficeArtBlip记录，返回图片原始字节和扩展名
+
+    参数：
+        data (bytes): 绘图数据
+        rec_inst (int): 记录实例号
+        rec_type (int): 记录类型
+        start (int): 记录数据起始偏移
+        length (int): 记录数据长度
+
+    返回：
+        tuple: (图片字节, 扩展名)，不支持的类型返回None
+    """
+    uid_size = 32 if rec_inst & 0x1 else 16
+    if rec_type in BITMAP_BLIP_TYPES:
+        # UID之后有1字节tag
+        image_bytes = data[start + uid_size + 1:start + length]
+        ext = BITMAP_BLIP_TYPES[rec_type]
+        if ext == '.bmp':
+            image_bytes = dib_to_bmp(image_bytes)
+        return image_bytes, ext
+
+    if rec_type in METAFILE_BLIP_TYPES:
+        # 元文件头：cbSize(4) rcBounds(16) ptSize(8) cbSave(4) compression(1) filter(1)
+        header_start = start + uid_size
+        compression = data[header_start + 32]
+        image_bytes = data[header_start + 34:start + length]
+        if compression == 0x00:
+            image_bytes = zlib.decompress(image_bytes)
+        return image_bytes, METAFILE_BLIP_TYPES[rec_type]
+
+    return None
+
+
+# --- 函数：DIB补全BMP文件头 ---
+def dib_to_bmp(dib: bytes) -> bytes:
+    """
+    为设备无关位图（DIB）数据补全14字节的BITMAPFILEHEADER，得到可直接保存的.bmp文件
+    """
+    header_size = struct.unpack_from('<I', dib, 0)[0]
+    palette_size = 0
+    if header_size >= 40:
+        bit_count, compression = struct.unpack_from('<HI', dib, 14)
+        colors_used = struct.unpack_from('<I', dib, 32)[0]
+        if colors_used:
+            palette_size = colors_used * 4
+        elif bit_count <= 8:
+            palette_size = (1 << bit_count) * 4
+        # BI_BITFIELDS：40字节信息头后紧跟3个颜色掩码
+        if compression == 3 and header_size == 40:
+            palette_size += 12
+    else:
+        # BITMAPCOREHEADER：调色板项为3字节
+        bit_count = struct.unpack_from('<H', dib, 10)[0]
+        if bit_count <= 8:
+            palette_size = (1 << bit_count) * 3
+
+    pixel_offset = 14 + header_size + palette_size
+    return b'BM' + struct.pack('<IHHI', 14 + len(dib), 0, 0, pixel_offset) + dib
+
+
+# --- 函数：解析工作簿级图片库 ---
+def parse_blip_store(drawing_group: bytes) -> list:
+    """
+    解析MSODRAWINGGROUP中的OfficeArtBStoreContainer，按BSE顺序返回图片列表
+
+    返回：
+        list: [(图片字节, 扩展名) 或 None, ...]，下标+1即形状属性pib引用的编号
+    """
+    blips = []
+
+    def walk(start, end):
+        for rec_ver, rec_inst, rec_type, data_start, data_len in iter_officeart_records(drawing_group, start, end):
+            if rec_type == OFFICEART_BSE:
+                # FBSE固定36字节 + cbName字节的名称，之后为内嵌的图片记录
+                name_len = drawing_group[data_start + 33]
+                blip_start = data_start + 36 + name_len
+                blip = None
+                if blip_start + 8 <= data_start + data_len:
+                    for _, blip_inst, blip_type, blip_data_start, blip_len in iter_officeart_records(
+                            drawing_group, blip_start, data_start + data_len):
+                        blip = parse_blip(drawing_group, blip_inst, blip_type, blip_data_start, blip_len)
+                        break
+                blips.append(blip)
+            elif rec_ver == 0xF:
+                walk(data_start, data_start + data_len)
+
+    walk(0, len(drawing_group))
+    return blips
+
+
+# --- 函数：解析sheet绘图中的图片锚点 ---
+def parse_sheet_pictures(drawing: bytes) -> list:
+    """
+    解析sheet的OfficeArtDgContainer，返回每个图片形状引用的图片编号及左上角锚点
+
+    返回：
+        list: [(图片编号pib, 锚点行号(0基准), 锚点列号(0基准)), ...]，按绘图中的出现顺序
+    """
+    pictures = []
+
+    def walk(start, end):
+        for rec_ver, _, rec_type, data_start, data_len in iter_officeart_records(drawing, start, end):
+            if rec_type == OFFICEART_SP_CONTAINER:
+                pib, anchor = None, None
+                for _, child_inst, child_type, child_start, child_len in iter_officeart_records(
+                        drawing, data_start, data_start + data_len):
+                    if child_type == OFFICEART_FOPT:
+                        # recInstance为属性个数，每个属性6字节：opid(2) + op(4)
+                        for i in range(child_inst):
+                            opid, op = struct.unpack_from('<HI', drawing, child_start + i * 6)
+                            if opid & 0x3FFF == OFFICEART_PROP_PIB and not opid & 0x8000:
+                                pib = op
+                    elif child_type == OFFICEART_CLIENT_ANCHOR and child_len >= 18:
+                        # flags(2) colL(2) dxL(2) rwT(2) dyT(2) colR(2) dxR(2) rwB(2) dyB(2)
+                        col_left, _, row_top = struct.unpack_from('<HHH', drawing, child_start + 2)
+                        anchor = (row_top, col_left)
+                if pib and anchor:
+                    pictures.append((pib, anchor[0], anchor[1]))
+            elif rec_ver == 0xF:
+                walk(data_start, data_start + data_len)
+
+    walk(0, len(drawing))
+    return pictures
+
+
+# --- 函数：读取sheet内嵌图片 ---
+def read_xls_sheet_images(xls_path: str, sheet_name: str) -> list:
+    """
+    直接解析.xls文件的BIFF绘图层，读取指定sheet上的所有图片及其锚点
+
+    读取流程：
+    1. 从OLE2复合文档中读取Workbook流
+    2. 解析全局子流：BOUNDSHEET定位各sheet子流，MSODRAWINGGROUP汇总工作簿图片库
+    3. 拼接目标sheet子流中的MSODRAWING数据，解析图片形状的pib引用和锚点
+    4. 通过pib从图片库中取出图片原始字节
+
+    参数：
+        xls_path (str): .xls文件路径
+        sheet_name (str): sheet名称
+
+    返回：
+        list: [(锚点行号(0基准), 锚点列号(0基准), 图片字节, 扩展名), ...]，按绘图中的出现顺序；
+              sheet不存在时返回None
+    """
+    # 步骤1：读取Workbook流
+    with open(xls_path, 'rb') as f:
+        doc = compdoc.CompDoc(f.read(), logfile=None)
+    stream = doc.get_named_stream('Workbook') or doc.get_named_stream('Book')
+    if not stream:
+        return None
+
+    # 步骤2：解析全局子流
+    sheet_offsets = {}
+    drawing_group = bytearray()
+    previous_type = None
+    for rec_type, rec_data in iter_biff_records(stream):
+        if rec_type == BIFF_BOUNDSHEET:
+            sheet_offset = struct.unpack_from('<I', rec_data, 0)[0]
+            name_len, high_byte = rec_data[6], rec_data[7] & 0x01
+            if high_byte:
+                name = rec_data[8:8 + name_len * 2].decode('utf-16-le')
+            else:
+                name = rec_data[8:8 + name_len].decode('latin-1')
+            sheet_offsets[name] = sheet_offset
+        elif rec_type == BIFF_MSODRAWINGGROUP or (rec_type == BIFF_CONTINUE and previous_type == BIFF_MSODRAWINGGROUP):
+            drawing_group += rec_data
+            rec_type = BIFF_MSODRAWINGGROUP
+        elif rec_type == BIFF_EOF:
+            break
+        previous_type = rec_type
+
+    if sheet_name not in sheet_offsets:
+        return None
+
+    # 步骤3：拼接sheet子流中的绘图数据（跳过嵌套的图表子流）
+    drawing = bytearray()
+    depth = 0
+    previous_type = None
+    for rec_type, rec_data in iter_biff_records(stream, sheet_offsets[sheet_name]):
+        if rec_type == BIFF_BOF:
+            depth += 1
+        elif rec_type == BIFF_EOF:
+            depth -= 1
+            if depth == 0:
+                break
+        elif depth == 1 and (rec_type == BIFF_MSODRAWING or (rec_type == BIFF_CONTINUE and previous_type == BIFF_MSODRAWING)):
+            drawing += rec_data
+            rec_type = BIFF_MSODRAWING
+        previous_type = rec_type
+
+    if not drawing:
+        return []
+
+    # 步骤4：按pib取出图片
+    blips = parse_blip_store(bytes(drawing_group))
+    images = []
+    for pib, row, col in parse_sheet_pictures(bytes(drawing)):
+        blip = blips[pib - 1] if 0 < pib <= len(blips) else None
+        if blip is None:
+            logging.warning(f"图片引用无法解析: pib={pib}")
+            continue
+        images.append((row, col, blip[0], blip[1]))
+    return images
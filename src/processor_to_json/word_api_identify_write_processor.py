@@ -12,7 +12,7 @@ import sys
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from src.utils.clean_factory_name import clean_factory_name
-from src.utils.SaveImg_wechat_qr import extract_images_from_docx
+from src.utils.SaveImg_wechat_qr import extract_images_from_docx, apply_qr_info_to_json
 from src.utils.convert_doc_docx import convert_doc_to_docx_and_replace
 from src.utils.save_result_to_json import make_vendor_folder,save_result_to_vendor_folder
 from src.processor_to_json.processor_rely.outmodel_results_validator import validate_and_get_result
@@ -264,11 +264,13 @@ def word_to_json(file_path:str,output_directory:str) -> bool:
         
         # 提取微信二维码图片
 
-        img_path = extract_images_from_docx(file_path,vendor_folder)
+        qr_info = {}
+        img_path = extract_images_from_docx(file_path,vendor_folder,qr_info)
         if img_path:
             json_result['微信'] = img_path
         else:
             logging.error(f"提取二维码失败")
+        apply_qr_info_to_json(json_result, qr_info)  # 二维码内容及分类
             
         json_result['文件路径'] = file_path
         
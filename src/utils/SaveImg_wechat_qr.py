@@ -1,8 +1,8 @@
 import cv2
 import os
-import uuid
+import sys
+import hashlib
 import numpy as np
-from pyzbar.pyzbar import decode# 用于识别二维码
 import numpy as np
 from docx import Document # 用于处理.docx文件
 from pptx import Presentation # 用于处理.pptx文件
@@ -11,6 +11,18 @@ import fitz # 用于处理pdf文件
 from PIL import Image # 用于处理图片
 
 import logging # 用于记录日志
+import time
+from collections import deque
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from setting.config import *
+from src.utils.pdf_image_export import export_pdf_image, RAW_EXPORT_EXTS
+from src.utils.qr_prefilter import qr_prefilter_reason, new_qr_prefilter_stats, summarize_qr_prefilter_stats
+from src.utils.qr_decode_cache import qr_cache_key, lookup_qr_verdict, store_qr_verdict
+from src.utils.qr_engines import decode_qr_codes # 用于识别二维码（引擎由QR_ENGINE配置）
+from src.utils.qr_payload_classifier import classify_qr_payload, is_wechat_category, QR_CATEGORY_URL, QR_CATEGORY_LABELS
+from src.utils.qr_detect_service import get_qr_detect_service
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -39,6 +51,40 @@ def convert_to_black_white_qr(image):
 
 
 
+# 二维码识别结论
+QR_STATUS_WECHAT = 'wechat'    # 微信二维码
+QR_STATUS_OTHER = 'other_qr'   # 可解码但不是微信的二维码
+QR_STATUS_NONE = 'none'        # 未识别出二维码
+
+
+# --- 函数：解码图片得到二维码结论 ---
+def read_qr_verdict(image) -> dict:
+    """
+    解码图片中的二维码，返回识别结论
+
+    输入：OpenCV图像对象
+    输出：{"status": QR_STATUS_*, "payload": 二维码内容, "category": 内容分类, "codes": 微信二维码列表[{"data", "polygon", "category"}]}；
+          存在微信二维码时payload/category为第一个微信二维码的内容及分类，codes包含图片中全部微信二维码及其顶点坐标；
+          否则payload/category为第一个其他二维码（如公司网址）的内容及分类
+    """
+    verdict = {"status": QR_STATUS_NONE, "payload": "", "category": "", "codes": []}
+    wechat_codes = []
+
+    # 尝试解码图片中的二维码（引擎由QR_ENGINE配置），内容按QR_PAYLOAD_PATTERNS一次匹配得到分类
+    for code in decode_qr_codes(image):
+        decoded_data = code["data"]
+        category = classify_qr_payload(decoded_data)
+        if is_wechat_category(category):
+            wechat_codes.append({**code, "category": category}) # 识别为微信二维码（个人微信/公众号）
+        elif verdict["status"] == QR_STATUS_NONE:
+            verdict = {"status": QR_STATUS_OTHER, "payload": decoded_data, "category": category, "codes": []}
+
+    if wechat_codes:
+        return {"status": QR_STATUS_WECHAT, "payload": wechat_codes[0]["data"],
+                "category": wechat_codes[0]["category"], "codes": wechat_codes}
+    return verdict
+
+
 # --- 函数2：识别图片是否为黑白微信二维码 ---
 def is_wechat_qr_code(image_info):
     """
@@ -58,41 +104,332 @@ def is_wechat_qr_code(image_info):
 
     # 检查图片是否成功读取
     if image is None:
-        # print(f"Error: Could not read image.") # 为了处理大量图片时输出更简洁，这里注释掉错误信息
         return False
 
-    # 尝试解码图片中的二维码
-    # print(f"尝试黑白解码图片中的二维码")
-    decoded_objects = decode(image)
-
-    # 遍历所有解码出的二维码对象
-    for obj in decoded_objects:
-        # 检查解码出的类型是否为QR码
-        if obj.type == 'QRCODE':
-            # 将二维码数据解码为UTF-8字符串
-            decoded_data = obj.data.decode('utf-8')
-            # 简单的判断逻辑：如果解码成功，并且内容可能包含微信相关信息
-            # 微信二维码通常会解码出URL或者特定的字符串
-            # 这里可以根据实际情况更精确地判断，例如检查URL前缀是否包含“weixin”、“wechat”等
-            if "weixin" in decoded_data.lower() or \
-            "wechat" in decoded_data.lower() or \
-            "mp.weixin.qq.com" in decoded_data.lower() or \
-            "wx.qq.com" in decoded_data.lower():
-                return True # 识别为微信二维码
-        
-        
-    return False # 未识别为微信二维码
+    return read_qr_verdict(image)["status"] == QR_STATUS_WECHAT
+
+
+
+# --- 函数：多尺度解码的尺寸序列 ---
+def decode_pyramid_sizes(long_side: int, policy: dict) -> list[int]:
+    """
+    根据图片长边计算多尺度解码依次尝试的长边尺寸
+
+    基准尺寸为长边限制在[min_size, max_size]之间的值，各尺度为基准尺寸乘以scales，
+    并限制在[min_size/2, max_size*2]之间，去重后保持scales的顺序
+    """
+    base_size = min(max(long_side, policy["min_size"]), policy["max_size"])
+    sizes = []
+    for scale in policy["scales"]:
+        size = int(min(max(base_size * scale, policy["min_size"] / 2), policy["max_size"] * 2))
+        if size not in sizes:
+            sizes.append(size)
+    return sizes
+
+
+# --- 函数：按长边缩放图片 ---
+def resize_long_side(image, size: int):
+    """
+    将图片等比缩放到长边为size（缩小用INTER_AREA，放大用INTER_CUBIC），尺寸相同时直接返回原图
+    """
+    height, width = image.shape[:2]
+    long_side = max(height, width)
+    if size == long_side:
+        return image
+    scale = size / long_side
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+    return cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))), interpolation=interpolation)
+
+
+# --- 函数：多尺度解码得到二维码结论 ---
+def decode_qr_verdict(image, policy: dict = None) -> dict:
+    """
+    多尺度解码图片中的二维码
+
+    处理流程：
+    1. 按decode_pyramid_sizes计算尺寸序列（大图先缩小，小图先放大）
+    2. 依次缩放并解码，未识别时转为高对比度黑白图片后再解码一次
+    3. 识别到微信二维码即停止；超过time_budget_s后不再尝试后续尺度
+
+    参数：
+        image: OpenCV图像对象（BGR）
+        policy (dict): 解码策略，默认使用config中的QR_DECODE_POLICY
+
+    返回：
+        dict: read_qr_verdict格式的结论（微信二维码顶点坐标已换算为原图坐标）；
+              未识别到微信二维码时返回解码到的其他二维码（如有）；
+              因超时跳过了剩余尺度时附带"truncated": True（结论与运行快慢有关，不应缓存）
+    """
+    policy = policy or QR_DECODE_POLICY
+    deadline = time.perf_counter() + policy["time_budget_s"]
+    verdict = {"status": QR_STATUS_NONE, "payload": "", "category": "", "codes": []}
+
+    sizes = decode_pyramid_sizes(max(image.shape[:2]), policy)
+    for level, size in enumerate(sizes):
+        scaled = resize_long_side(image, size)
+        attempts = [scaled, convert_to_black_white_qr(scaled)] if policy["binarize_retry"] else [scaled]
+        for attempt in attempts:
+            attempt_verdict = read_qr_verdict(attempt)
+            if attempt_verdict["status"] == QR_STATUS_WECHAT:
+                # 顶点坐标换算回原图坐标
+                factor = max(image.shape[:2]) / size
+                for code in attempt_verdict["codes"]:
+                    code["polygon"] = [[round(x * factor), round(y * factor)] for x, y in code["polygon"]]
+                return attempt_verdict
+            if verdict["status"] == QR_STATUS_NONE:
+                verdict = attempt_verdict
+        if level < len(sizes) - 1 and time.perf_counter() > deadline:
+            logging.debug(f"二维码解码超过时间上限 {policy['time_budget_s']}s，跳过剩余 {len(sizes) - level - 1} 个尺度")
+            return {**verdict, "truncated": True}
+    return verdict
+
+
+# --- 函数：完整解码识别微信二维码 ---
+def decode_wechat_qr(image, policy: dict = None) -> bool:
+    """
+    多尺度解码识别微信二维码（decode_qr_verdict的布尔形式）
+    """
+    return decode_qr_verdict(image, policy)["status"] == QR_STATUS_WECHAT
+
+
+# --- 函数：原尺寸解码（对照实现） ---
+def decode_wechat_qr_native(image) -> bool:
+    """
+    原有实现：按原始分辨率解码，未识别时黑白增强后再解码一次，作为性能测试的对照
+    """
+    if is_wechat_qr_code(image):
+        return True
+    return is_wechat_qr_code(convert_to_black_white_qr(image))
+
+
+# --- 函数：解码性能测试 ---
+def benchmark_wechat_qr_decode(images: list, policy: dict = None) -> dict:
+    """
+    对比原尺寸解码与多尺度解码的单张耗时和识别数量
+
+    参数：
+        images: OpenCV图像列表（建议使用样例文档中的二维码及非二维码图片）
+        policy (dict): 多尺度解码策略
+
+    返回：
+        dict: {"native": {...}, "multiscale": {...}}，各含识别数量hits、平均耗时mean_s、最大耗时max_s
+    """
+    results = {}
+    for name, decode_func in (("native", decode_wechat_qr_native), ("multiscale", lambda image: decode_wechat_qr(image, policy))):
+        hits = 0
+        timings = []
+        for image in images:
+            start = time.perf_counter()
+            hits += bool(decode_func(image))
+            timings.append(time.perf_counter() - start)
+        results[name] = {
+            "images": len(images),
+            "hits": hits,
+            "mean_s": sum(timings) / len(timings) if timings else 0.0,
+            "max_s": max(timings, default=0.0),
+        }
+    return results
+
+
+# --- 函数：预筛选后识别二维码 ---
+def detect_qr_verdict(image, stats: dict = None) -> dict:
+    """
+    识别图片中的二维码：先经qr_prefilter低成本预筛选，只有可能是二维码的图片才进入多尺度解码
+
+    参数：
+        image: OpenCV图像对象
+        stats (dict): new_qr_prefilter_stats()创建的统计，传入时累计图片数、拒绝数和各阶段耗时
+
+    返回：
+        dict: read_qr_verdict格式的结论
+    """
+    stats = stats if stats is not None else new_qr_prefilter_stats()
+    stats["images"] += 1
+
+    if QR_PREFILTER_POLICY["enabled"]:
+        start = time.perf_counter()
+        reason = qr_prefilter_reason(image)
+        stats["prefilter_s"] += time.perf_counter() - start
+        if reason:
+            stats["rejected"] += 1
+            logging.debug(f"二维码预筛选跳过图片: {reason}")
+            return {"status": QR_STATUS_NONE, "payload": "", "category": "", "codes": []}
+
+    start = time.perf_counter()
+    verdict = decode_qr_verdict(image)
+    stats["decode_s"] += time.perf_counter() - start
+    stats["decoded"] += 1
+    return verdict
+
+
+# --- 函数：预筛选后识别微信二维码 ---
+def detect_wechat_qr(image, stats: dict = None) -> bool:
+    """
+    识别图片是否为微信二维码（detect_qr_verdict的布尔形式）
+    """
+    return detect_qr_verdict(image, stats)["status"] == QR_STATUS_WECHAT
+
+
+# --- 函数：按图片字节识别二维码（带缓存） ---
+def detect_qr_verdict_bytes(image_bytes: bytes, stats: dict = None, read_image=None) -> tuple:
+    """
+    按图片原始字节识别二维码，解码结论按内容哈希缓存（见qr_decode_cache）
+
+    处理流程：
+    1. 以图片字节的哈希查询缓存，命中时不再预筛选和解码；
+       结论为微信二维码时仍需解码出图片用于保存，其他结论不解码图片
+    2. 未命中时解码图片并执行detect_qr_verdict，结论写入缓存（因超时未完成全部尺度的结论不写入）
+
+    参数：
+        image_bytes (bytes): 图片原始字节
+        stats (dict): new_qr_prefilter_stats()创建的统计
+        read_image: 图片字节转OpenCV图像的函数，默认为decode_image_bgr（DOCX/PPTX/PDF统一使用，透明图片合成到白底）；
+            函数名计入缓存键，不同解码方式的结论互不复用
+
+    返回：
+        (结论, OpenCV图像)：图片无法解码时结论为None；未解码图片时图像为None
+    """
+    read_image = read_image or decode_image_bgr
+    stats = stats if stats is not None else new_qr_prefilter_stats()
+
+    cache_key = qr_cache_key(image_bytes, read_image.__name__)
+    verdict = lookup_qr_verdict(cache_key)
+    if verdict is not None:
+        stats["cache_hits"] += 1
+        image = read_image(image_bytes) if verdict["status"] == QR_STATUS_WECHAT else None
+        return verdict, image
+
+    image = read_image(image_bytes)
+    if image is None:
+        return None, None
+    verdict = detect_qr_verdict(image, stats)
+    if verdict.get("truncated"):
+        logging.debug("二维码解码因超时未完成全部尺度，结论不写入缓存")
+    else:
+        store_qr_verdict(cache_key, verdict)
+    return verdict, image
+
+
+# --- 函数：识别一张图片并取出二维码图片（进程池任务） ---
+def detect_qr_images_bytes(image_bytes: bytes, read_image=None) -> tuple:
+    """
+    按图片字节识别二维码，并取出需要保存的二维码图片；作为进程池任务时在子进程中完成解码、预筛选和裁剪
+
+    返回：
+        (结论, 二维码图片列表, 统计, 是否变换)：图片无法解码时结论为None；非微信二维码时图片列表为空；
+        二维码图片就是整张原图（未裁剪）时"是否变换"为False，保存时可直接写出原始字节
+    """
+    stats = new_qr_prefilter_stats()
+    verdict, image = detect_qr_verdict_bytes(image_bytes, stats, read_image)
+    qr_images = []
+    transformed = False
+    if verdict is not None and verdict["status"] == QR_STATUS_WECHAT:
+        qr_images = qr_images_from_verdict(image, verdict)
+        transformed = not (len(qr_images) == 1 and qr_images[0].shape == image.shape)
+    return verdict, qr_images, stats, transformed
+
+
+# --- 函数：批量识别图片 ---
+def detect_qr_batch(image_blobs: list, stats: dict = None, read_image=None) -> list:
+    """
+    批量识别一个文档中的图片：启用QR_DETECT_SERVICE时全部提交到共享进程池并行识别，否则在当前进程逐张识别
+
+    参数：
+        image_blobs (list): 图片原始字节列表
+        stats (dict): new_qr_prefilter_stats()创建的统计，各图片的统计累加到其中
+        read_image: 图片字节转OpenCV图像的函数（须为模块级函数，以便传给子进程）
+
+    返回：
+        list: 与image_blobs顺序一致的 [(结论, 二维码图片列表, 是否变换)]；识别出错的图片结论为None
+    """
+    stats = stats if stats is not None else new_qr_prefilter_stats()
+    service = get_qr_detect_service(detect_qr_images_bytes)
+    results = []
+
+    def collect(fetch_result) -> None:
+        try:
+            verdict, qr_images, image_stats, transformed = fetch_result()
+        except Exception as e:
+            logging.error(f"识别第 {len(results) + 1} 张图片时出错: {str(e)}", exc_info=True)
+            results.append((None, [], False))
+            return
+        for name, value in image_stats.items():
+            stats[name] += value
+        results.append((verdict, qr_images, transformed))
+
+    if service is None:
+        for image_bytes in image_blobs:
+            collect(lambda: detect_qr_images_bytes(image_bytes, read_image))
+        return results
+
+    # 按提交顺序滑动取回：预算不足时先取回最早提交的结果（取回后才释放预算），再提交下一张
+    pending = deque()
+    try:
+        for image_bytes in image_blobs:
+            while pending and not service.has_room(len(image_bytes)):
+                future = pending.popleft()
+                collect(lambda: service.take(future))
+            pending.append(service.submit(image_bytes, read_image))
+        while pending:
+            future = pending.popleft()
+            collect(lambda: service.take(future))
+    finally:
+        for future in pending:
+            service.discard(future)
+    return results
+
+
+# --- 函数：图片写入BGR目标区域 ---
+def write_bgr_into(dst, img) -> None:
+    """
+    将任意通道格式的图片写入同尺寸的3通道BGR目标区域（dst可以是画布的切片视图）：
+    灰度图扩展为三通道，带透明通道的图片合成到白色背景上，16位图片转为8位
 
+    参数：
+        dst: 形状为(高, 宽, 3)的uint8数组
+        img: 与dst同宽高的OpenCV图像（灰度/BGR/BGRA）
+    """
+    if img.dtype != np.uint8:
+        img = (img / 257).astype(np.uint8)
+    if img.ndim == 3 and img.shape[2] == 1:
+        img = img[:, :, 0]
+
+    if img.ndim == 2:
+        cv2.cvtColor(img, cv2.COLOR_GRAY2BGR, dst=dst)
+    elif img.shape[2] == 4:
+        alpha = img[:, :, 3:4].astype(np.float32) / 255.0
+        dst[...] = img[:, :, :3] * alpha + 255 * (1 - alpha)
+    else:
+        np.copyto(dst, img)
 
 
+# --- 函数：缩放图片并写入BGR目标区域 ---
+def resize_into_bgr(dst, img) -> None:
+    """
+    将图片缩放到dst的尺寸并写入：三通道图片直接缩放到dst中，其他格式先缩放再转换通道
+    """
+    height, width = dst.shape[:2]
+    if img.shape[:2] != (height, width):
+        # 缩小使用INTER_AREA，避免二维码模块边缘产生锯齿
+        interpolation = cv2.INTER_AREA if height < img.shape[0] else cv2.INTER_LINEAR
+        if img.ndim == 3 and img.shape[2] == 3 and img.dtype == np.uint8:
+            cv2.resize(img, (width, height), dst=dst, interpolation=interpolation)
+            return
+        img = cv2.resize(img, (width, height), interpolation=interpolation)
+    write_bgr_into(dst, img)
 
 
 # --- 函数3：水平拼接多张图片 ---
-def stitch_images_horizontally(image_list):
+def stitch_images_horizontally(image_list, max_height: int = None):
     """
     水平拼接多张图片
 
-    输入：list（含多张图片信息，OpenCV图像对象列表）
+    处理流程：
+    1. 以各图片中的最大高度（不超过max_height）作为拼接高度，按原始比例计算每张图片缩放后的宽度
+    2. 一次分配最终画布，每张图片直接缩放/转换写入画布中对应的区域，不保留中间缩放结果
+    3. 灰度、带透明通道、16位的图片统一转换为3通道BGR
+
+    输入：list（含多张图片信息，OpenCV图像对象列表）；max_height默认使用config中的QR_STITCH["max_height"]
     输出：一张（拼接）图片信息 (OpenCV图像对象)
     """
     # 如果图片列表为空，则返回None
@@ -101,43 +438,107 @@ def stitch_images_horizontally(image_list):
         return None
 
     # 过滤掉列表中可能出现的None值（例如图片读取失败的情况）
-    valid_images = [img for img in image_list if img is not None]
+    valid_images = [img for img in image_list if img is not None and img.size]
     if not valid_images:
         logging.warning("过滤掉列表中可能出现的None值（例如图片读取失败的情况）")
         return None
     try:
-        # 找到所有有效图片中高度最大的一张，作为拼接后的最终高度
-        max_height = 0
-        for img in valid_images:
-            max_height = max(max_height, img.shape[0])
-
-        # 调整所有图片的高度以匹配最大高度，并计算拼接后的总宽度
-        stitched_width = 0
-        resized_images = []
-        for img in valid_images:
-            # 保持图片原始比例，按最大高度进行缩放
-            scale = max_height / img.shape[0]
-            resized_img = cv2.resize(img, (int(img.shape[1] * scale), max_height))
-            resized_images.append(resized_img)
-            stitched_width += resized_img.shape[1] # 累加缩放后的图片宽度
-
-        # 创建一个空白画布，用于拼接（3通道，与彩色图片一致）
-        stitched_image = np.zeros((max_height, stitched_width, 3), dtype=np.uint8)
-
-        # 将处理后的图片依次粘贴到空白画布上，实现水平拼接
+        # 拼接高度：所有有效图片中的最大高度，且不超过上限
+        max_height = max_height or QR_STITCH["max_height"]
+        stitched_height = min(max(img.shape[0] for img in valid_images), max_height)
+
+        # 保持图片原始比例，按拼接高度计算每张图片的宽度
+        widths = [max(1, round(img.shape[1] * stitched_height / img.shape[0])) for img in valid_images]
+
+        # 创建最终画布（3通道，与彩色图片一致），各图片直接写入对应区域
+        stitched_image = np.empty((stitched_height, sum(widths), 3), dtype=np.uint8)
         current_x = 0
-        for img in resized_images:
-            stitched_image[0:max_height, current_x:current_x + img.shape[1]] = img
-            current_x += img.shape[1]
-        
-        logging.info(f"图片拼接成功")   
+        for img, width in zip(valid_images, widths):
+            resize_into_bgr(stitched_image[:, current_x:current_x + width], img)
+            current_x += width
+
+        logging.info(f"图片拼接成功，尺寸: {stitched_image.shape[1]}x{stitched_height}")
         return stitched_image
-    
+
     except Exception as e:
         logging.error(f"图片拼接过程中发生错误: {str(e)}")
         return None
 
 
+# --- 函数：判断裁剪区域以外是否为留白 ---
+def is_blank_outside(image, left: int, top: int, right: int, bottom: int) -> bool:
+    """
+    判断裁剪区域上下左右四个条带是否都是纯色留白（各条带像素标准差不超过QR_CROP的blank_border_max_std）
+    """
+    strips = (image[:top], image[bottom:], image[top:bottom, :left], image[top:bottom, right:])
+    return all(strip.size == 0 or float(strip.std()) <= QR_CROP["blank_border_max_std"] for strip in strips)
+
+
+# --- 函数：裁剪图片中的二维码 ---
+def crop_qr_regions(image, codes: list, margin_ratio: float = None) -> list:
+    """
+    按解码得到的顶点坐标裁剪图片中的每个二维码
+
+    输入：
+        image: OpenCV图像对象（原图）
+        codes: read_qr_verdict结论中的codes（顶点坐标为原图坐标）
+        margin_ratio: 四周保留的边距占二维码边长的比例，默认使用config中QR_CROP的margin_ratio
+    输出：list（裁剪后的二维码图片）；坐标无效的二维码跳过，全部无效时返回[原图]；
+          图片本身就是二维码时（裁剪区域占比不低于keep_whole_ratio，或裁剪只会去掉纯色留白）保留原图，
+          保存时可直接写出原始字节
+    """
+    margin_ratio = QR_CROP["margin_ratio"] if margin_ratio is None else margin_ratio
+    height, width = image.shape[:2]
+
+    crops = []
+    for code in codes:
+        if not code.get("polygon"):
+            continue
+        points = np.asarray(code["polygon"], dtype=np.float64)
+        x0, y0 = points.min(axis=0)
+        x1, y1 = points.max(axis=0)
+        margin = max(x1 - x0, y1 - y0) * margin_ratio
+        left, top = max(0, int(x0 - margin)), max(0, int(y0 - margin))
+        right, bottom = min(width, int(np.ceil(x1 + margin))), min(height, int(np.ceil(y1 + margin)))
+        if right - left < 2 or bottom - top < 2:
+            continue
+        if (right - left) * (bottom - top) >= QR_CROP["keep_whole_ratio"] * width * height \
+                or is_blank_outside(image, left, top, right, bottom):
+            crops.append(image)
+            continue
+        crops.append(image[top:bottom, left:right].copy())
+
+    return crops or [image]
+
+
+# --- 函数：取出需要保存的二维码图片 ---
+def qr_images_from_verdict(image, verdict: dict) -> list:
+    """
+    根据识别结论取出需要保存的二维码图片：启用QR_CROP时只保留每个微信二维码的裁剪区域，否则保留整张图片
+    """
+    if QR_CROP["enabled"]:
+        return crop_qr_regions(image, verdict.get("codes", []))
+    return [image]
+
+
+# --- 函数：解码图片为BGR图像（透明通道合成到白底） ---
+def decode_image_bgr(image_bytes: bytes):
+    """
+    将图片字节解码为3通道BGR图像；带透明通道的图片合成到白色背景上，
+    避免透明底的二维码按IMREAD_COLOR解码后变成黑底而无法识别
+
+    返回：OpenCV图像对象，解码失败返回None
+    """
+    img = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_UNCHANGED)
+    if img is None:
+        return None
+    if img.ndim == 3 and img.shape[2] == 3 and img.dtype == np.uint8:
+        return img
+    bgr = np.empty((img.shape[0], img.shape[1], 3), dtype=np.uint8)
+    write_bgr_into(bgr, img)
+    return bgr
+
+
 # --- 函数4：保存图片 ---
 def save_image_with_chinese_path(img, save_path):
     ext = os.path.splitext(save_path)[1]
@@ -148,11 +549,100 @@ def save_image_with_chinese_path(img, save_path):
         return True
     return False
 
+# --- 函数：按内容哈希生成二维码图片文件名 ---
+def qr_image_filename(img, prefix: str = "wechat_qr", ext: str = ".png") -> str:
+    """
+    以图片尺寸和像素内容的SHA1生成文件名（如wechat_qr_0123456789abcdef.png），
+    内容相同的二维码图片在任何一次运行中都得到相同的文件名
+    """
+    digest = hashlib.sha1(str(img.shape).encode('ascii'))
+    digest.update(np.ascontiguousarray(img))
+    return f"{prefix}_{digest.hexdigest()[:16]}{ext}"
+
+
+# --- 函数：文件不存在时保存图片 ---
+def save_image_if_absent(img, save_path) -> bool:
+    """
+    目标文件已存在时直接返回（文件名由内容哈希决定，存在即内容相同），否则编码并写入
+    """
+    if os.path.exists(save_path):
+        logging.info(f"二维码图片已存在，跳过写入: {save_path}")
+        return True
+    return save_image_with_chinese_path(img, save_path)
+
+
+# --- 函数：保存二维码图片 ---
+def save_qr_image(img, save_dir: str, source: tuple = None) -> tuple:
+    """
+    保存二维码图片，文件名由内容哈希决定，文件已存在时不再写入
+
+    处理流程：
+    1. source为(原始字节, 扩展名)且格式可直接使用时（图片未经裁剪、拼接），原样写出原始字节，不重新编码
+    2. 否则（像素已改变或格式无法直接使用）按PNG编码像素后写入
+
+    参数：
+        img: OpenCV图像对象
+        save_dir (str): 保存目录
+        source (tuple): 图片在文档中的原始字节及扩展名，像素已改变时为None
+
+    返回：
+        (保存路径, 是否成功)
+    """
+    ext = source[1].lower().lstrip('.') if source is not None else ""
+    if ext not in RAW_EXPORT_EXTS:
+        save_path = os.path.join(save_dir, qr_image_filename(img))
+        return save_path, save_image_if_absent(img, save_path)
+
+    image_bytes = source[0]
+    save_path = os.path.join(save_dir, f"wechat_qr_{hashlib.sha1(image_bytes).hexdigest()[:16]}.{ext}")
+    if os.path.exists(save_path):
+        logging.info(f"二维码图片已存在，跳过写入: {save_path}")
+        return save_path, True
+    with open(save_path, 'wb') as f:
+        f.write(image_bytes)
+    return save_path, True
+
+
+# --- 函数：记录二维码内容 ---
+def record_qr_info(qr_info: dict, verdict: dict) -> None:
+    """
+    将一张图片的识别结论记入qr_info：微信二维码逐个记入"wechat"，其他可解码的二维码记入"others"
+
+    qr_info格式：{"wechat": [{"payload", "category"}], "others": [{"payload", "category"}]}
+    """
+    if verdict is None or qr_info is None:
+        return
+    if verdict["status"] == QR_STATUS_WECHAT:
+        qr_info.setdefault("wechat", []).extend(
+            {"payload": code["data"], "category": code.get("category", "")} for code in verdict.get("codes", []))
+    elif verdict["status"] == QR_STATUS_OTHER:
+        qr_info.setdefault("others", []).append({"payload": verdict["payload"], "category": verdict.get("category", "")})
+
+
+# --- 函数：二维码内容写入JSON ---
+def apply_qr_info_to_json(json_data: dict, qr_info: dict) -> None:
+    """
+    将提取过程中解码得到的二维码内容写入JSON，后续环节无需再次解码图片
+
+    写入规则：
+    1. 微信二维码：内容写入"微信二维码内容"，分类（个人微信/微信公众号）写入"微信二维码类型"，多个时以分号连接
+    2. 网址二维码（如公司官网）：JSON中"网址"为空时写入第一个网址
+    """
+    wechat_codes = qr_info.get("wechat", [])
+    if wechat_codes:
+        json_data['微信二维码内容'] = ';'.join(dict.fromkeys(code["payload"] for code in wechat_codes))
+        json_data['微信二维码类型'] = ';'.join(dict.fromkeys(
+            QR_CATEGORY_LABELS.get(code["category"], code["category"]) for code in wechat_codes))
+
+    url_codes = [code["payload"] for code in qr_info.get("others", []) if code["category"] == QR_CATEGORY_URL]
+    if url_codes and not json_data.get('网址'):
+        json_data['网址'] = url_codes[0]
+
 #----------------------word pptx 图片提取主函数--------------------------------
 
 
 # --- 函数5：DOCX 图片提取 ---
-def extract_images_from_docx(doc_path:str, save_dir:str) -> str:
+def extract_images_from_docx(doc_path:str, save_dir:str, qr_info: dict = None) -> str:
     """
     从.docx文件中提取图片，保存微信二维码图片，并返回微信二维码图片的存储路径，如果有多张二维码图片，会进行水平拼接后保存。
 
@@ -160,8 +650,8 @@ def extract_images_from_docx(doc_path:str, save_dir:str) -> str:
     1. 创建保存目录（如果不存在）
     2. 遍历文档中的所有关系，查找图片资源
     3. 将图片数据转换为OpenCV图像格式
-    4. 使用二维码识别算法检测微信二维码
-    5. 对识别到的二维码进行黑白转换后再次检测
+    4. 预筛选排除明显不是二维码的图片，其余使用二维码识别算法检测微信二维码
+    5. 未识别的图片进行黑白转换后再次检测
     6. 如果有多张二维码，进行水平拼接处理
     7. 保存最终的二维码图片文件
 
@@ -169,12 +659,13 @@ def extract_images_from_docx(doc_path:str, save_dir:str) -> str:
     Args:
         doc_path: docx文件路径
         save_dir (str): 保存图片的目标目录路径
+        qr_info (dict): 传入时记录解码得到的二维码内容及分类（格式见record_qr_info）
         
     Returns:
         str: 保存的微信二维码图片文件路径，如果没有找到二维码则返回None
 
     注意事项：
-        - 使用UUID生成唯一文件名，避免文件名冲突
+        - 按图片内容哈希生成文件名，重复处理时已存在的文件不再写入
         - 支持中文路径的图片保存
         - 自动创建保存目录结构
 
@@ -186,46 +677,38 @@ def extract_images_from_docx(doc_path:str, save_dir:str) -> str:
 
     wechat_qr_paths = []  # 存储微信二维码图片路径
     wechat_qr_images = []  # 存储微信二维码图片对象
+    wechat_qr_sources = []  # 与wechat_qr_images一一对应的原始字节及扩展名（像素已改变时为None）
     image_count = 0  # 图片计数器
     qr_count = 0  # 二维码计数器
     save_path = None
+    prefilter_stats = new_qr_prefilter_stats()  # 预筛选统计
 
     try:
 
         document = Document(doc_path)
         
         
-        # 遍历文档中的所有关系
+        # 遍历文档中的所有关系，收集图片数据
+        image_blobs = []
+        image_exts = []
         for rel in document.part.rels:
             if "image" in document.part.rels[rel].target_ref:
-                try:
-                    # 获取图片数据
-                    image_part = document.part.rels[rel].target_part
-                    image_bytes = image_part.blob
-                    
-                    # 转换为OpenCV图像
-                    nparr = np.frombuffer(image_bytes, np.uint8)
-                    img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                    
-                    if img is not None:
-                        image_count += 1
-                        
-                        
-                        # 检查是否为微信二维码
-                        if is_wechat_qr_code(img):
-                            qr_count += 1
-                            wechat_qr_images.append(img)  # 保存图片对象
-                        else:
-                            bw_img = convert_to_black_white_qr(img)
-                            if is_wechat_qr_code(bw_img):
-                                qr_count += 1
-                                wechat_qr_images.append(img)  # 保存图片对象
-
-                            # logging.info(f"识别到第 {qr_count} 张微信二维码")
-                            
-                except Exception as e:
-                    logging.error(f"处理第 {image_count} 张图片时出错: {str(e)}", exc_info=True)
-                    continue
+                image_part = document.part.rels[rel].target_part
+                image_blobs.append(image_part.blob)
+                image_exts.append(image_part.partname.ext)
+
+        # 检查是否为微信二维码（先查解码缓存，未命中时解码为BGR图像后预筛选、解码；可由进程池并行完成）
+        batch_results = detect_qr_batch(image_blobs, prefilter_stats)
+        for (verdict, qr_images, transformed), image_bytes, image_ext in zip(batch_results, image_blobs, image_exts):
+            if verdict is not None:
+                record_qr_info(qr_info, verdict)  # 记录二维码内容及分类
+                image_count += 1
+
+                if verdict["status"] == QR_STATUS_WECHAT:
+                    qr_count += 1
+                    wechat_qr_images.extend(qr_images)  # 保存二维码图片对象
+                    # 未经裁剪的整张图片保留原始字节及扩展名，保存时无需重新编码
+                    wechat_qr_sources.extend([None] * len(qr_images) if transformed else [(image_bytes, image_ext)])
         
         # 处理识别到的二维码图片
         
@@ -238,10 +721,8 @@ def extract_images_from_docx(doc_path:str, save_dir:str) -> str:
                 if stitched_image is not None:
                     # 保存拼接后的图片
                     
-                    filename = f"wechat_qr_{uuid.uuid4().hex}.png"
-                    save_path = os.path.join(save_dir, filename)
-                    # cv2.imwrite(save_path, stitched_image)
-                    success = save_image_with_chinese_path(stitched_image, save_path)
+                    # 按内容哈希命名，重复处理同一文档时文件已存在则不再编码写入
+                    save_path, success = save_qr_image(stitched_image, save_dir)
                     
                     if not success:
                         logging.error(f"图片保存失败，路径：{save_path}")
@@ -253,14 +734,14 @@ def extract_images_from_docx(doc_path:str, save_dir:str) -> str:
                     
             else:
                 # 单张二维码图片，直接保存
-                filename = f"wechat_qr_{uuid.uuid4().hex}.png"
-                save_path = os.path.join(save_dir, filename)
-                success = save_image_with_chinese_path(img, save_path) 
+                # 按内容哈希命名，重复处理同一文档时文件已存在则不再写入；未经裁剪的整张图片直接写出原始字节
+                save_path, success = save_qr_image(wechat_qr_images[0], save_dir, wechat_qr_sources[0])
                 if not success:
                     logging.error(f"图片保存失败，路径：{save_path}")
                 else:
                     logging.info(f"单张二维码图片已保存: {save_path}")
 
+        logging.info(summarize_qr_prefilter_stats(prefilter_stats))
         return save_path
     
     except Exception as e:
@@ -270,7 +751,7 @@ def extract_images_from_docx(doc_path:str, save_dir:str) -> str:
         
 
 # --- 函数6：PPTX 图片提取 ---
-def extract_images_from_pptx(path:str, save_dir:str, slide_number:int = None) -> str:
+def extract_images_from_pptx(path:str, save_dir:str, slide_number:int = None, qr_info: dict = None) -> str:
     """
     从.pptx文件中提取图片，保存微信二维码图片，并返回微信二维码图片的存储路径。
     如果有多张二维码图片，会进行水平拼接后保存。
@@ -280,19 +761,21 @@ def extract_images_from_pptx(path:str, save_dir:str, slide_number:int = None) ->
     2. 遍历演示文稿中的所有幻灯片
     3. 遍历每张幻灯片中的所有形状，查找包含图片的形状
     4. 将图片数据转换为OpenCV图像格式
-    5. 使用二维码识别算法检测微信二维码
+    5. 预筛选排除明显不是二维码的图片，其余使用二维码识别算法检测微信二维码
     6. 如果有多张二维码，进行水平拼接处理
     7. 保存最终的二维码图片文件
 
     Args:
         path: pptx文件路径
         save_dir (str): 保存图片的目标目录路径
+        slide_number (int): 只处理指定的幻灯片（1-based），None表示全部
+        qr_info (dict): 传入时记录解码得到的二维码内容及分类（格式见record_qr_info）
         
     Returns:
         str: 保存的微信二维码图片文件路径，如果没有找到二维码则返回None
 
     注意事项：
-        - 使用UUID生成唯一文件名，避免文件名冲突
+        - 按图片内容哈希生成文件名，重复处理时已存在的文件不再写入
         - 支持多张二维码的水平拼接
         - 自动创建保存目录结构
 
@@ -303,10 +786,12 @@ def extract_images_from_pptx(path:str, save_dir:str, slide_number:int = None) ->
         logging.info(f"创建保存目录: {save_dir}")
 
     wechat_qr_images = []  # 存储微信二维码图片对象
+    wechat_qr_sources = []  # 与wechat_qr_images一一对应的原始字节及扩展名（像素已改变时为None）
     wechat_qr_paths = []
     image_count = 0  # 图片计数器
     qr_count = 0  # 二维码计数器
     save_path = None  # 初始化保存路径
+    prefilter_stats = new_qr_prefilter_stats()  # 预筛选统计
     try:
         presentation = Presentation(path)
         
@@ -325,37 +810,36 @@ def extract_images_from_pptx(path:str, save_dir:str, slide_number:int = None) ->
         else:
             logging.info(f"处理所有 {len(presentation.slides)} 张幻灯片")
         
+        image_blobs = []
+        image_exts = []
         for slide_num, slide in enumerate(slides_to_process, 1 if slide_number is None else slide_number):
             logging.debug(f"处理第 {slide_num} 张幻灯片")
             
-            # 遍历幻灯片中的所有形状
+            # 遍历幻灯片中的所有形状，收集图片数据
             for shape in slide.shapes:
                 # 如果形状包含图像属性
                 if hasattr(shape, "image"):
                     try:
-                        image_bytes = shape.image.blob
-                        # 将二进制数据转换为numpy数组，再用cv2解码成OpenCV图像
-                        nparr = np.frombuffer(image_bytes, np.uint8)
-                        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                        
-                        if img is not None:
-                            image_count += 1
-                            
-                            # 检查是否为微信二维码
-                            if is_wechat_qr_code(img):
-                                qr_count += 1
-                                wechat_qr_images.append(img)
-                            else:
-                                bw_img = convert_to_black_white_qr(img)
-                                if is_wechat_qr_code(bw_img):
-                                    qr_count += 1
-                                    wechat_qr_images.append(img)
-
-                                
+                        image_bytes, image_ext = shape.image.blob, shape.image.ext
+                        image_blobs.append(image_bytes)
+                        image_exts.append(image_ext)
                     except Exception as e:
-                        logging.error(f"处理第 {image_count} 张图片时出错: {str(e)}", exc_info=True)
+                        logging.error(f"读取第 {slide_num} 张幻灯片的图片时出错: {str(e)}", exc_info=True)
                         continue
 
+        # 检查是否为微信二维码（先查解码缓存，未命中时解码为BGR图像后预筛选、解码；可由进程池并行完成）
+        batch_results = detect_qr_batch(image_blobs, prefilter_stats)
+        for (verdict, qr_images, transformed), image_bytes, image_ext in zip(batch_results, image_blobs, image_exts):
+            if verdict is not None:
+                record_qr_info(qr_info, verdict)  # 记录二维码内容及分类
+                image_count += 1
+
+                if verdict["status"] == QR_STATUS_WECHAT:
+                    qr_count += 1
+                    wechat_qr_images.extend(qr_images)
+                    # 未经裁剪的整张图片保留原始字节及扩展名，保存时无需重新编码
+                    wechat_qr_sources.extend([None] * len(qr_images) if transformed else [(image_bytes, image_ext)])
+
         # 处理识别到的二维码图片
         
         if wechat_qr_images:
@@ -367,9 +851,8 @@ def extract_images_from_pptx(path:str, save_dir:str, slide_number:int = None) ->
                 if stitched_image is not None:
                     # 保存拼接后的图片
                     
-                    filename = f"wechat_qr_{uuid.uuid4().hex}.png"
-                    save_path = os.path.join(save_dir, filename)
-                    success = save_image_with_chinese_path(stitched_image, save_path)
+                    # 按内容哈希命名，重复处理同一文档时文件已存在则不再编码写入
+                    save_path, success = save_qr_image(stitched_image, save_dir)
                     
                     if not success:
                         logging.error(f"图片保存失败，路径：{save_path}")
@@ -381,9 +864,8 @@ def extract_images_from_pptx(path:str, save_dir:str, slide_number:int = None) ->
                     
             else:
                 # 单张二维码图片，直接保存
-                filename = f"wechat_qr_{uuid.uuid4().hex}.png"
-                save_path = os.path.join(save_dir, filename)
-                success = save_image_with_chinese_path(img, save_path)
+                # 按内容哈希命名，重复处理同一文档时文件已存在则不再写入；未经裁剪的整张图片直接写出原始字节
+                save_path, success = save_qr_image(wechat_qr_images[0], save_dir, wechat_qr_sources[0])
                     
                 if not success:
                     logging.error(f"图片保存失败，路径：{save_path}")
@@ -392,6 +874,7 @@ def extract_images_from_pptx(path:str, save_dir:str, slide_number:int = None) ->
 
         
         logging.info(f"从PPTX文稿中提取到 {image_count} 张图片，其中 {qr_count} 张是微信二维码")
+        logging.info(summarize_qr_prefilter_stats(prefilter_stats))
         return save_path
     
     except Exception as e:
@@ -399,7 +882,7 @@ def extract_images_from_pptx(path:str, save_dir:str, slide_number:int = None) ->
         
 
 # --- 函数7：PDF 图片提取 ---
-def extract_images_from_pdf(file_path: str, output_dir: str, page_num: int) -> str:
+def extract_images_from_pdf(file_path, output_dir: str, page_num: int, qr_info: dict = None) -> str:
     """
 
     从PDF文件中提取指定页的图片，识别并保存微信二维码图片。
@@ -414,18 +897,20 @@ def extract_images_from_pdf(file_path: str, output_dir: str, page_num: int) -> s
     6. 返回第一个找到的二维码图片路径
 
     参数:
-        file_path (str): PDF文件路径
+        file_path (str | fitz.Document): PDF文件路径，或调用方已打开的文档对象（由调用方负责关闭）
         output_dir (str): 保存图片的目标目录路径
         page_num (int): 要提取的页码(1-based)
+        qr_info (dict): 传入时记录解码得到的二维码内容及分类（格式见record_qr_info）
         
     返回:
         str: 保存的微信二维码图片文件路径，如果没有找到二维码则返回空字符串
 
     注意事项：
-        - 使用UUID生成唯一文件名，避免文件名冲突
+        - 按图片内容哈希生成文件名，重复处理时已存在的文件不再写入
         - 页码是1-based，但内部处理会转换为0-based
         - 仅返回第一个识别的二维码图片
         - 会自动清理非二维码的临时图片文件
+        - 传入路径时自行打开的文档在任何返回路径上都会关闭
 
     """
     
@@ -435,12 +920,17 @@ def extract_images_from_pdf(file_path: str, output_dir: str, page_num: int) -> s
         logging.info(f"创建保存目录: {output_dir}")
     
     
+    # 传入路径时自行打开，传入已打开的文档时直接复用
+    own_doc = not isinstance(file_path, fitz.Document)
+    pdf_doc = None
     try:
-        pdf_doc = fitz.open(file_path)
+        pdf_doc = fitz.open(file_path) if own_doc else file_path
         wechat_qr_images = []
+        wechat_qr_sources = []  # 与wechat_qr_images一一对应的原始字节及扩展名（像素已改变时为None）
         qr_count = 0
         image_count = 0
         save_path = None
+        prefilter_stats = new_qr_prefilter_stats()  # 预筛选统计
         
         # 加载指定页面
         page = pdf_doc.load_page(page_num - 1)  # 0-based
@@ -450,34 +940,32 @@ def extract_images_from_pdf(file_path: str, output_dir: str, page_num: int) -> s
             logging.warning(f"第{page_num}页没有图片")
             return ""
             
+        image_blobs = []
+        image_exts = []
         for img_index, img in enumerate(images):
             try:
+                # 导出图片（原始流优先，蒙版/CMYK经Pixmap转换）
                 xref = img[0]
-                base_image = pdf_doc.extract_image(xref)
-                img_data = base_image["image"]
-                
-                # 转换为OpenCV图像
-                nparr = np.frombuffer(img_data, np.uint8)
-                cv_img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                
-                if cv_img is not None:
-                    image_count += 1
-                    
-                    # 检查是否为微信二维码
-                    if is_wechat_qr_code(cv_img):
-                        qr_count += 1
-                        wechat_qr_images.append(cv_img)  # 保存图片对象
-                    else:
-                        bw_img = convert_to_black_white_qr(cv_img)
-                        if is_wechat_qr_code(bw_img):
-                            qr_count += 1
-                            wechat_qr_images.append(cv_img)  # 保存图片对象
-
-                        # logging.info(f"识别到第 {qr_count} 张微信二维码")
-                        
+                exported = export_pdf_image(pdf_doc, xref, img[1])
+                image_blobs.append(exported["image"])
+                image_exts.append(exported["ext"])
             except Exception as e:
-                logging.error(f"处理第 {image_count} 张图片时出错: {str(e)}", exc_info=True)
+                logging.error(f"导出第 {img_index + 1} 张图片时出错: {str(e)}", exc_info=True)
                 continue
+
+        # 检查是否为微信二维码（先查解码缓存，未命中时解码为BGR图像后预筛选、解码；可由进程池并行完成）
+        batch_results = detect_qr_batch(image_blobs, prefilter_stats)
+        for (verdict, qr_images, transformed), image_bytes, image_ext in zip(batch_results, image_blobs, image_exts):
+            if verdict is not None:
+                record_qr_info(qr_info, verdict)  # 记录二维码内容及分类
+                image_count += 1
+
+                if verdict["status"] == QR_STATUS_WECHAT:
+                    qr_count += 1
+                    wechat_qr_images.extend(qr_images)  # 保存二维码图片对象
+                    # 未经裁剪的整张图片保留原始字节及扩展名，保存时无需重新编码
+                    wechat_qr_sources.extend([None] * len(qr_images) if transformed else [(image_bytes, image_ext)])
+
             # 处理识别到的二维码图片
         if wechat_qr_images:
             if len(wechat_qr_images) > 1:
@@ -486,9 +974,8 @@ def extract_images_from_pdf(file_path: str, output_dir: str, page_num: int) -> s
                 stitched_image = stitch_images_horizontally(wechat_qr_images)
                 if stitched_image is not None:
                     # 保存拼接后的图片
-                    filename = f"wechat_qr_{uuid.uuid4().hex}.png"
-                    save_path = os.path.join(output_dir, filename)
-                    success = save_image_with_chinese_path(stitched_image, save_path)
+                    # 按内容哈希命名，重复处理同一文档时文件已存在则不再编码写入
+                    save_path, success = save_qr_image(stitched_image, output_dir)
                     
                     if not success:
                         logging.error(f"图片保存失败，路径：{save_path}")
@@ -496,22 +983,25 @@ def extract_images_from_pdf(file_path: str, output_dir: str, page_num: int) -> s
                         logging.info(f"拼接后的二维码图片已保存: {save_path}")
             else:
                 # 单张二维码图片，直接保存
-                filename = f"wechat_qr_{uuid.uuid4().hex}.png"
-                save_path = os.path.join(output_dir, filename)
-                success = save_image_with_chinese_path(wechat_qr_images[0], save_path)
+                # 按内容哈希命名，重复处理同一文档时文件已存在则不再写入；未经裁剪的整张图片直接写出原始字节
+                save_path, success = save_qr_image(wechat_qr_images[0], output_dir, wechat_qr_sources[0])
                 
                 if not success:
                     logging.error(f"图片保存失败，路径：{save_path}")
                 else:
                     logging.info(f"单张二维码图片已保存: {save_path}")
         
-        pdf_doc.close()
         logging.info(f"从PDF第{page_num}页提取到 {image_count} 张图片，其中 {qr_count} 张是微信二维码")
+        logging.info(summarize_qr_prefilter_stats(prefilter_stats))
         return save_path if save_path else ""
     
     except Exception as e:
         logging.error(f"提取PDF图片过程中发生错误: {str(e)}", exc_info=True)
         return ""
+    
+    finally:
+        if own_doc and pdf_doc is not None:
+            pdf_doc.close()
         
 
             
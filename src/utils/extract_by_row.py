@@ -1,91 +1,292 @@
 # 使用PyMuPDF提取文本，自动合并纵坐标相近的行，只返回文本内容
-from typing import List
+# 行聚类基于NumPy：每页的行坐标一次性载入数组，向量化计算分行边界
+from typing import Callable, List, Optional, Union
+import time
 import fitz
+import numpy as np
 import re
 
-def extract_text_lines_from_pdf(pdf_path: str, y_threshold: float = 20.0) -> List[str]:
+# get_text("dict")默认会把页面图片数据一并解码放入结果，分行只需要文本块，去掉图片以减少开销
+TEXT_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# 单个文本行参与纵向重叠判断的最大高度（相对本页文本行高度中位数的倍数），
+# 竖排标签、大号标题等高文本框只按此高度计入所在行的范围，避免把下方多行并入同一行
+ROW_BOX_MAX_HEIGHT_RATIO = 2.0
+
+
+#---------------------- 行坐标收集与聚类 --------------------------------
+
+# --- 函数：收集页面文本行及坐标 ---
+def collect_line_boxes(text_dict: dict) -> tuple[list, np.ndarray]:
+    """
+    从page.get_text("dict")结果中收集文本行及其坐标
+
+    参数:
+        text_dict: page.get_text("dict", flags=TEXT_DICT_FLAGS)的返回值
+
+    返回:
+        (文本列表, 坐标数组)，坐标数组形状为(N, 3)，列依次为 y0(最小)、y1(最大)、x0(最小)
+    """
+    texts = []
+    boxes = []
+    for block in text_dict.get("blocks", []):
+        if "lines" not in block:
+            continue
+
+        for line in block["lines"]:
+            spans = [span for span in line["spans"] if span["text"]]
+            if not spans:
+                continue
+
+            line_text = "".join(span["text"] for span in spans)
+            if re.match(r'^[=\-\s]+$', line_text):
+                continue
+
+            texts.append(line_text)
+            boxes.append((
+                min(span["bbox"][1] for span in spans),
+                max(span["bbox"][3] for span in spans),
+                min(span["bbox"][0] for span in spans),
+            ))
+
+    return texts, np.asarray(boxes, dtype=np.float64).reshape(-1, 3)
+
+
+# --- 函数：向量化行聚类 ---
+def cluster_rows(boxes: np.ndarray, y_threshold: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    对一页的文本行做向量化分行
+
+    分行规则（按y0排序后）：
+        相邻两行y0之差超过y_threshold，且当前行顶部不与当前所在行的纵向范围重叠时，开始新的一行。
+        基线漂移或字号不同但纵向重叠的行会被归入同一行。
+        所在行的纵向范围只由该行已有的文本行构成，每个文本行计入的高度不超过
+        ROW_BOX_MAX_HEIGHT_RATIO倍的行高中位数，单个高文本框不会把其下方的所有行并入同一行。
+
+    参数:
+        boxes: collect_line_boxes返回的(N, 3)坐标数组
+        y_threshold: 纵坐标合并阈值
+
+    返回:
+        (行号数组, 输出顺序)：行号数组与boxes一一对应；输出顺序为按(行号, x0)排序后的下标
+    """
+    y0, y1, x0 = boxes[:, 0], boxes[:, 1], boxes[:, 2]
+
+    # 按y0稳定排序
+    order = np.argsort(y0, kind="stable")
+    sorted_y0 = y0[order]
+    # 各文本行计入行范围的底部（高度按行高中位数封顶）
+    # 中位数用np.partition取中间两个值，比np.median开销小，结果相同
+    middle = len(y0) // 2
+    middle_heights = np.partition(y1 - y0, [max(middle - 1, 0), middle])
+    median_height = (middle_heights[middle] + middle_heights[middle - 1]) / 2 if len(y0) % 2 == 0 else middle_heights[middle]
+    max_height = ROW_BOX_MAX_HEIGHT_RATIO * float(median_height)
+    sorted_bottom = np.minimum(y1, y0 + max_height)[order]
+    gap_breaks = np.diff(sorted_y0) > y_threshold
+
+    # 当前行范围 = 本行已有文本行底部的分段累计最大值（每个分行处重新开始）。
+    # 分行又取决于行范围，因此从"整页累计最大值"得到的最少分行出发迭代：
+    # 分行增多只会让分段最大值变小、进而产生更多分行，结果单调收敛到逐行判断的结果，通常1~2轮即稳定
+    breaks = gap_breaks & (sorted_y0[1:] >= np.maximum.accumulate(sorted_bottom)[:-1])
+    # 整页累计最大值未阻止任何间距分行时（常见情况）已是最终结果
+    if not np.array_equal(breaks, gap_breaks):
+        # 分段累计最大值在底部的名次上计算（名次 + 段号*行数），避免浮点偏移带来的误差
+        bottom_order = np.argsort(sorted_bottom, kind="stable")
+        bottom_rank = np.empty_like(bottom_order)
+        bottom_rank[bottom_order] = np.arange(len(bottom_order))
+        while True:
+            segment_offset = np.concatenate(([0], np.cumsum(breaks))) * len(bottom_rank)
+            row_bottom = sorted_bottom[bottom_order[np.maximum.accumulate(bottom_rank + segment_offset) - segment_offset]]
+            new_breaks = gap_breaks & (sorted_y0[1:] >= row_bottom[:-1])
+            if np.array_equal(new_breaks, breaks):
+                break
+            breaks = new_breaks
+    sorted_row_ids = np.concatenate(([0], np.cumsum(breaks)))
+
+    row_ids = np.empty_like(sorted_row_ids)
+    row_ids[order] = sorted_row_ids
+
+    # 行内按x0排序（lexsort稳定，x0相同时保持y0顺序）
+    output_order = order[np.lexsort((x0[order], sorted_row_ids))]
+    return row_ids, output_order
+
+
+# --- 函数：合并单页文本行 ---
+def merge_page_lines(texts: list, boxes: np.ndarray, y_threshold: float) -> List[str]:
+    """
+    按cluster_rows的分行结果，将同一行的文本按x0顺序用空格拼接
+
+    返回:
+        该页合并后的文本行列表
+    """
+    if not texts:
+        return []
+
+    row_ids, output_order = cluster_rows(boxes, y_threshold)
+    # 按输出顺序排列后，行号变化处即为各行的起点，逐行切片拼接
+    ordered_texts = [texts[idx] for idx in output_order.tolist()]
+    row_starts = [0, *(np.flatnonzero(np.diff(row_ids[output_order])) + 1).tolist(), len(ordered_texts)]
+    return [' '.join(ordered_texts[start:end]) for start, end in zip(row_starts[:-1], row_starts[1:])]
+
+
+#---------------------- PDF文本按行提取 --------------------------------
+
+def extract_text_lines_from_pdf(pdf_path: Union[str, fitz.Document], y_threshold: float = 20.0) -> List[str]:
     """
     使用PyMuPDF提取文本，自动合并纵坐标相近的行，只返回文本内容
-    
+
     参数:
-        pdf_path: PDF文件路径
+        pdf_path: PDF文件路径，或调用方已打开的fitz.Document（由调用方负责关闭）
         y_threshold: 纵坐标合并阈值，默认20.0
-    
+
     返回:
         文本行列表
     """
+    return extract_text_lines_with_budget(pdf_path, y_threshold)[0]
+
+
+def extract_text_lines_with_budget(pdf_path: Union[str, fitz.Document], y_threshold: float = 20.0,
+                                   max_pages: Optional[int] = None,
+                                   stop_condition: Optional[Callable[[List[str]], bool]] = None) -> tuple[List[str], dict]:
+    """
+    按页预算逐页提取文本行：达到页数上限，或stop_condition对已提取的行返回True时停止
+
+    参数:
+        pdf_path: PDF文件路径，或调用方已打开的fitz.Document（由调用方负责关闭）
+        y_threshold: 纵坐标合并阈值，默认20.0
+        max_pages: 最多读取的页数，None表示不限制
+        stop_condition: 每读完一页后以当前全部文本行调用，返回True时提前停止
+
+    返回:
+        (文本行列表, 统计信息{"total_pages", "read_pages", "skipped_pages", "stopped_early"})
+    """
     merged_lines = []
-    
+
     try:
-        with fitz.open(pdf_path) as doc:
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text_dict = page.get_text("dict")
-                raw_lines = []
-                
-                # 提取原始文本行及其坐标
-                for block in text_dict.get("blocks", []):
-                    if "lines" not in block:
-                        continue
-                        
-                    for line in block["lines"]:
-                        line_text = ""
-                        min_y0 = float('inf')
-                        min_x0 = float('inf')
-                        
-                        for span in line["spans"]:
-                            if not span["text"]:
-                                continue
-                                
-                            line_text += span["text"]
-                            # 更新最小坐标
-                            if span["bbox"][1] < min_y0:
-                                min_y0 = span["bbox"][1]
-                            if span["bbox"][0] < min_x0:
-                                min_x0 = span["bbox"][0]
-                        
-                        line_text = line_text
-                        if line_text and not re.match(r'^[=\-\s]+$', line_text):
-                            raw_lines.append({
-                                'text': line_text,
-                                'y0': min_y0,
-                                'x0': min_x0
-                            })
-                
-                # 如果没有提取到行，跳过后续处理
-                if not raw_lines:
-                    continue
-                
-                # 按纵坐标排序
-                raw_lines.sort(key=lambda x: x['y0'])
-                
-                # 合并纵坐标相近的行
-                current_group = [raw_lines[0]]
-                for i in range(1, len(raw_lines)):
-                    current_line = raw_lines[i]
-                    last_line = current_group[-1]
-                    
-                    if abs(current_line['y0'] - last_line['y0']) <= y_threshold:
-                        current_group.append(current_line)
-                    else:
-                        # 合并当前组
-                        current_group.sort(key=lambda x: x['x0'])
-                        merged_text = ' '.join([item['text'] for item in current_group])
-                        merged_lines.append(merged_text)
-                        current_group = [current_line]
-                
-                # 处理最后一组
-                if current_group:
-                    current_group.sort(key=lambda x: x['x0'])
-                    merged_text = ' '.join([item['text'] for item in current_group])
-                    merged_lines.append(merged_text)
-                    
+        # 传入路径时自行打开并在结束时关闭；传入已打开的文档时直接复用
+        own_doc = not isinstance(pdf_path, fitz.Document)
+        doc = fitz.open(pdf_path) if own_doc else pdf_path
+        try:
+            total_pages = len(doc)
+            page_limit = total_pages if max_pages is None else min(max_pages, total_pages)
+            read_pages = 0
+            stopped_early = False
+            for page_num in range(page_limit):
+                # 提取原始文本行及其坐标，向量化分行后合并
+                texts, boxes = collect_line_boxes(doc[page_num].get_text("dict", flags=TEXT_DICT_FLAGS))
+                merged_lines.extend(merge_page_lines(texts, boxes, y_threshold))
+                read_pages += 1
+
+                if stop_condition is not None and read_pages < total_pages and stop_condition(merged_lines):
+                    stopped_early = True
+                    break
+        finally:
+            if own_doc:
+                doc.close()
+
     except Exception as e:
         raise RuntimeError(f"使用PyMuPDF处理PDF文件时出错: {str(e)}")
-    
+
+    report = {
+        "total_pages": total_pages,
+        "read_pages": read_pages,
+        "skipped_pages": total_pages - read_pages,
+        "stopped_early": stopped_early,
+    }
+    return merged_lines, report
+
+
+#---------------------- 性能测试 --------------------------------
+
+# --- 函数：逐行链式比较的分行（对照实现） ---
+def merge_page_lines_chain(texts: list, boxes: np.ndarray, y_threshold: float) -> List[str]:
+    """
+    原有的逐行实现：按y0排序后只与上一行比较y0之差，作为性能测试的对照
+    """
+    raw_lines = [{'text': text, 'y0': box[0], 'x0': box[2]} for text, box in zip(texts, boxes.tolist())]
+    if not raw_lines:
+        return []
+
+    raw_lines.sort(key=lambda x: x['y0'])
+    merged_lines = []
+    current_group = [raw_lines[0]]
+    for current_line in raw_lines[1:]:
+        if abs(current_line['y0'] - current_group[-1]['y0']) <= y_threshold:
+            current_group.append(current_line)
+        else:
+            current_group.sort(key=lambda x: x['x0'])
+            merged_lines.append(' '.join(item['text'] for item in current_group))
+            current_group = [current_line]
+    current_group.sort(key=lambda x: x['x0'])
+    merged_lines.append(' '.join(item['text'] for item in current_group))
     return merged_lines
 
 
+# --- 函数：分行性能测试 ---
+def benchmark_extract_text_lines(pdf_path: str, y_threshold: float = 20.0, repeat: int = 5) -> dict:
+    """
+    对比向量化分行与逐行链式分行的耗时（文本提取只做一次，只统计分行部分）
+
+    参数:
+        pdf_path: PDF文件路径（建议100页以上）
+        y_threshold: 纵坐标合并阈值
+        repeat: 重复次数
+
+    返回:
+        dict: 页数、文本行数、两种实现的平均耗时、结果不同的页数、单行最多合并的文本行数
+    """
+    with fitz.open(pdf_path) as doc:
+        pages = [collect_line_boxes(page.get_text("dict", flags=TEXT_DICT_FLAGS)) for page in doc]
+
+    timings = {}
+    for name, merge_func in (("vectorized", merge_page_lines), ("chain", merge_page_lines_chain)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results = [merge_func(texts, boxes, y_threshold) for texts, boxes in pages]
+        timings[name] = (time.perf_counter() - start) / repeat
+        timings[f"{name}_results"] = results
+
+    return {
+        "pages": len(pages),
+        "lines": sum(len(texts) for texts, _ in pages),
+        "vectorized_s": timings["vectorized"],
+        "chain_s": timings["chain"],
+        # 纵向重叠但y0相差超过阈值的行，向量化实现会合并为一行，此处统计结果不同的页数
+        "different_pages": sum(a != b for a, b in zip(timings["vectorized_results"], timings["chain_results"])),
+        # 单行最多合并的文本行数，数值异常偏大说明存在高文本框把多行并成一行
+        "max_lines_per_row": max((int(np.bincount(cluster_rows(boxes, y_threshold)[0]).max()) for texts, boxes in pages if texts), default=0),
+    }
+
+
+# --- 函数：生成含高文本框的版式样例PDF ---
+def build_tall_box_sample_pdf(output_path: str) -> str:
+    """
+    生成一页厂商信息表样式的PDF作为分行测试用例：左侧竖排标签、大号标题、右侧分栏及逐行的厂商信息，
+    文本由PyMuPDF实际排版写入，坐标来自get_text("dict")而非手工构造
+
+    参数:
+        output_path: 输出PDF路径
+
+    返回:
+        输出PDF路径
+    """
+    with fitz.open() as doc:
+        page = doc.new_page(width=595, height=842)
+        # 左侧竖排标签：纵向跨越整个信息区域的高文本框
+        page.insert_text((40, 380), "供应商信息登记表 SUPPLIER PROFILE", fontsize=14, fontname="china-s", rotate=90)
+        page.insert_text((80, 80), "厂商信息", fontsize=32, fontname="china-s")
+        page.insert_text((420, 70), "编号：2024-001", fontsize=10, fontname="china-s")
+        fields = ["工厂名称：某某塑料制品有限公司", "联系人：张先生", "电话：13800000000", "地址：某省某市某区某路1号",
+                  "主营产品：塑料收纳盒", "出口市场：欧洲、北美", "年产能：50万件", "日期：2024年3月1日"]
+        for i, field in enumerate(fields):
+            y = 140 + i * 28
+            page.insert_text((80, y), field, fontsize=11, fontname="china-s")
+            page.insert_text((420, y), f"备注{i + 1}", fontsize=11, fontname="china-s")
+        page.insert_text((80, 800), "第 1 页", fontsize=9, fontname="china-s")
+        doc.save(output_path)
+    return output_path
+
+
 if __name__ == "__main__":
     # 实际使用示例 - 输出所有行
     print(f"PyMuPDF版本: {fitz.__version__}")
@@ -98,13 +299,21 @@ if __name__ == "__main__":
         print("-" * 80)
         print(f"{'序号':<4} {'文本内容'}")
         print("-" * 80)
-        
+
         # 输出所有行
         for i, line in enumerate(pymupdf_lines, 1):
             print(f"{i:<4} {line}")
-        
+
         print("-" * 80)
         print(f"总共提取了 {len(pymupdf_lines)} 行文本")
-            
+
     except Exception as e:
-        print(f"提取文本时出错: {e}")
\ No newline at end of file
+        print(f"提取文本时出错: {e}")
+
+    # 分行性能测试（建议使用100页以上的PDF）
+    # benchmark_pdf_path = r"tests\pdf\柬埔寨工厂.pdf"
+    # print(benchmark_extract_text_lines(benchmark_pdf_path, y_threshold=20.0))
+
+    # 高文本框版式用例：竖排标签只并入其顶部所在的标题行，不应把信息区域的各行并成一行（max_lines_per_row应为3）
+    # tall_box_pdf_path = build_tall_box_sample_pdf(r"data\test\tall_box_sample.pdf")
+    # print(benchmark_extract_text_lines(tall_box_pdf_path, y_threshold=20.0))
@@ -0,0 +1,214 @@
+# 文本行分类器：标准模板PDF和PPTX共用的日期、联系人、厂商名称、主销市场识别
+# 所有规则在导入时编译一次，每类关键词合并为一个正则交替式，一次search完成该类全部关键词的匹配
+# 分类时按规则顺序短路判断，只计算当前行号需要的规则
+import random
+import re
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from setting.config import *
+
+
+#---------------------- 规则编译 --------------------------------
+
+# --- 函数：关键词交替式 ---
+def build_keyword_alternation(keywords: list) -> str:
+    """
+    将关键词列表转为正则交替式（长关键词在前，关键词按字面匹配）
+    """
+    return '|'.join(re.escape(kw) for kw in sorted(set(keywords), key=len, reverse=True))
+
+
+# 日期：DATE_PATTERNS合并为一个交替式，一次search代替逐个模式匹配
+DATE_REGEX = re.compile('|'.join(f'(?:{pattern})' for pattern in DATE_PATTERNS))
+
+# 联系人：职位关键词与手机号合并为一个交替式
+CONTACT_REGEX = re.compile(f'{build_keyword_alternation(POSITION_KEYWORDS)}|{PHONE_PATTERN}')
+
+# 2-4个中文字的姓名
+CHINESE_NAME_REGEX = re.compile(CHINESE_NAME_PATTERN)
+
+# 厂商名称关键词
+VENDOR_REGEX = re.compile(build_keyword_alternation(VENDOR_KEYWORDS))
+
+# 主销市场关键词
+MARKET_REGEX = re.compile(build_keyword_alternation(MARKET_KEYWORDS))
+
+
+#---------------------- 单行识别 --------------------------------
+
+# --- 函数：日期文本格式识别 ---
+def is_date_text(text: str) -> bool:
+    """
+    检查文本内容是否符合config中DATE_PATTERNS配置的任一日期格式（超过50字的文本不检查）
+    """
+    if not text or len(text) > 50:
+        return False
+    return DATE_REGEX.search(text.strip()) is not None
+
+
+# --- 函数：联系人识别 ---
+def find_contact_line(text: str, match_name: bool = False) -> bool:
+    """
+    判断文本行是否为联系方式（手机号或职位关键词）
+
+    参数：
+        text (str): 待判断的文本行
+        match_name (bool): 是否把只有2-4个中文字的行也视为联系人（PPTX使用）
+    """
+    if CONTACT_REGEX.search(text):
+        return True
+    return match_name and CHINESE_NAME_REGEX.search(text) is not None
+
+
+# --- 函数：厂商名称格式识别 ---
+def is_vendor_name(line: str) -> bool:
+    """
+    判断文本行是否为厂商名称：不含冒号（标签:值格式）且包含企业类型关键词
+    """
+    return ':' not in line and VENDOR_REGEX.search(line) is not None
+
+
+# --- 函数：主销市场识别 ---
+def extract_market_info(text: str) -> str:
+    """
+    文本包含市场关键词时返回去除首尾空格的整行，否则返回空字符串
+    """
+    return text.strip() if MARKET_REGEX.search(text) else ""
+
+
+#---------------------- PDF文本行分类 --------------------------------
+
+# --- 函数：对提取文本进行分类 ---
+def classify_pdf_text_lines(lines: list[str]) -> dict[str, list[str]]:
+    """
+    对PDF提取的文本行进行分类，按规则顺序短路判断
+
+    分类规则（按顺序，命中即停止）：
+    1. 最后一行 → 日期
+    2. 前三行 → 厂商名称
+    3. 前七行 → 联系人（手机号或职位关键词）
+    4. 所有行 → 市场信息
+    5. 未匹配 → others
+
+    参数:
+        lines (list[str]): 从PDF中提取的文本行列表
+
+    返回:
+        dict: {'dates', 'vendors', 'contacts', 'markets', 'others'}分类结果
+    """
+    classified_data = {
+        'dates': [],
+        'vendors': [],
+        'contacts': [],
+        'markets': [],
+        'others': []
+    }
+
+    last_index = len(lines) - 1
+    for i, line in enumerate(lines):
+        if i == last_index and is_date_text(line):
+            classified_data['dates'].append(line)
+        elif i < 3 and is_vendor_name(line):
+            classified_data['vendors'].append(line)
+        elif i < 7 and find_contact_line(line):
+            classified_data['contacts'].append(line)
+        elif MARKET_REGEX.search(line):
+            classified_data['markets'].append(line)
+        else:
+            classified_data['others'].append(line)
+
+    return classified_data
+
+
+#---------------------- 性能测试 --------------------------------
+
+# --- 函数：逐条规则匹配的分类（对照实现） ---
+def classify_pdf_text_lines_reference(lines: list[str]) -> dict[str, list[str]]:
+    """
+    原有实现：每行重新编译手机号/职位正则，逐个遍历日期模式和关键词，作为性能测试的对照
+    """
+    def is_date(text):
+        if not text or len(text) > 50:
+            return False
+        return any(re.search(pattern, text.strip()) for pattern in DATE_PATTERNS)
+
+    def is_contact(text):
+        phone_pattern = re.compile(PHONE_PATTERN)
+        position_pattern = re.compile(r'.*(' + '|'.join(POSITION_KEYWORDS) + r').*')
+        return bool(phone_pattern.search(text) or position_pattern.search(text))
+
+    def is_vendor(line):
+        if ':' in line:
+            return False
+        return any(kw in line for kw in VENDOR_KEYWORDS)
+
+    classified_data = {'dates': [], 'vendors': [], 'contacts': [], 'markets': [], 'others': []}
+    for i, line in enumerate(lines):
+        if i == len(lines) - 1 and is_date(line):
+            classified_data['dates'].append(line)
+        elif i < 3 and is_vendor(line):
+            classified_data['vendors'].append(line)
+        elif i < 7 and is_contact(line):
+            classified_data['contacts'].append(line)
+        elif any(kw in line for kw in MARKET_KEYWORDS):
+            classified_data['markets'].append(line)
+        else:
+            classified_data['others'].append(line)
+    return classified_data
+
+
+# --- 函数：生成测试文本行 ---
+def make_sample_lines(count: int, seed: int = 0) -> list[str]:
+    """
+    随机组合厂商、联系人、市场、日期和普通描述文本，生成count行测试数据
+    """
+    rng = random.Random(seed)
+    fragments = [
+        '东莞市{}五金制品有限公司', '张{} 销售经理 138 {} 5678', '联系人：王{} 电话:139-{}-0000',
+        '主销市场：欧美{}%，东南亚{}%', '市 场 占 ⽐ 日本{}%', '主营产品：不锈钢餐具{}套',
+        '{}年12月31日', '产能：每月{}万件', '验厂/认证：BSCI {}', '合作情况：{}年开始合作',
+        '⼚房面积{}平方米', 'Factory address: No.{} Road', '{}月{}日, 2024',
+    ]
+    lines = []
+    for _ in range(count):
+        template = rng.choice(fragments)
+        lines.append(template.format(*(rng.randint(1, 9999) for _ in range(template.count('{}')))))
+    return lines
+
+
+# --- 函数：分类性能测试 ---
+def benchmark_line_classifier(line_count: int = 5000, group_size: int = 20, repeat: int = 5) -> dict:
+    """
+    对比预编译交替式分类与逐条规则分类的耗时
+
+    参数:
+        line_count: 测试文本总行数
+        group_size: 每个文档的行数（分类规则与行号相关，按文档分组调用）
+        repeat: 重复次数
+
+    返回:
+        dict: 行数、两种实现的平均耗时、分类结果不一致的文档数
+    """
+    lines = make_sample_lines(line_count)
+    documents = [lines[i:i + group_size] for i in range(0, len(lines), group_size)]
+
+    timings = {}
+    results = {}
+    for name, classify_func in (("compiled", classify_pdf_text_lines), ("reference", classify_pdf_text_lines_reference)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results[name] = [classify_func(document) for document in documents]
+        timings[name] = (time.perf_counter() - start) / repeat
+
+    return {
+        "lines": len(lines),
+        "compiled_s": timings["compiled"],
+        "reference_s": timings["reference"],
+        "different_documents": sum(a != b for a, b in zip(results["compiled"], results["reference"])),
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark_line_classifier(line_count=10000))
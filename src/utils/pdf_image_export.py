@@ -0,0 +1,81 @@
+# PDF图片导出：尽量直接写出图片原始压缩流，只在需要时通过Pixmap合成蒙版/转换色彩空间
+# 导出结果附带格式和尺寸信息，后续环节无需再次打开图片获取尺寸
+
+import fitz
+import logging
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 可直接写出原始流的格式（下游Excel插图和OpenCV都能直接读取）
+RAW_EXPORT_EXTS = {'png', 'jpg', 'jpeg', 'bmp', 'gif'}
+
+# 可直接使用的色彩空间分量数：1=灰度，3=RGB
+RAW_EXPORT_COLORSPACES = {1, 3}
+
+
+# --- 函数：导出PDF图片 ---
+def export_pdf_image(doc, xref: int, smask: int = 0) -> dict:
+    """
+    导出PDF中的一张图片
+
+    导出规则：
+    1. 无透明蒙版、灰度/RGB色彩空间、下游可直接读取的格式：原样写出extract_image的原始字节
+    2. 带SMask蒙版：通过Pixmap合成一次透明通道，输出PNG
+    3. CMYK等其他色彩空间：通过Pixmap转换为RGB，输出PNG
+    4. JPX/JBIG2等下游无法读取的格式：通过Pixmap解码，输出PNG
+
+    参数：
+        doc: PyMuPDF文档对象
+        xref (int): 图片的引用ID
+        smask (int): 蒙版图片的引用ID（page.get_images()元组的第2项），0表示无蒙版
+
+    返回：
+        dict: {
+            "image": 图片字节, "ext": 扩展名(不带"."), "width": 宽, "height": 高,
+            "colorspace": 原色彩空间名称, "has_alpha": 是否含透明通道,
+            "source": "raw"（原始流）或 "pixmap"（经Pixmap合成/转换）
+        }
+    """
+    base_image = doc.extract_image(xref)
+    smask = smask or base_image.get("smask", 0)
+    colorspace = base_image.get("colorspace", 3)
+
+    # 步骤1：原始流可直接使用
+    if not smask and colorspace in RAW_EXPORT_COLORSPACES and base_image["ext"] in RAW_EXPORT_EXTS:
+        return {
+            "image": base_image["image"],
+            "ext": base_image["ext"],
+            "width": base_image["width"],
+            "height": base_image["height"],
+            "colorspace": base_image.get("cs-name", ""),
+            "has_alpha": False,
+            "source": "raw",
+        }
+
+    # 步骤2-4：通过Pixmap转换
+    pix = fitz.Pixmap(doc, xref)
+    if pix.colorspace and pix.colorspace.n not in RAW_EXPORT_COLORSPACES:
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+    if smask:
+        try:
+            pix = fitz.Pixmap(pix, fitz.Pixmap(doc, smask))
+        except Exception as e:
+            logging.warning(f"合成图片蒙版失败，忽略透明通道: xref={xref}, smask={smask}, 错误: {str(e)}")
+
+    return {
+        "image": pix.tobytes("png"),
+        "ext": "png",
+        "width": pix.width,
+        "height": pix.height,
+        "colorspace": base_image.get("cs-name", ""),
+        "has_alpha": bool(pix.alpha),
+        "source": "pixmap",
+    }
+
+
+# --- 函数：图片元数据 ---
+def image_metadata(exported: dict) -> dict:
+    """
+    从export_pdf_image的导出结果中取出可写入索引的元数据（不含图片字节）
+    """
+    return {key: value for key, value in exported.items() if key != "image"}
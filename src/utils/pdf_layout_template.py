@@ -0,0 +1,231 @@
+# 标准模板PDF版式模板：从少量标注样本中学习各字段所在的页面区域，提取时按区域查找文本行所属字段
+# 区域坐标按页面宽高归一化（0~1），同一模板导出的PDF页面尺寸略有差异时仍可复用
+# 区域的横向范围描述文本行起点x0的范围，纵向范围描述文本行的上下边界范围
+from functools import lru_cache
+from typing import Optional
+import json
+import logging
+import re
+import sys
+import os
+import fitz
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from src.utils.extract_by_row import TEXT_DICT_FLAGS, collect_line_boxes, merge_page_lines
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 模板字段（与classify_pdf_text_lines的分类键一致，未落入任何区域的文本行归入others）
+TEMPLATE_FIELDS = ('vendors', 'contacts', 'markets', 'dates')
+
+# 标注匹配阈值：参与匹配的文本至少包含的字符数（去除空白后），避免"1"、"电话"等短文本误匹配
+ANNOTATION_MIN_CHARS = 2
+# 文本行被标注值包含时（标注跨多行，文本行只是其中一段），文本行至少覆盖标注值的比例，
+# 避免"有限公司"等通用片段匹配到整条厂商名称
+ANNOTATION_MIN_COVERAGE = 0.6
+
+
+#---------------------- 模板学习 --------------------------------
+
+# --- 函数：读取页面文本行的归一化坐标 ---
+def read_normalized_lines(page) -> tuple[list, np.ndarray]:
+    """
+    提取页面文本行，坐标按页面宽高归一化
+
+    返回：
+        (文本列表, 坐标数组)：坐标数组形状为(N, 3)，列依次为 y0、y1、x0（均为0~1）
+    """
+    texts, boxes = collect_line_boxes(page.get_text("dict", flags=TEXT_DICT_FLAGS))
+    scale = np.array([page.rect.height, page.rect.height, page.rect.width])
+    return texts, boxes / scale
+
+
+# --- 函数：标注字段匹配 ---
+def match_annotated_field(text: str, annotations: dict) -> Optional[str]:
+    """
+    判断文本行属于哪个标注字段（均去除空白后比较）：
+    1. 文本行包含标注值即视为匹配
+    2. 标注值包含文本行时，文本行需覆盖标注值的ANNOTATION_MIN_COVERAGE以上才视为匹配（标注跨多行的情况）
+    文本行或标注值短于ANNOTATION_MIN_CHARS时不参与匹配
+
+    参数：
+        text (str): 文本行
+        annotations (dict): {字段: [标注文本, ...]}
+
+    返回：
+        str: 匹配的字段名（按TEMPLATE_FIELDS顺序取第一个），未匹配返回None
+    """
+    normalized = re.sub(r'\s+', '', text)
+    if len(normalized) < ANNOTATION_MIN_CHARS:
+        return None
+    for field in TEMPLATE_FIELDS:
+        for value in annotations.get(field, []):
+            value = re.sub(r'\s+', '', value)
+            if len(value) < ANNOTATION_MIN_CHARS:
+                continue
+            if value in normalized:
+                return field
+            if normalized in value and len(normalized) >= len(value) * ANNOTATION_MIN_COVERAGE:
+                return field
+    return None
+
+
+# --- 函数：从标注样本学习版式模板 ---
+def learn_layout_template(samples: list[dict], margin: float = 0.01) -> dict:
+    """
+    从标注样本中学习各字段的页面区域
+
+    处理流程：
+    1. 逐个打开样本PDF，提取每页文本行及归一化坐标
+    2. 将文本行与样本标注的字段值匹配，按(字段, 页码)累计区域的外接范围
+    3. 各区域向外扩展margin，得到模板
+
+    参数：
+        samples (list[dict]): 标注样本列表，每项为 {"pdf": PDF路径, "fields": {字段: [该字段的文本, ...]}}，
+            字段取TEMPLATE_FIELDS中的值
+        margin (float): 区域向外扩展的距离（相对页面宽高）
+
+    返回：
+        dict: {"pages": 模板涉及的页数, "fields": {字段: [{"page": 页码, "rect": [x0, y0, x1, y1]}, ...]}}
+    """
+    extents = {}
+    for sample in samples:
+        with fitz.open(sample["pdf"]) as doc:
+            for page_index, page in enumerate(doc):
+                texts, boxes = read_normalized_lines(page)
+                for text, (y0, y1, x0) in zip(texts, boxes.tolist()):
+                    field = match_annotated_field(text, sample["fields"])
+                    if field is None:
+                        continue
+                    logging.info(f"标注匹配: {os.path.basename(sample['pdf'])} 第{page_index + 1}页 [{field}] {text}")
+                    extent = extents.setdefault((field, page_index), [x0, y0, x0, y1])
+                    extent[0] = min(extent[0], x0)
+                    extent[1] = min(extent[1], y0)
+                    extent[2] = max(extent[2], x0)
+                    extent[3] = max(extent[3], y1)
+
+    template = {"pages": 0, "fields": {}}
+    for (field, page_index), (x0, y0, x1, y1) in sorted(extents.items()):
+        template["fields"].setdefault(field, []).append({
+            "page": page_index,
+            "rect": [max(0.0, x0 - margin), max(0.0, y0 - margin), min(1.0, x1 + margin), min(1.0, y1 + margin)],
+        })
+        template["pages"] = max(template["pages"], page_index + 1)
+
+    missing = [field for field in TEMPLATE_FIELDS if field not in template["fields"]]
+    if missing:
+        logging.warning(f"标注样本中未匹配到以下字段的文本，模板不包含其区域: {missing}")
+    return template
+
+
+# --- 函数：保存版式模板 ---
+def save_layout_template(template: dict, template_path: str) -> None:
+    with open(template_path, 'w', encoding='utf-8') as f:
+        json.dump(template, f, ensure_ascii=False, indent=2)
+
+
+# --- 函数：读取版式模板（按路径缓存） ---
+@lru_cache(maxsize=None)
+def load_layout_template(template_path: str) -> dict:
+    with open(template_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+#---------------------- 按模板提取 --------------------------------
+
+# --- 函数：整理单页的字段区域 ---
+def page_regions(template: dict, page_index: int) -> tuple[list, np.ndarray]:
+    """
+    返回(字段名列表, 区域数组)：区域数组形状为(F, 4)，列依次为 x0、y0、x1、y1
+    """
+    fields = []
+    rects = []
+    for field in TEMPLATE_FIELDS:
+        for region in template["fields"].get(field, []):
+            if region["page"] == page_index:
+                fields.append(field)
+                rects.append(region["rect"])
+    return fields, np.asarray(rects, dtype=np.float64).reshape(-1, 4)
+
+
+# --- 函数：按区域查找文本行所属字段 ---
+def locate_fields(boxes: np.ndarray, rects: np.ndarray) -> np.ndarray:
+    """
+    一次性判断每个文本行落入哪个区域：文本行起点x0与纵向中点同时落在区域内即视为命中
+
+    参数：
+        boxes: 归一化坐标数组(N, 3)，列依次为 y0、y1、x0
+        rects: 区域数组(F, 4)
+
+    返回：
+        np.ndarray: 长度N的区域下标，未落入任何区域的为F（多个区域重叠时取第一个）
+    """
+    if not len(rects):
+        return np.zeros(len(boxes), dtype=np.intp)
+
+    x0 = boxes[:, 2:3]
+    y_mid = (boxes[:, 0:1] + boxes[:, 1:2]) / 2
+    inside = (x0 >= rects[:, 0]) & (x0 <= rects[:, 2]) & (y_mid >= rects[:, 1]) & (y_mid <= rects[:, 3])
+    return np.where(inside.any(axis=1), inside.argmax(axis=1), len(rects))
+
+
+# --- 函数：按版式模板提取字段 ---
+def extract_fields_by_template(doc: fitz.Document, template: dict, y_threshold: float = 20.0,
+                               max_pages: Optional[int] = None) -> dict[str, list[str]]:
+    """
+    按版式模板提取标准模板PDF中的字段文本
+
+    处理流程：
+    1. 逐页提取文本行及坐标（页数受max_pages限制）
+    2. 按区域一次性确定每个文本行所属字段，模板未覆盖的页面全部归入others
+    3. 同一字段的文本行按纵坐标合并为行，按页顺序追加
+
+    参数：
+        doc: 已打开的PDF文档（由调用方负责关闭）
+        template (dict): learn_layout_template/load_layout_template得到的模板
+        y_threshold (float): 纵坐标合并阈值
+        max_pages (int): 最多读取的页数，None表示不限制
+
+    返回：
+        dict: 与classify_pdf_text_lines相同结构的分类结果
+    """
+    classified_data = {field: [] for field in TEMPLATE_FIELDS}
+    classified_data['others'] = []
+
+    page_limit = len(doc) if max_pages is None else min(max_pages, len(doc))
+    for page_index in range(page_limit):
+        page = doc[page_index]
+        texts, boxes = collect_line_boxes(page.get_text("dict", flags=TEXT_DICT_FLAGS))
+        if not texts:
+            continue
+
+        fields, rects = page_regions(template, page_index)
+        scale = np.array([page.rect.height, page.rect.height, page.rect.width])
+        region_ids = locate_fields(boxes / scale, rects)
+
+        # 区域下标映射为字段名，未命中的归入others；合并行时使用原始坐标
+        for region_id, field in enumerate(fields + ['others']):
+            mask = region_ids == region_id
+            if mask.any():
+                field_texts = [text for text, selected in zip(texts, mask) if selected]
+                classified_data[field].extend(merge_page_lines(field_texts, boxes[mask], y_threshold))
+
+    return classified_data
+
+
+if __name__ == "__main__":
+    # 使用示例：从标注样本学习模板并保存，路径替换为实际文件
+    annotated_samples = [
+        {
+            "pdf": r"data\test\5555\上海纽恩特实业股份有限公司湖南享同实业有限公司1750645560.pdf",
+            "fields": {
+                "vendors": ["上海纽恩特实业股份有限公司", "湖南享同实业有限公司"],
+                "contacts": ["张经理 13800000000"],
+                "markets": ["主销市场 欧美", "市场占比 60%"],
+                "dates": ["2025年6月23日"],
+            },
+        },
+    ]
+    layout_template = learn_layout_template(annotated_samples)
+    save_layout_template(layout_template, r"setting\pdf_layout_template.json")
+    print(json.dumps(layout_template, ensure_ascii=False, indent=2))
@@ -0,0 +1,159 @@
+# 二维码解码结果缓存：以图片字节的哈希为键持久化保存解码结论，同一张图片在不同文档中再次出现时直接复用
+# 使用SQLite存储（标准库，多进程可共享同一文件），按最近使用时间淘汰超出上限的记录
+# 缓存读写失败只记录警告并跳过缓存，不影响二维码识别流程
+from typing import Optional
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from setting.config import *
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 每写入多少条记录检查一次是否超出上限
+EVICT_CHECK_INTERVAL = 100
+
+# 命中时最近使用时间早于该秒数才刷新（淘汰只需粗略的使用顺序，避免每次命中都产生一次写事务）
+LAST_USED_REFRESH_S = 24 * 3600
+
+# 各进程各自打开的连接 {(进程ID, 缓存路径): 连接}，进程池的子进程不会复用父进程的连接
+_connections = {}
+_puts_since_check = 0
+
+
+#---------------------- 缓存键 --------------------------------
+
+# --- 函数：解码策略指纹 ---
+def qr_policy_fingerprint() -> str:
+    """
+    预筛选/解码策略、解码引擎及内容分类规则的指纹：任一项变化后旧结论不再命中
+    """
+    policies = json.dumps([QR_PREFILTER_POLICY, QR_DECODE_POLICY, QR_ENGINE, QR_ENGINE_CASCADE, QR_PAYLOAD_PATTERNS],
+                          sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(policies.encode('utf-8')).hexdigest()[:8]
+
+
+# --- 函数：缓存键 ---
+def qr_cache_key(image_bytes: bytes, decoder: str = "") -> str:
+    """
+    缓存键：图片原始字节的SHA1 + 策略指纹 + 图片解码方式（如透明通道是否合成到白底会影响识别结论）
+    """
+    return f"{hashlib.sha1(image_bytes).hexdigest()}:{qr_policy_fingerprint()}:{decoder}"
+
+
+#---------------------- 缓存读写 --------------------------------
+
+# --- 函数：获取缓存连接 ---
+def get_qr_cache_connection() -> Optional[sqlite3.Connection]:
+    """
+    打开（或复用当前进程已打开的）缓存数据库连接；缓存未启用或打开失败时返回None
+    """
+    if not QR_DECODE_CACHE["enabled"]:
+        return None
+
+    cache_path = QR_DECODE_CACHE["path"]
+    connection_key = (os.getpid(), cache_path)
+    if connection_key in _connections:
+        return _connections[connection_key]
+
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        connection = sqlite3.connect(cache_path, timeout=10)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS qr_decode_cache ("
+            "key TEXT PRIMARY KEY, status TEXT NOT NULL, payload TEXT NOT NULL, last_used REAL NOT NULL, "
+            "codes TEXT NOT NULL DEFAULT '[]', category TEXT NOT NULL DEFAULT '')"
+        )
+        # 旧版缓存文件没有codes列（微信二维码顶点坐标）或category列（内容分类），补充缺少的列
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(qr_decode_cache)")}
+        for column, definition in (("codes", "TEXT NOT NULL DEFAULT '[]'"), ("category", "TEXT NOT NULL DEFAULT ''")):
+            if column not in columns:
+                connection.execute(f"ALTER TABLE qr_decode_cache ADD COLUMN {column} {definition}")
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_qr_decode_cache_last_used ON qr_decode_cache(last_used)")
+        connection.commit()
+    except sqlite3.Error as e:
+        logging.warning(f"打开二维码解码缓存失败，本进程不使用缓存: {cache_path}, 错误: {str(e)}")
+        connection = None
+
+    _connections[connection_key] = connection
+    return connection
+
+
+# --- 函数：查询缓存 ---
+def lookup_qr_verdict(key: str) -> Optional[dict]:
+    """
+    查询缓存的解码结论；命中且最近使用时间已超过LAST_USED_REFRESH_S时才刷新，
+    多个进程共享缓存文件时大部分命中只读不写
+
+    返回：
+        dict: {"status": 结论, "payload": 二维码内容, "category": 内容分类, "codes": 微信二维码及顶点坐标}；未命中返回None
+    """
+    connection = get_qr_cache_connection()
+    if connection is None:
+        return None
+
+    try:
+        row = connection.execute(
+            "SELECT status, payload, codes, category, last_used FROM qr_decode_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[4] > LAST_USED_REFRESH_S:
+            connection.execute("UPDATE qr_decode_cache SET last_used = ? WHERE key = ?", (now, key))
+            connection.commit()
+        return {"status": row[0], "payload": row[1], "category": row[3], "codes": json.loads(row[2])}
+    except sqlite3.Error as e:
+        logging.warning(f"查询二维码解码缓存失败: {str(e)}")
+        return None
+
+
+# --- 函数：写入缓存 ---
+def store_qr_verdict(key: str, verdict: dict) -> None:
+    """
+    写入解码结论；每写入EVICT_CHECK_INTERVAL条检查一次记录数，超出max_entries时淘汰最久未使用的记录
+    """
+    global _puts_since_check
+    connection = get_qr_cache_connection()
+    if connection is None:
+        return
+
+    try:
+        connection.execute(
+            "INSERT OR REPLACE INTO qr_decode_cache (key, status, payload, last_used, codes, category) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, verdict["status"], verdict.get("payload", ""), time.time(),
+             json.dumps(verdict.get("codes", []), ensure_ascii=False), verdict.get("category", "")),
+        )
+        _puts_since_check += 1
+        if _puts_since_check >= EVICT_CHECK_INTERVAL:
+            _puts_since_check = 0
+            evict_qr_cache(connection, QR_DECODE_CACHE["max_entries"])
+        connection.commit()
+    except sqlite3.Error as e:
+        logging.warning(f"写入二维码解码缓存失败: {str(e)}")
+
+
+# --- 函数：淘汰缓存记录 ---
+def evict_qr_cache(connection: sqlite3.Connection, max_entries: int) -> int:
+    """
+    记录数超过max_entries时，按最近使用时间删除最旧的记录
+
+    返回：
+        int: 删除的记录数
+    """
+    count = connection.execute("SELECT COUNT(*) FROM qr_decode_cache").fetchone()[0]
+    excess = count - max_entries
+    if excess <= 0:
+        return 0
+    connection.execute(
+        "DELETE FROM qr_decode_cache WHERE key IN (SELECT key FROM qr_decode_cache ORDER BY last_used LIMIT ?)",
+        (excess,),
+    )
+    logging.info(f"二维码解码缓存超出上限 {max_entries}，淘汰 {excess} 条最久未使用的记录")
+    return excess
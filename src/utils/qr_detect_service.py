@@ -0,0 +1,126 @@
+# 二维码识别进程池服务：文档处理流程将图片字节提交到共享进程池，立即得到Future，结果在需要时再取回
+# 已提交但结果尚未被取走的图片字节总量受预算限制（结果通过take取回后才释放），超出时提交方阻塞等待，控制内存占用
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional
+import atexit
+import logging
+import threading
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from setting.config import *
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 当前进程共享的服务实例
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+class QrDetectService:
+    """
+    二维码识别进程池服务
+
+    参数：
+        worker_func: 在子进程中执行的识别函数（模块级函数），第一个参数为图片字节
+        workers (int): 进程数，0表示使用CPU核数
+        max_inflight_bytes (int): 已提交但结果尚未取回的图片字节总量上限；单张图片超过上限时在无其他任务时单独提交
+
+    用法：
+        submit提交后，必须通过take取回结果（或discard放弃），预算在此时才释放；
+        同一线程既提交又取回时，先用has_room判断，预算不足时先取回最早提交的结果再提交，避免阻塞在submit上
+    """
+
+    def __init__(self, worker_func: Callable, workers: int = 0, max_inflight_bytes: int = 256 * 1024 * 1024):
+        self._worker_func = worker_func
+        self._executor = ProcessPoolExecutor(max_workers=workers or None)
+        self._max_inflight_bytes = max_inflight_bytes
+        self._inflight_bytes = 0
+        self._reserved = {}  # {Future: 占用的字节数}
+        self._condition = threading.Condition()
+
+    # --- 预算判断 ---
+    def has_room(self, size: int) -> bool:
+        """判断现在提交size字节的图片是否不会阻塞"""
+        with self._condition:
+            return not self._inflight_bytes or self._inflight_bytes + size <= self._max_inflight_bytes
+
+    # --- 提交图片 ---
+    def submit(self, image_bytes: bytes, *args) -> Future:
+        """
+        提交一张图片，返回识别结果的Future；在途字节超出预算时阻塞，直到其他提交的结果被取回
+        """
+        size = len(image_bytes)
+        with self._condition:
+            while self._inflight_bytes and self._inflight_bytes + size > self._max_inflight_bytes:
+                self._condition.wait()
+            self._inflight_bytes += size
+
+        try:
+            future = self._executor.submit(self._worker_func, image_bytes, *args)
+        except Exception:
+            self._release(size)
+            raise
+        with self._condition:
+            self._reserved[future] = size
+        return future
+
+    # --- 取回结果 ---
+    def take(self, future: Future):
+        """
+        等待并取回识别结果，结果交给调用方后释放该图片占用的预算（识别出错时抛出异常，预算同样释放）
+        """
+        try:
+            return future.result()
+        finally:
+            self._release_future(future)
+
+    # --- 放弃结果 ---
+    def discard(self, future: Future) -> None:
+        """不再需要结果时取消（未开始时）并释放预算"""
+        future.cancel()
+        self._release_future(future)
+
+    # --- 释放在途字节 ---
+    def _release_future(self, future: Future) -> None:
+        with self._condition:
+            size = self._reserved.pop(future, None)
+        if size is not None:
+            self._release(size)
+
+    def _release(self, size: int) -> None:
+        with self._condition:
+            self._inflight_bytes -= size
+            self._condition.notify_all()
+
+    @property
+    def inflight_bytes(self) -> int:
+        return self._inflight_bytes
+
+    # --- 关闭进程池 ---
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+# --- 函数：获取共享服务 ---
+def get_qr_detect_service(worker_func: Callable) -> Optional[QrDetectService]:
+    """
+    获取当前进程共享的二维码识别服务（首次调用时按config中的QR_DETECT_SERVICE创建，程序退出时关闭）
+
+    返回：
+        QrDetectService: 未启用时返回None
+    """
+    global _shared_service
+    if not QR_DETECT_SERVICE["enabled"]:
+        return None
+
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = QrDetectService(
+                worker_func,
+                workers=QR_DETECT_SERVICE["workers"],
+                max_inflight_bytes=int(QR_DETECT_SERVICE["max_inflight_mb"] * 1024 * 1024),
+            )
+            atexit.register(_shared_service.shutdown)
+            logging.info(f"二维码识别进程池已启动，进程数: {QR_DETECT_SERVICE['workers'] or os.cpu_count()}")
+        return _shared_service
@@ -0,0 +1,192 @@
+# 二维码解码引擎：统一的引擎接口（输入OpenCV图像，输出解码结果列表），可通过config中的QR_ENGINE切换
+# 内置pyzbar、OpenCV QRCodeDetector两种引擎，以及按QR_ENGINE_CASCADE顺序依次尝试的cascade模式
+# 解码结果：[{"data": 二维码内容(str), "polygon": [[x, y], ...] 二维码在图片中的顶点坐标}]
+from typing import Callable, Optional
+import json
+import logging
+import time
+import cv2
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from setting.config import *
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 已注册引擎：{引擎名: 解码函数}
+_QR_ENGINES = {}
+
+# 当前进程中不可用的引擎（如缺少zbar动态库），cascade模式下跳过
+_UNAVAILABLE_ENGINES = set()
+
+# OpenCV检测器（每个进程创建一次）
+_opencv_detector = None
+
+
+#---------------------- 引擎注册 --------------------------------
+
+# --- 函数：注册解码引擎 ---
+def register_qr_engine(name: str, decode_func: Callable) -> None:
+    """
+    注册二维码解码引擎
+
+    参数：
+        name (str): 引擎名（QR_ENGINE / QR_ENGINE_CASCADE中使用）
+        decode_func: 解码函数，输入OpenCV图像，返回[{"data": str, "polygon": [[x, y], ...]}]
+    """
+    _QR_ENGINES[name] = decode_func
+
+
+# --- 函数：获取解码引擎 ---
+def get_qr_engine(name: str) -> Callable:
+    if name not in _QR_ENGINES:
+        raise ValueError(f"未知的二维码解码引擎: {name}，可选: {sorted(_QR_ENGINES)}")
+    return _QR_ENGINES[name]
+
+
+#---------------------- 内置引擎 --------------------------------
+
+# --- 函数：pyzbar引擎 ---
+def decode_with_pyzbar(image) -> list[dict]:
+    """
+    使用pyzbar解码（只保留QRCODE类型的结果）
+    """
+    # 延迟导入：只使用OpenCV引擎时不需要zbar动态库
+    from pyzbar.pyzbar import decode
+
+    results = []
+    for obj in decode(image):
+        if obj.type == 'QRCODE':
+            results.append({
+                "data": obj.data.decode('utf-8', errors='replace'),
+                "polygon": [[int(point.x), int(point.y)] for point in obj.polygon],
+            })
+    return results
+
+
+# --- 函数：OpenCV引擎 ---
+def decode_with_opencv(image) -> list[dict]:
+    """
+    使用OpenCV QRCodeDetector解码，支持一张图片中的多个二维码
+    """
+    global _opencv_detector
+    if _opencv_detector is None:
+        _opencv_detector = cv2.QRCodeDetector()
+
+    try:
+        found, texts, points, _ = _opencv_detector.detectAndDecodeMulti(image)
+    except cv2.error as e:
+        logging.debug(f"OpenCV二维码解码失败: {str(e)}")
+        return []
+    if not found or points is None:
+        return []
+
+    return [
+        {"data": text, "polygon": np.asarray(polygon).reshape(-1, 2).round().astype(int).tolist()}
+        for text, polygon in zip(texts, points) if text
+    ]
+
+
+# --- 函数：cascade引擎 ---
+def decode_with_cascade(image) -> list[dict]:
+    """
+    按QR_ENGINE_CASCADE顺序依次尝试各引擎，前一个引擎解码出二维码即停止；
+    引擎不可用（如缺少zbar动态库）时记录一次警告并在本进程中跳过
+    """
+    for name in QR_ENGINE_CASCADE:
+        if name in _UNAVAILABLE_ENGINES:
+            continue
+        try:
+            results = get_qr_engine(name)(image)
+        except (ImportError, OSError) as e:
+            _UNAVAILABLE_ENGINES.add(name)
+            logging.warning(f"二维码解码引擎 {name} 不可用，cascade模式下跳过: {str(e)}")
+            continue
+        if results:
+            return results
+    return []
+
+
+register_qr_engine("pyzbar", decode_with_pyzbar)
+register_qr_engine("opencv", decode_with_opencv)
+register_qr_engine("cascade", decode_with_cascade)
+
+
+# --- 函数：解码图片中的二维码 ---
+def decode_qr_codes(image, engine: Optional[str] = None) -> list[dict]:
+    """
+    使用指定引擎（默认config中的QR_ENGINE）解码图片中的二维码
+
+    返回：
+        list[dict]: [{"data": 二维码内容, "polygon": 顶点坐标}]，未解码出二维码时为空列表
+    """
+    return get_qr_engine(engine or QR_ENGINE)(image)
+
+
+#---------------------- 性能测试 --------------------------------
+
+# --- 函数：读取标注图片集 ---
+def load_labelled_images(folder: str, labels_file: str = "labels.json") -> list[tuple]:
+    """
+    读取标注图片集：labels_file为 {文件名: 预期二维码内容}，非二维码图片的预期内容为空字符串
+
+    返回：
+        list[tuple]: [(文件名, OpenCV图像, 预期内容)]
+    """
+    with open(os.path.join(folder, labels_file), 'r', encoding='utf-8') as f:
+        labels = json.load(f)
+
+    images = []
+    for filename, expected in labels.items():
+        image = cv2.imdecode(np.fromfile(os.path.join(folder, filename), np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            logging.warning(f"无法读取标注图片: {filename}")
+            continue
+        images.append((filename, image, expected))
+    return images
+
+
+# --- 函数：解码引擎对比测试 ---
+def benchmark_qr_engines(labelled_images: list[tuple], engines: Optional[list] = None) -> dict:
+    """
+    在标注图片集上比较各引擎的吞吐量和召回率
+
+    参数：
+        labelled_images: load_labelled_images的返回值 [(文件名, 图像, 预期内容)]
+        engines: 参与对比的引擎名，默认全部已注册引擎
+
+    返回：
+        dict: {引擎名: {"images", "seconds", "images_per_s", "recall"(二维码图片中解码出预期内容的比例),
+                        "false_positives"(非二维码图片解码出内容的数量), "missed"(未解码出的二维码图片文件名)}}
+    """
+    results = {}
+    for name in engines or list(_QR_ENGINES):
+        found = []
+        start = time.perf_counter()
+        try:
+            for _, image, _ in labelled_images:
+                found.append({item["data"] for item in get_qr_engine(name)(image)})
+        except (ImportError, OSError) as e:
+            logging.warning(f"二维码解码引擎 {name} 不可用，跳过对比: {str(e)}")
+            continue
+        seconds = time.perf_counter() - start
+
+        qr_images = [(filename, expected, data) for (filename, _, expected), data in zip(labelled_images, found) if expected]
+        missed = [filename for filename, expected, data in qr_images if expected not in data]
+        results[name] = {
+            "images": len(labelled_images),
+            "seconds": seconds,
+            "images_per_s": len(labelled_images) / seconds if seconds else 0.0,
+            "recall": (len(qr_images) - len(missed)) / len(qr_images) if qr_images else 0.0,
+            "false_positives": sum(bool(data) for (_, _, expected), data in zip(labelled_images, found) if not expected),
+            "missed": missed,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    # 使用示例：标注图片集目录下放置图片和labels.json（{文件名: 预期二维码内容}），路径替换为实际目录
+    labelled = load_labelled_images(r"tests\qr_samples")
+    for engine_name, report in benchmark_qr_engines(labelled).items():
+        print(engine_name, json.dumps(report, ensure_ascii=False))
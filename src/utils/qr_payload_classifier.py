@@ -0,0 +1,52 @@
+# 二维码内容分类：将解码得到的二维码内容分为个人微信、微信公众号、网址、其他四类
+# config中QR_PAYLOAD_PATTERNS的全部模式在导入时编译为一个带命名分组的正则，一次match即得到分类
+import re
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from setting.config import *
+
+# 分类
+QR_CATEGORY_PERSONAL = 'wechat_personal'   # 个人微信
+QR_CATEGORY_OFFICIAL = 'wechat_official'   # 微信公众号
+QR_CATEGORY_URL = 'url'                    # 网址
+QR_CATEGORY_OTHER = 'other'                # 其他
+
+# 属于微信二维码的分类
+WECHAT_CATEGORIES = {QR_CATEGORY_PERSONAL, QR_CATEGORY_OFFICIAL}
+
+# 写入JSON时使用的分类名称
+QR_CATEGORY_LABELS = {
+    QR_CATEGORY_PERSONAL: '个人微信',
+    QR_CATEGORY_OFFICIAL: '微信公众号',
+    QR_CATEGORY_URL: '网址',
+    QR_CATEGORY_OTHER: '其他',
+}
+
+
+# --- 函数：编译分类正则 ---
+def build_payload_regex(patterns: dict) -> re.Pattern:
+    """
+    每个分类编译为一个命名分组 (?P<分类>.*?(?:模式1|模式2...))，按配置顺序组成交替式；
+    所有分组都从内容开头尝试，re的交替式按顺序尝试，因此排在前面的分类优先
+    """
+    groups = [f"(?P<{category}>.*?(?:{'|'.join(category_patterns)}))"
+              for category, category_patterns in patterns.items() if category_patterns]
+    return re.compile('|'.join(groups), re.IGNORECASE | re.DOTALL)
+
+
+PAYLOAD_REGEX = build_payload_regex(QR_PAYLOAD_PATTERNS)
+
+
+# --- 函数：二维码内容分类 ---
+def classify_qr_payload(payload: str) -> str:
+    """
+    返回二维码内容的分类（QR_CATEGORY_*），未命中任何模式时为QR_CATEGORY_OTHER
+    """
+    match = PAYLOAD_REGEX.match(payload) if payload else None
+    return match.lastgroup if match else QR_CATEGORY_OTHER
+
+
+# --- 函数：是否为微信二维码分类 ---
+def is_wechat_category(category: str) -> bool:
+    return category in WECHAT_CATEGORIES
@@ -0,0 +1,159 @@
+# 二维码候选预筛选：完整解码前用低成本检查排除明显不是二维码的图片（产品照片、纯色背景、横幅等）
+# 检查在长边缩小到work_size的灰度图上进行：尺寸/长宽比 → 灰度信息熵 → "回"字形定位图案
+from typing import Optional
+import time
+import cv2
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from setting.config import *
+
+
+#---------------------- 预筛选检查 --------------------------------
+
+# --- 函数：缩小为灰度工作图 ---
+def to_work_gray(image: np.ndarray, work_size: int) -> np.ndarray:
+    """
+    转为灰度图，并在长边超过work_size时等比缩小
+    """
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape[:2]
+    scale = work_size / max(height, width)
+    if scale < 1:
+        gray = cv2.resize(gray, (max(1, int(width * scale)), max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+    return gray
+
+
+# --- 函数：灰度信息熵 ---
+def gray_entropy(gray: np.ndarray) -> float:
+    """
+    计算灰度直方图的信息熵（bit）
+    """
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    prob = hist[hist > 0] / gray.size
+    return float((prob * np.log2(1 / prob)).sum())
+
+
+# --- 函数：统计定位图案数量 ---
+def count_finder_patterns(gray: np.ndarray) -> int:
+    """
+    统计灰度图中的"回"字形定位图案数量
+
+    二维码的定位图案为 深色外框 → 浅色环 → 深色中心 三层嵌套，
+    二值化（深色为前景）后表现为 外轮廓 → 孔洞 → 中心 三层轮廓；再要求外轮廓接近正方形
+    """
+    _, bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    contours, hierarchy = cv2.findContours(bw, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    if hierarchy is None:
+        return 0
+
+    # hierarchy每行为[next, prev, first_child, parent]，向量化找出"有孙轮廓"的轮廓
+    first_child = hierarchy[0][:, 2]
+    has_child = first_child >= 0
+    grandchild = np.full(len(first_child), -1)
+    grandchild[has_child] = first_child[first_child[has_child]]
+
+    count = 0
+    for index in np.flatnonzero(grandchild >= 0):
+        _, _, w, h = cv2.boundingRect(contours[index])
+        if w >= 5 and h >= 5 and 0.5 <= w / h <= 2.0:
+            count += 1
+    return count
+
+
+# --- 函数：二维码候选预筛选 ---
+def qr_prefilter_reason(image: np.ndarray, policy: Optional[dict] = None) -> Optional[str]:
+    """
+    判断图片是否可能包含二维码
+
+    检查顺序（由低成本到高成本，命中任一即拒绝）：
+    1. 尺寸：宽或高小于min_size
+    2. 长宽比：超过max_aspect_ratio
+    3. 信息熵：缩小后的灰度图信息熵低于min_entropy（纯色/近纯色）
+    4. 定位图案：检测到的定位图案少于min_finder_patterns
+
+    参数：
+        image: OpenCV图像（BGR或灰度）
+        policy (dict): 预筛选策略，默认使用config中的QR_PREFILTER_POLICY
+
+    返回：
+        str: 拒绝原因；可能是二维码时返回None
+    """
+    policy = policy or QR_PREFILTER_POLICY
+    height, width = image.shape[:2]
+
+    if min(height, width) < policy["min_size"]:
+        return f"尺寸过小({width}x{height})"
+    if max(height, width) / min(height, width) > policy["max_aspect_ratio"]:
+        return f"长宽比过大({width}x{height})"
+
+    gray = to_work_gray(image, policy["work_size"])
+    entropy = gray_entropy(gray)
+    if entropy < policy["min_entropy"]:
+        return f"信息熵过低({entropy:.2f})"
+
+    finder_patterns = count_finder_patterns(gray)
+    if finder_patterns < policy["min_finder_patterns"]:
+        return f"定位图案不足({finder_patterns})"
+    return None
+
+
+#---------------------- 预筛选统计 --------------------------------
+
+# --- 函数：创建预筛选统计 ---
+def new_qr_prefilter_stats() -> dict:
+    """
+    创建一次提取过程的预筛选统计：图片数、拒绝数、预筛选耗时、进入解码的图片数及解码耗时、解码缓存命中数
+    """
+    return {"images": 0, "rejected": 0, "prefilter_s": 0.0, "decoded": 0, "decode_s": 0.0, "cache_hits": 0}
+
+
+# --- 函数：预筛选统计摘要 ---
+def summarize_qr_prefilter_stats(stats: dict) -> str:
+    """
+    生成预筛选统计的日志文本：拒绝率，以及按进入解码图片的平均解码耗时估算的节省时间
+    """
+    if not stats["images"]:
+        return f"二维码预筛选：无需识别的图片（解码缓存命中 {stats.get('cache_hits', 0)} 张）"
+
+    reject_rate = stats["rejected"] / stats["images"]
+    summary = (f"二维码预筛选：拒绝 {stats['rejected']}/{stats['images']} 张({reject_rate:.0%})，"
+               f"预筛选耗时 {stats['prefilter_s']:.3f}s，解码耗时 {stats['decode_s']:.3f}s")
+    if stats["decoded"]:
+        saved = stats["decode_s"] / stats["decoded"] * stats["rejected"] - stats["prefilter_s"]
+        summary += f"，估计节省 {saved:.3f}s"
+    if stats.get("cache_hits"):
+        summary += f"；解码缓存命中 {stats['cache_hits']} 张"
+    return summary
+
+
+# --- 函数：预筛选性能测试 ---
+def benchmark_qr_prefilter(images: list, detect_func, policy: Optional[dict] = None) -> dict:
+    """
+    对一组图片分别执行"直接解码"和"预筛选后解码"，比较耗时与识别结果
+
+    参数：
+        images: OpenCV图像列表
+        detect_func: 完整解码函数，输入图片返回是否识别为二维码（如SaveImg_wechat_qr.decode_wechat_qr）
+        policy (dict): 预筛选策略
+
+    返回：
+        dict: 图片数、拒绝数、两种方式的耗时、直接解码识别出但被预筛选拒绝的图片数（漏检）
+    """
+    start = time.perf_counter()
+    direct = [bool(detect_func(image)) for image in images]
+    direct_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reasons = [qr_prefilter_reason(image, policy) for image in images]
+    filtered = [reason is None and bool(detect_func(image)) for image, reason in zip(images, reasons)]
+    filtered_s = time.perf_counter() - start
+
+    return {
+        "images": len(images),
+        "rejected": sum(reason is not None for reason in reasons),
+        "direct_s": direct_s,
+        "prefiltered_s": filtered_s,
+        "missed": sum(a and not b for a, b in zip(direct, filtered)),
+    }
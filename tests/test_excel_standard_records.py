@@ -0,0 +1,38 @@
+# 多工厂Excel转换测试：openpyxl读取路径（多进程）与xlwings读取路径（串行）对同一行得到相同的工厂数据
+import os
+import sys
+import pytest
+openpyxl = pytest.importorskip('openpyxl')
+pytest.importorskip('xlwings')
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src', 'processor_to_json'))
+from src.processor_to_json.excel_standard_allftys_map_processor import (
+    build_column_mapping, build_factory_data, clean_headers, read_sheet_records,
+)
+
+HEADERS = ['工厂名称', '主营产品', '联系方式', '备注']
+ROW = ['某某塑料制品有限公司', '收纳盒', 13800000000, 2.5]
+
+
+def test_openpyxl_and_xlwings_rows_match(tmp_path):
+    excel_path = str(tmp_path / "工厂汇总.xlsx")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "工厂"
+    ws.append(HEADERS)
+    ws.append(ROW)
+    wb.save(excel_path)
+
+    # openpyxl读取路径：整数单元格为int
+    records = read_sheet_records(excel_path, "工厂", 1)["records"]
+    assert len(records) == 1
+
+    # xlwings读取路径：同一行的数字单元格均为float
+    headers = clean_headers(HEADERS)
+    column_mapping, _ = build_column_mapping(headers)
+    xlwings_row = [float(value) if isinstance(value, int) else value for value in ROW]
+    xlwings_data = build_factory_data(headers, column_mapping, xlwings_row)
+
+    assert records[0]["factory_data"] == xlwings_data
+    assert xlwings_data["联系方式"] == "13800000000"
+    assert xlwings_data["备注"] == "2.5"
@@ -0,0 +1,37 @@
+# Excel产品图片保存测试：两条保存路径对矢量图片采用同一策略（转换为PNG，无法转换的跳过），不写出emf/wmf原始文件
+import os
+import sys
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src', 'processor_to_json'))
+from processor_rely.excel_package_reader import convert_vector_image, prepare_images_for_save
+
+# 1x1 PNG
+PNG_BYTES = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082'
+)
+# 无法渲染的矢量图片（扩展名为emf，内容不是有效的图元文件）
+BROKEN_EMF = (b'not a metafile', '.emf')
+
+
+def test_convert_vector_image():
+    assert convert_vector_image(PNG_BYTES, '.png') == (PNG_BYTES, '.png')
+    assert convert_vector_image(*BROKEN_EMF) is None
+    assert prepare_images_for_save([(PNG_BYTES, '.png'), BROKEN_EMF]) == ([(PNG_BYTES, '.png')], 1)
+
+
+def test_save_product_images_skips_unconvertible_vector(tmp_path):
+    pytest.importorskip('xlwings')
+    from src.processor_to_json.excel_non_standard_fty_processor import save_product_images
+
+    img_folder = save_product_images([BROKEN_EMF, (PNG_BYTES, '.png')], str(tmp_path))
+    assert sorted(os.listdir(img_folder)) == ['产品图片_1.png']
+
+
+def test_save_row_images_skips_unconvertible_vector(tmp_path):
+    pytest.importorskip('xlwings')
+    from processor_rely.excel_extract_product_img import save_row_images
+
+    img_folder = save_row_images([BROKEN_EMF, (PNG_BYTES, '.png')], str(tmp_path), '某某厂')
+    assert sorted(os.listdir(img_folder)) == ['某某厂_img1.png']
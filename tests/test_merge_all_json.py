@@ -0,0 +1,41 @@
+# 合并JSON测试：图片索引等非工厂记录文件不应并入合并结果
+import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from setting.config import PDF_IMAGE_DEDUP_INDEX_NAME, PDF_IMAGE_INDEX_NAME
+from src.convert_to_excel.merge_all_json import merge_json_files
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def test_merge_skips_image_index(tmp_path):
+    factory_dir = tmp_path / "data_tag" / "工厂_1"
+    write_json(str(factory_dir / "某某厂_信息.json"), {"工厂名称": "某某厂"})
+    write_json(str(factory_dir / "工厂_1_产品图片" / PDF_IMAGE_INDEX_NAME),
+               {"images": {"a.png": {"hash": "abc"}}, "duplicates": {}})
+
+    output_file = tmp_path / "combined" / "combined_tag.json"
+    merge_json_files(str(tmp_path / "data_tag"), str(output_file))
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        combined_data = json.load(f)
+    assert combined_data == [{"工厂名称": "某某厂"}]
+
+
+def test_merge_skips_dedup_index(tmp_path):
+    factory_dir = tmp_path / "data_tag" / "工厂_1"
+    write_json(str(factory_dir / "某某厂_信息.json"), {"工厂名称": "某某厂"})
+    write_json(str(factory_dir / "工厂_1_产品图片" / PDF_IMAGE_DEDUP_INDEX_NAME),
+               {"files": {"abc": "a.png"}, "duplicates": {"b.png": "a.png"}})
+
+    output_file = tmp_path / "combined" / "combined_tag.json"
+    merge_json_files(str(tmp_path / "data_tag"), str(output_file))
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        combined_data = json.load(f)
+    assert combined_data == [{"工厂名称": "某某厂"}]